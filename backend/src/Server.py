@@ -1,29 +1,107 @@
 # Server.py
+"""
+Punto de entrada del servidor.
+
+    python Server.py                      # run: arranca el servidor según APP_ENV
+    python Server.py init-db              # crea la base de datos y el esquema (una sola vez)
+    python Server.py export-openapi       # exporta media/docs/swagger.yml si cambiaron las rutas
+
+Importar este módulo no tiene efectos secundarios: cada worker de uvicorn lo importa.
+"""
 import os
+import argparse
+import importlib.util
 import uvicorn
 from dotenv import load_dotenv
 from api.App import app
-from infrastructure.config.Base import Base
 from infrastructure.config.ConfigSwagger import setup_swagger, generate_swagger_yaml
-from infrastructure.config.Db import connect_to_db, create_database_if_not_exists
 
-from infrastructure.model.User import User
-from infrastructure.model.EmailVerificationToken import EmailVerificationToken
-from infrastructure.model.Role import Role
+load_dotenv()
 
+setup_swagger(app)
 
-load_dotenv()
+APP_ENV = os.getenv("APP_ENV", "development").lower()
 
-create_database_if_not_exists()
 
-engine, conn, meta = connect_to_db()
+def init_db():
+    """
+    Crea la base de datos si no existe y las tablas de los modelos
+    """
+    from infrastructure.config.Base import Base
+    from infrastructure.config.Db import get_engine, create_database_if_not_exists
+    from infrastructure.model.User import User  # noqa: F401
+    from infrastructure.model.EmailVerificationToken import EmailVerificationToken  # noqa: F401
+    from infrastructure.model.Role import Role  # noqa: F401
 
-Base.metadata.create_all(engine)
+    create_database_if_not_exists()
+    engine = get_engine()
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    print("✅ Esquema de la base de datos verificado")
 
-setup_swagger(app)
 
-generate_swagger_yaml(app)
+def export_openapi(force: bool = False):
+    try:
+        generate_swagger_yaml(app, force=force)
+    except OSError as e:
+        # Un sistema de archivos de solo lectura no debe impedir el arranque
+        print(f"⚠️ No se pudo exportar el swagger: {e}")
 
-if __name__ == "__main__":
+
+def run():
+    """
+    Desarrollo: un proceso con recarga en localhost; crea el esquema al arrancar.
+    Producción: varios workers, sin recarga ni consultas a la base de datos al arrancar.
+    """
+    production = APP_ENV == "production"
+
+    host = os.getenv("SERVER_HOST", "0.0.0.0" if production else "localhost")
     port = int(os.getenv("PORT", 3000))
-    uvicorn.run("Server:app", host="localhost", port=port, reload=True)
\ No newline at end of file
+    workers = int(os.getenv("SERVER_WORKERS", os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))) if production else 1
+
+    # uvloop y httptools vienen con uvicorn[standard]; sin ellos se usan asyncio y h11
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+    if not production:
+        init_db()
+    export_openapi()
+
+    print(f"🚀 Servidor ({APP_ENV}) en {host}:{port} - workers: {workers}, loop: {loop}, http: {http}")
+
+    uvicorn.run(
+        "Server:app",
+        host=host,
+        port=port,
+        reload=not production,
+        workers=workers if production else None,
+        loop=loop,
+        http=http,
+        proxy_headers=production,
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        timeout_graceful_shutdown=int(os.getenv("SERVER_GRACEFUL_TIMEOUT", 30)),
+        timeout_keep_alive=int(os.getenv("SERVER_KEEP_ALIVE", 5)),
+        access_log=os.getenv("SERVER_ACCESS_LOG", "false" if production else "true").lower() == "true",
+        log_level=os.getenv("SERVER_LOG_LEVEL", "info")
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EcoShield360 API")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("run", help="Arranca el servidor (por defecto)")
+    subparsers.add_parser("init-db", help="Crea la base de datos y el esquema")
+    export_parser = subparsers.add_parser("export-openapi", help="Exporta el documento OpenAPI a media/docs")
+    export_parser.add_argument("--force", action="store_true", help="Exporta aunque las rutas no hayan cambiado")
+    args = parser.parse_args(argv)
+
+    if args.command == "init-db":
+        init_db()
+    elif args.command == "export-openapi":
+        export_openapi(force=args.force)
+    else:
+        run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,31 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.routes.MainRouter import main_router
+from api.routes.AirQualityRouter import air_quality_controller
+from infrastructure.config.Db import dispose_engine
+from infrastructure.services.PasswordHasher import password_hasher
+from infrastructure.services.MailQueue import mail_queue
+from shared.utils.TemplateRegistry import template_registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Abre los pools HTTP, de renderizado y la cola de correo al iniciar cada worker y los drena al apagarlo
+    (uvicorn ejecuta el cierre al recibir SIGTERM, después de terminar las peticiones en curso)
+    """
+    await air_quality_controller.startup()
+    await mail_queue.start()
+    template_registry.load()
+    try:
+        yield
+    finally:
+        await air_quality_controller.shutdown()
+        await mail_queue.close()
+        await password_hasher.close()
+        await dispose_engine()
+
 
 app = FastAPI(
     title="EcoShield360 API",
@@ -10,7 +35,8 @@ app = FastAPI(
         "url": "https://www.stellarco.online/",
         "email": "stellarcolsupp@gmail.com"
     },
-    docs_url="/api-docs"
+    docs_url="/api-docs",
+    lifespan=lifespan
 )
 
 app.include_router(main_router)
@@ -22,4 +48,4 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-)
\ No newline at end of file
+)
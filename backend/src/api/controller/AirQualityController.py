@@ -1,19 +1,37 @@
 from fastapi import HTTPException
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse, FileResponse
 from datetime import datetime
+from typing import Optional
+import os
 
 from api.dto.AirQuality.AirQualityDto import (
     CoordinatesRequest, 
     AirQualityResponse, 
+    BatchCoordinatesRequest,
+    BatchAirQualityResponse,
     GenerateReportRequest, 
-    ReportResponse
+    GenerateMultiLocationReportRequest,
+    ReportResponse,
+    ReportJobResponse
 )
 from core.service.AirQualityService import AirQualityService
+from core.service.ReportExporter import REPORT_MEDIA_TYPES
 from shared.errors.ApiResponse import ApiResponse
+from core.exceptions.RenderPoolSaturatedException import RenderPoolSaturatedException
+from infrastructure.model.enum.ReportJobStatusEnum import ReportJobStatusEnum
 
 class AirQualityController:
     def __init__(self):
         self.air_quality_service = AirQualityService()
+        self.batch_max_points = int(os.getenv("AIR_QUALITY_BATCH_MAX_POINTS", 10000))
+        self.stream_max_points = int(os.getenv("AIR_QUALITY_STREAM_MAX_POINTS", 100000))
+        self.multi_report_max_locations = int(os.getenv("REPORT_MULTI_MAX_LOCATIONS", 500))
+    
+    async def startup(self):
+        await self.air_quality_service.startup()
+    
+    async def shutdown(self):
+        await self.air_quality_service.shutdown()
     
     async def get_air_quality_summary(self, coordinates: CoordinatesRequest) -> AirQualityResponse:
         """
@@ -55,9 +73,72 @@ class AirQualityController:
                 error=str(e)
             )
     
-    async def generate_air_quality_report(self, request: GenerateReportRequest) -> Response:
+    async def get_air_quality_summary_batch(self, request: BatchCoordinatesRequest) -> BatchAirQualityResponse:
+        """
+        Controlador para obtener resúmenes de calidad del aire de muchos puntos en una sola petición
+        """
+        try:
+            if not request.points:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Debe enviar al menos un punto"
+                )
+            
+            if len(request.points) > self.batch_max_points:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"El lote no puede superar {self.batch_max_points} puntos"
+                )
+            
+            air_quality_data = await self.air_quality_service.get_air_quality_summary_batch(request.points)
+            
+            return BatchAirQualityResponse(
+                success=True,
+                message=f"Datos de calidad del aire obtenidos para {len(air_quality_data)} puntos",
+                data=air_quality_data
+            )
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            return BatchAirQualityResponse(
+                success=False,
+                message="Error interno del servidor",
+                error=str(e)
+            )
+    
+    async def stream_air_quality_summaries(self, request: BatchCoordinatesRequest) -> StreamingResponse:
+        """
+        Controlador que transmite un resumen por línea (NDJSON) a medida que se resuelve cada celda
+        """
+        if not request.points:
+            raise HTTPException(
+                status_code=400,
+                detail="Debe enviar al menos un punto"
+            )
+        
+        if len(request.points) > self.stream_max_points:
+            raise HTTPException(
+                status_code=400,
+                detail=f"El lote no puede superar {self.stream_max_points} puntos"
+            )
+        
+        async def ndjson_lines():
+            async for data in self.air_quality_service.stream_air_quality_summaries(request.points):
+                yield data.model_dump_json() + "\n"
+        
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+    
+    async def generate_air_quality_report(
+        self,
+        request: GenerateReportRequest,
+        if_none_match: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Response:
         """
-        Controlador para generar reporte PDF de calidad del aire
+        Controlador para generar el reporte de calidad del aire en el formato negociado con
+        la cabecera Accept (PDF por defecto, CSV, JSON o HTML).
+        Responde 304 si el cliente ya tiene el reporte (If-None-Match coincide con su ETag).
         """
         try:
             if not request.air_quality_data:
@@ -72,32 +153,227 @@ class AirQualityController:
                     detail="Las coordenadas son requeridas en los datos"
                 )
             
-            pdf_content = await self.air_quality_service.generate_pdf_report(
+            report_format = self._negotiate_report_format(accept)
+            if report_format is None:
+                raise HTTPException(
+                    status_code=406,
+                    detail=f"Formato no soportado; use uno de: {', '.join(REPORT_MEDIA_TYPES.values())}"
+                )
+            
+            report_title = request.report_title or "Reporte de Calidad del Aire"
+            include_charts = request.include_charts is not False
+            report_key = self.air_quality_service.get_report_key(
                 request.air_quality_data,
-                request.report_title or "Reporte de Calidad del Aire"
+                report_title,
+                report_format,
+                include_charts
+            )
+            etag = f'"{report_key}"'
+            headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+            
+            if self._etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers=headers)
+            
+            _, content = await self.air_quality_service.get_or_generate_report(
+                request.air_quality_data,
+                report_title,
+                report_format,
+                include_charts
             )
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             lat = request.air_quality_data.coordinates.get('lat', 0)
             lon = request.air_quality_data.coordinates.get('lon', 0)
-            filename = f"reporte_calidad_aire_{lat:.4f}_{lon:.4f}_{timestamp}.pdf"
+            filename = f"reporte_calidad_aire_{lat:.4f}_{lon:.4f}_{timestamp}.{report_format}"
+            
+            # HTML y JSON se muestran en línea; PDF y CSV se descargan
+            disposition = "inline" if report_format in ("html", "json") else "attachment"
+            headers["Content-Disposition"] = f"{disposition}; filename={filename}"
             
             return Response(
-                content=pdf_content,
-                media_type="application/pdf",
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename}",
-                    "Content-Type": "application/pdf"
-                }
+                content=content,
+                media_type=REPORT_MEDIA_TYPES[report_format],
+                headers=headers
             )
             
         except HTTPException:
             raise
+        except RenderPoolSaturatedException as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=e.message,
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error generando el reporte: {str(e)}"
+            )
+    
+    async def generate_multi_location_report(self, request: GenerateMultiLocationReportRequest) -> StreamingResponse:
+        """
+        Controlador para generar el reporte PDF consolidado de varios sitios, transmitido por bloques
+        """
+        if not request.locations:
+            raise HTTPException(
+                status_code=400,
+                detail="Se requiere al menos un sitio"
+            )
+        
+        if len(request.locations) > self.multi_report_max_locations:
+            raise HTTPException(
+                status_code=400,
+                detail=f"El reporte no puede superar {self.multi_report_max_locations} sitios"
+            )
+        
+        try:
+            path = await self.air_quality_service.generate_multi_location_report(
+                request.locations,
+                request.report_title or "Reporte Consolidado de Calidad del Aire",
+                request.include_charts is not False
+            )
+        except RenderPoolSaturatedException as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=e.message,
+                headers={"Retry-After": str(e.retry_after)}
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Error generando el reporte PDF: {str(e)}"
             )
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"reporte_calidad_aire_{len(request.locations)}_sitios_{timestamp}.pdf"
+        
+        return StreamingResponse(
+            self.air_quality_service.stream_report_file(path),
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+                "Content-Length": str(os.path.getsize(path))
+            }
+        )
+    
+    async def submit_report_job(self, request: GenerateReportRequest) -> ReportJobResponse:
+        """
+        Controlador para encolar la generación de un reporte PDF
+        """
+        if not request.air_quality_data or not request.air_quality_data.coordinates:
+            raise HTTPException(
+                status_code=400,
+                detail="Datos de calidad del aire incompletos"
+            )
+        
+        job = await self.air_quality_service.submit_report_job(
+            request.air_quality_data,
+            request.report_title or "Reporte de Calidad del Aire",
+            request.include_charts is not False
+        )
+        return self._to_job_response(job, "Reporte encolado exitosamente")
+    
+    async def get_report_job(self, job_id: str) -> ReportJobResponse:
+        """
+        Controlador para consultar el estado de un trabajo de reporte
+        """
+        job = await self.air_quality_service.get_report_job(job_id)
+        if not job:
+            raise HTTPException(
+                status_code=404,
+                detail="Trabajo de reporte no encontrado"
+            )
+        return self._to_job_response(job, "Estado del trabajo de reporte")
+    
+    async def download_report_job(self, job_id: str) -> FileResponse:
+        """
+        Controlador para descargar el PDF de un trabajo de reporte terminado
+        """
+        job = await self.air_quality_service.get_report_job(job_id)
+        if not job:
+            raise HTTPException(
+                status_code=404,
+                detail="Trabajo de reporte no encontrado"
+            )
+        
+        if job["status"] != ReportJobStatusEnum.COMPLETED.value:
+            raise HTTPException(
+                status_code=409,
+                detail=f"El reporte aún no está disponible (estado: {job['status']})"
+            )
+        
+        created_at = datetime.fromisoformat(job["created_at"]).strftime("%Y%m%d_%H%M%S")
+        return FileResponse(
+            self.air_quality_service.get_report_job_artifact(job_id),
+            media_type="application/pdf",
+            filename=f"reporte_calidad_aire_{created_at}.pdf"
+        )
+    
+    def _to_job_response(self, job: dict, message: str) -> ReportJobResponse:
+        completed = job["status"] == ReportJobStatusEnum.COMPLETED.value
+        return ReportJobResponse(
+            success=job["status"] != ReportJobStatusEnum.FAILED.value,
+            message=message,
+            job_id=job["job_id"],
+            status=job["status"],
+            created_at=job["created_at"],
+            finished_at=job["finished_at"],
+            download_url=f"/api/v1/air-quality/report/jobs/{job['job_id']}/download" if completed else None,
+            error=job["error"]
+        )
+    
+    @staticmethod
+    def _negotiate_report_format(accept: Optional[str]) -> Optional[str]:
+        """
+        Elige el formato según la cabecera Accept respetando los pesos q; sin cabecera, PDF
+        """
+        if not accept:
+            return "pdf"
+        
+        candidates = []
+        for position, item in enumerate(accept.split(",")):
+            media_range, *params = [part.strip() for part in item.split(";")]
+            quality = 1.0
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                candidates.append((-quality, position, media_range.lower()))
+        
+        for _, _, media_range in sorted(candidates):
+            if media_range in ("*/*", "application/*"):
+                return "pdf"
+            for report_format, media_type in REPORT_MEDIA_TYPES.items():
+                full_type = media_type.split(";")[0]
+                if media_range == full_type or (media_range.endswith("/*") and full_type.startswith(media_range[:-1])):
+                    return report_format
+        
+        return None
+    
+    @staticmethod
+    def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+        return etag in candidates
+    
+    async def get_cache_stats(self) -> dict:
+        """
+        Controlador que retorna las métricas de la caché de resúmenes
+        """
+        return self.air_quality_service.get_cache_stats()
+    
+    async def get_provider_stats(self) -> dict:
+        """
+        Controlador que retorna el estado de los circuit breakers y métricas por proveedor
+        """
+        return self.air_quality_service.get_provider_stats()
     
     async def get_air_quality_report_info(self, request: GenerateReportRequest) -> ReportResponse:
         """
@@ -0,0 +1,24 @@
+from typing import Optional
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from api.dto.Auth.AuthenticatedUser import AuthenticatedUser
+from core.exceptions.InvalidTokenException import InvalidTokenException
+from core.service.TokenAuthService import TokenAuthService
+
+bearer_scheme = HTTPBearer(auto_error=False)
+token_auth_service = TokenAuthService()
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> AuthenticatedUser:
+    """
+    Dependencia para rutas protegidas: exige `Authorization: Bearer <jwt>`
+    """
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Token requerido", headers={"WWW-Authenticate": "Bearer"})
+
+    try:
+        return await token_auth_service.authenticate(credentials.credentials)
+    except InvalidTokenException as e:
+        raise HTTPException(status_code=401, detail=e.message, headers={"WWW-Authenticate": "Bearer"})
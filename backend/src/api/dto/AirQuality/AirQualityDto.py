@@ -1,11 +1,20 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+DEFAULT_RADIUS_KM = 5.0
+
 class CoordinatesRequest(BaseModel):
     lat: float = Field(..., ge=-90, le=90, description="Latitud entre -90 y 90")
     lon: float = Field(..., ge=-180, le=180, description="Longitud entre -180 y 180")
-    radius: Optional[float] = Field(default=5.0, ge=0.1, le=50.0, description="Radio en km para el análisis")
+    radius: Optional[float] = Field(default=DEFAULT_RADIUS_KM, ge=0.1, le=50.0, description="Radio en km para el análisis")
+
+    @field_validator("radius", mode="before")
+    @classmethod
+    def default_radius(cls, value):
+        # Un "radius": null explícito usa el radio por defecto; así se resuelve al validar la
+        # petición y no dentro de una respuesta NDJSON que ya envió sus encabezados
+        return DEFAULT_RADIUS_KM if value is None else value
 
 class AirQualityData(BaseModel):
     coordinates: Dict[str, float]
@@ -28,13 +37,37 @@ class AirQualityResponse(BaseModel):
     data: Optional[AirQualityData] = None
     error: Optional[str] = None
 
+class BatchCoordinatesRequest(BaseModel):
+    points: List[CoordinatesRequest] = Field(..., description="Lista de coordenadas a consultar")
+
+class BatchAirQualityResponse(BaseModel):
+    success: bool
+    message: str
+    data: List[AirQualityData] = Field(default_factory=list, description="Resultados en el mismo orden de entrada")
+    error: Optional[str] = None
+
 class GenerateReportRequest(BaseModel):
     air_quality_data: AirQualityData
     report_title: Optional[str] = Field(default="Reporte de Calidad del Aire", description="Título del reporte")
     include_charts: Optional[bool] = Field(default=True, description="Incluir gráficos en el reporte")
 
+class GenerateMultiLocationReportRequest(BaseModel):
+    locations: List[AirQualityData] = Field(..., description="Datos de cada sitio, obtenidos de /summary o /summary/batch")
+    report_title: Optional[str] = Field(default="Reporte Consolidado de Calidad del Aire", description="Título del reporte")
+    include_charts: Optional[bool] = Field(default=True, description="Incluir un gráfico por sitio")
+
 class ReportResponse(BaseModel):
     success: bool
     message: str
     filename: Optional[str] = None
-    error: Optional[str] = None
\ No newline at end of file
+    error: Optional[str] = None
+
+class ReportJobResponse(BaseModel):
+    success: bool
+    message: str
+    job_id: Optional[str] = None
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    download_url: Optional[str] = None
+    error: Optional[str] = None
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+class AuthenticatedUser(BaseModel):
+    id: int
+    username: str
+    email: str
+    full_name: str
+    role: str
+    is_verified: bool
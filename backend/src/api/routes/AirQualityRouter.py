@@ -1,17 +1,26 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import Response
+import os
+from fastapi import APIRouter, HTTPException, Depends, Header
+from typing import Optional
+from fastapi.responses import Response, StreamingResponse
 
 from api.dto.AirQuality.AirQualityDto import (
     CoordinatesRequest, 
     AirQualityResponse, 
+    BatchCoordinatesRequest,
+    BatchAirQualityResponse,
     GenerateReportRequest, 
-    ReportResponse
+    GenerateMultiLocationReportRequest,
+    ReportResponse,
+    ReportJobResponse
 )
 from api.controller.AirQualityController import AirQualityController
+from api.dependencies.AuthDependency import get_current_user
 
+# Con AIR_QUALITY_REQUIRE_AUTH=true todas las rutas exigen un JWT válido
 air_quality_router = APIRouter(
     prefix="/air-quality",
     tags=["Air Quality"],
+    dependencies=[Depends(get_current_user)] if os.getenv("AIR_QUALITY_REQUIRE_AUTH", "false").lower() == "true" else [],
     responses={
         404: {"description": "Not found"},
         500: {"description": "Internal server error"}
@@ -45,26 +54,163 @@ async def get_air_quality_summary(coordinates: CoordinatesRequest) -> AirQuality
     """
     return await air_quality_controller.get_air_quality_summary(coordinates)
 
+@air_quality_router.post(
+    "/summary/batch",
+    response_model=BatchAirQualityResponse,
+    summary="Obtener resúmenes de calidad del aire por lote",
+    description="""
+    Obtiene resúmenes de calidad del aire para muchos puntos en una sola petición.
+    
+    **Parámetros:**
+    - **points**: Lista de coordenadas con el mismo formato de /summary
+    
+    **Retorna:**
+    - Un resumen por punto, en el mismo orden de entrada
+    - Los puntos que caen en la misma celda de Sentinel-5P comparten una sola consulta
+    """
+)
+async def get_air_quality_summary_batch(request: BatchCoordinatesRequest) -> BatchAirQualityResponse:
+    """
+    Endpoint para obtener resúmenes de calidad del aire de muchos puntos
+    """
+    return await air_quality_controller.get_air_quality_summary_batch(request)
+
+@air_quality_router.post(
+    "/summary/stream",
+    summary="Transmitir resúmenes de calidad del aire (NDJSON)",
+    description="""
+    Igual que /summary/batch, pero la respuesta se transmite en formato NDJSON:
+    un objeto AirQualityData por línea, enviado en cuanto se resuelve la celda del punto.
+    
+    **Parámetros:**
+    - **points**: Lista de coordenadas con el mismo formato de /summary
+    
+    **Retorna:**
+    - Líneas `application/x-ndjson` en orden de resolución (cada línea incluye sus coordenadas)
+    """,
+    response_class=StreamingResponse
+)
+async def stream_air_quality_summaries(request: BatchCoordinatesRequest) -> StreamingResponse:
+    """
+    Endpoint para transmitir resúmenes de calidad del aire de muchos puntos
+    """
+    return await air_quality_controller.stream_air_quality_summaries(request)
+
 @air_quality_router.post(
     "/report",
-    summary="Generar reporte PDF de calidad del aire",
+    summary="Generar reporte de calidad del aire",
     description="""
-    Genera un reporte PDF detallado con los datos de calidad del aire.
+    Genera un reporte detallado con los datos de calidad del aire. El formato se elige
+    con la cabecera `Accept`:
+    - `application/pdf` (por defecto, también con `*/*`)
+    - `text/csv`: una fila por contaminante
+    - `application/json`: datos y título del reporte
+    - `text/html`: reporte estático con el gráfico en SVG
     
     **Parámetros:**
     - **air_quality_data**: Datos obtenidos del endpoint /summary
     - **report_title**: Título personalizado para el reporte (opcional)
-    - **include_charts**: Incluir gráficos en el reporte (opcional, por defecto true)
+    - **include_charts**: Incluir gráficos en el reporte (opcional, por defecto true); con false no se generan
+    
+    **Retorna:**
+    - Archivo en el formato negociado, o `406` si ninguno de los pedidos está disponible
+    - Cabecera `ETag`; si se reenvía en `If-None-Match` y el reporte no cambió, responde `304 Not Modified`
+    """,
+    response_class=Response,
+    responses={
+        200: {
+            "description": "Reporte generado",
+            "content": {
+                "application/pdf": {},
+                "text/csv": {},
+                "application/json": {},
+                "text/html": {}
+            }
+        },
+        406: {"description": "Formato no soportado"}
+    }
+)
+async def generate_air_quality_report(
+    request: GenerateReportRequest,
+    if_none_match: Optional[str] = Header(default=None),
+    accept: Optional[str] = Header(default=None)
+) -> Response:
+    """
+    Endpoint para generar y descargar el reporte de calidad del aire
+    """
+    return await air_quality_controller.generate_air_quality_report(request, if_none_match, accept)
+
+@air_quality_router.post(
+    "/report/multi",
+    summary="Generar reporte PDF consolidado de varios sitios",
+    description="""
+    Genera un único PDF con una tabla resumen de todos los sitios y una sección con
+    gráfico por sitio. El PDF se construye en disco y se transmite por bloques.
+    
+    **Parámetros:**
+    - **locations**: Lista de datos obtenidos de /summary o /summary/batch
+    - **report_title**: Título personalizado para el reporte (opcional)
+    - **include_charts**: Incluir un gráfico por sitio (opcional, por defecto true)
     
     **Retorna:**
-    - Archivo PDF para descarga con el reporte completo
+    - Archivo PDF para descarga
+    """,
+    response_class=StreamingResponse
+)
+async def generate_multi_location_report(request: GenerateMultiLocationReportRequest) -> StreamingResponse:
+    """
+    Endpoint para generar y descargar el reporte consolidado de varios sitios
+    """
+    return await air_quality_controller.generate_multi_location_report(request)
+
+@air_quality_router.post(
+    "/report/jobs",
+    response_model=ReportJobResponse,
+    status_code=202,
+    summary="Encolar generación de reporte PDF",
+    description="""
+    Encola la generación de un reporte PDF y retorna inmediatamente el id del trabajo.
+    
+    **Parámetros:**
+    - Los mismos de /report
+    
+    **Retorna:**
+    - **job_id**: Identificador para consultar el estado y descargar el PDF
+    """
+)
+async def submit_report_job(request: GenerateReportRequest) -> ReportJobResponse:
+    """
+    Endpoint para encolar un reporte PDF
+    """
+    return await air_quality_controller.submit_report_job(request)
+
+@air_quality_router.get(
+    "/report/jobs/{job_id}",
+    response_model=ReportJobResponse,
+    summary="Consultar estado de un reporte encolado",
+    description="""
+    Retorna el estado del trabajo (QUEUED, RUNNING, COMPLETED o FAILED) y,
+    cuando está completo, la URL de descarga del PDF.
+    """
+)
+async def get_report_job(job_id: str) -> ReportJobResponse:
+    """
+    Endpoint para consultar el estado de un trabajo de reporte
+    """
+    return await air_quality_controller.get_report_job(job_id)
+
+@air_quality_router.get(
+    "/report/jobs/{job_id}/download",
+    summary="Descargar reporte encolado",
+    description="""
+    Descarga el PDF de un trabajo completado. Responde 409 si el trabajo aún no termina.
     """
 )
-async def generate_air_quality_report(request: GenerateReportRequest) -> Response:
+async def download_report_job(job_id: str) -> Response:
     """
-    Endpoint para generar y descargar reporte PDF de calidad del aire
+    Endpoint para descargar el PDF de un trabajo de reporte
     """
-    return await air_quality_controller.generate_air_quality_report(request)
+    return await air_quality_controller.download_report_job(job_id)
 
 @air_quality_router.post(
     "/report/info",
@@ -79,4 +225,32 @@ async def get_report_info(request: GenerateReportRequest) -> ReportResponse:
     """
     Endpoint para validar datos y obtener información del reporte sin generarlo
     """
-    return await air_quality_controller.get_air_quality_report_info(request)
\ No newline at end of file
+    return await air_quality_controller.get_air_quality_report_info(request)
+
+@air_quality_router.get(
+    "/cache/stats",
+    summary="Métricas de la caché de resúmenes",
+    description="""
+    Retorna el estado de la caché de resúmenes de calidad del aire (entradas, bytes usados,
+    aciertos, fallos, desalojos y expiraciones) y de la caché de reportes.
+    """
+)
+async def get_cache_stats() -> dict:
+    """
+    Endpoint para consultar las métricas de la caché de resúmenes
+    """
+    return await air_quality_controller.get_cache_stats()
+
+@air_quality_router.get(
+    "/providers/stats",
+    summary="Estado de los proveedores de Copernicus",
+    description="""
+    Retorna el estado del circuit breaker de cada proveedor (SentinelSat, CDSE, OpenEO),
+    su tasa de fallos reciente, latencia promedio y el orden en que se consultarán.
+    """
+)
+async def get_provider_stats() -> dict:
+    """
+    Endpoint para consultar el estado y las métricas de los proveedores
+    """
+    return await air_quality_controller.get_provider_stats()
\ No newline at end of file
@@ -1,24 +1,55 @@
-from fastapi import APIRouter, Depends, Request, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from infrastructure.config.Db import get_db
 from core.service.AuthService import AuthService
+from core.exceptions.PasswordHasherSaturatedException import PasswordHasherSaturatedException
+from shared.errors.ApiResponse import ApiResponse
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
+auth_router = APIRouter(prefix="/auth", tags=["Auth"])
 auth_service = AuthService()
 
 
-@router.post("/login")
-async def login(request: Request, db: Session = Depends(get_db)):
+def to_http_exception(e: ApiResponse) -> HTTPException:
+    """
+    Los errores de negocio (correo sin confirmar, token inválido, pool saturado) salen con su status
+    """
+    headers = {"Retry-After": str(e.retry_after)} if isinstance(e, PasswordHasherSaturatedException) else None
+    return HTTPException(status_code=e.status_code, detail=e.message, headers=headers)
+
+
+@auth_router.post(
+    "/login",
+    summary="Iniciar sesión",
+    description="Valida usuario y contraseña y retorna un JWT para las rutas protegidas."
+)
+async def login(request: Request, db: AsyncSession = Depends(get_db)):
     request_data = await request.json()
-    return await auth_service.login(request_data, db)
+    try:
+        return await auth_service.login(request_data, db)
+    except ApiResponse as e:
+        raise to_http_exception(e)
 
 
-@router.post("/register")
-async def register(request: Request, db: Session = Depends(get_db)):
+@auth_router.post(
+    "/register",
+    summary="Registrar usuario",
+    description="Crea el usuario y envía el correo con el enlace de verificación."
+)
+async def register(request: Request, db: AsyncSession = Depends(get_db)):
     request_data = await request.json()
-    return await auth_service.register(request_data, db)
+    try:
+        return await auth_service.register(request_data, db)
+    except ApiResponse as e:
+        raise to_http_exception(e)
 
 
-@router.get("/verify-email")
-async def verify_email(token: str = Query(...), db: Session = Depends(get_db)):
-    return auth_service.verify_email(token, db)
+@auth_router.get(
+    "/verify-email",
+    summary="Verificar correo",
+    description="Consume el token del enlace enviado al registrarse y marca el correo como verificado."
+)
+async def verify_email(token: str = Query(...), db: AsyncSession = Depends(get_db)):
+    try:
+        return await auth_service.verify_email(token, db)
+    except ApiResponse as e:
+        raise to_http_exception(e)
@@ -0,0 +1,87 @@
+import os
+from fastapi import APIRouter, Depends
+from infrastructure.config.Db import get_pool_stats
+from infrastructure.services.PasswordHasher import password_hasher
+from infrastructure.services.MailQueue import mail_queue
+from shared.utils.TemplateRegistry import template_registry
+from api.dependencies.AuthDependency import get_current_user, token_auth_service
+
+# Las métricas exponen el pool de la base de datos y el texto de las consultas lentas:
+# exigen un JWT válido salvo que HEALTH_REQUIRE_AUTH=false
+health_router = APIRouter(
+    prefix="/health",
+    tags=["Health"],
+    dependencies=[Depends(get_current_user)] if os.getenv("HEALTH_REQUIRE_AUTH", "true").lower() == "true" else []
+)
+
+@health_router.get(
+    "/db/stats",
+    summary="Métricas del pool de conexiones a la base de datos",
+    description="""
+    Retorna el estado del pool del worker que atiende la petición: conexiones abiertas,
+    en uso y de overflow, esperas por una conexión (promedio, máximo, timeouts) y
+    consultas lentas registradas.
+    """
+)
+async def get_db_pool_stats() -> dict:
+    """
+    Endpoint para dimensionar las conexiones a Postgres bajo carga
+    """
+    return get_pool_stats()
+
+@health_router.get(
+    "/password-hasher/stats",
+    summary="Métricas del pool de bcrypt",
+    description="""
+    Retorna el costo de bcrypt, los hilos del pool, los hashes en curso y en cola,
+    los rechazados por cola llena y los re-hash hechos al iniciar sesión.
+    """
+)
+async def get_password_hasher_stats() -> dict:
+    """
+    Endpoint para vigilar la cola de login y registro
+    """
+    return password_hasher.get_stats()
+
+@health_router.get(
+    "/auth/stats",
+    summary="Métricas de la caché de autenticación",
+    description="""
+    Retorna aciertos, fallos, expiraciones y desalojos de la caché de tokens verificados
+    y, si AUTH_LOAD_USER está activo, de la caché de usuarios.
+    """
+)
+async def get_auth_stats() -> dict:
+    """
+    Endpoint para consultar las métricas de la caché de JWT
+    """
+    return token_auth_service.get_stats()
+
+
+@health_router.get(
+    "/mail/stats",
+    summary="Métricas de la cola de correo",
+    description="""
+    Retorna los correos en cola y en espera de reintento, los enviados, reintentados y
+    fallidos, y el estado del transporte (conexiones SMTP abiertas e inactivas, lotes).
+    """
+)
+async def get_mail_stats() -> dict:
+    """
+    Endpoint para vigilar el envío de correos
+    """
+    return mail_queue.get_stats()
+
+@health_router.get(
+    "/templates/stats",
+    summary="Métricas del registro de plantillas",
+    description="""
+    Retorna las plantillas compiladas, el tiempo de carga al arrancar, si la recarga
+    en caliente está activa (solo en desarrollo) y los renders hechos.
+    """
+)
+async def get_template_stats() -> dict:
+    """
+    Endpoint para verificar que las plantillas se sirven desde memoria
+    """
+    return template_registry.get_stats()
@@ -1,6 +1,10 @@
 from fastapi import APIRouter
 from api.routes.AirQualityRouter import air_quality_router
+from api.routes.AuthRouter import auth_router
+from api.routes.HealthRouter import health_router
 
 main_router = APIRouter(prefix="/api/v1")
 
+main_router.include_router(auth_router)
 main_router.include_router(air_quality_router)
+main_router.include_router(health_router)
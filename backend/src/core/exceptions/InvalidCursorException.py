@@ -0,0 +1,9 @@
+from shared.errors.ApiResponse import ApiResponse
+
+class InvalidCursorException(ApiResponse):
+    def __init__(self, message: str = "Invalid pagination cursor."):
+        super().__init__(
+            status_code=400,
+            message=message
+        )
+        self.name = self.__class__.__name__
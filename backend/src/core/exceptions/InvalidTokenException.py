@@ -0,0 +1,9 @@
+from shared.errors.ApiResponse import ApiResponse
+
+class InvalidTokenException(ApiResponse):
+    def __init__(self, message: str = "Invalid or expired token."):
+        super().__init__(
+            status_code=401,
+            message=message
+        )
+        self.name = self.__class__.__name__
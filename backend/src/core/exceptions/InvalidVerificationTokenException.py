@@ -0,0 +1,9 @@
+from shared.errors.ApiResponse import ApiResponse
+
+class InvalidVerificationTokenException(ApiResponse):
+    def __init__(self, message: str = "Invalid or already used verification token."):
+        super().__init__(
+            status_code=400,
+            message=message
+        )
+        self.name = self.__class__.__name__
@@ -0,0 +1,10 @@
+from shared.errors.ApiResponse import ApiResponse
+
+class RenderPoolSaturatedException(ApiResponse):
+    def __init__(self, retry_after: int, message: str = "The report renderer is busy. Please retry later."):
+        super().__init__(
+            status_code=503,
+            message=message
+        )
+        self.name = self.__class__.__name__
+        self.retry_after = retry_after
@@ -0,0 +1,154 @@
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Dict, Optional
+
+class CircuitState(str, Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+class CircuitBreaker:
+    """
+    Circuit breaker por proveedor basado en la tasa de errores y llamadas lentas recientes
+    """
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        failure_rate_threshold: float = 0.5,
+        min_calls: int = 5,
+        slow_call_seconds: float = 15.0,
+        open_seconds: float = 60.0,
+        half_open_max_calls: int = 1,
+        latency_alpha: float = 0.2
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.latency_alpha = latency_alpha
+
+        self.state = CircuitState.CLOSED
+        self._window = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+
+        self.avg_latency: Optional[float] = None
+        self.total_calls = 0
+        self.total_successes = 0
+        self.total_failures = 0
+        self.rejected_calls = 0
+        self.last_error: Optional[str] = None
+
+    def allow_request(self) -> bool:
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.rejected_calls += 1
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                self.rejected_calls += 1
+                return False
+            self._half_open_calls += 1
+
+        return True
+
+    def record_success(self, latency: float) -> None:
+        self._update_latency(latency)
+        self.total_calls += 1
+        self.total_successes += 1
+
+        # Una llamada exitosa pero lenta cuenta como fallo para la ventana
+        healthy = latency < self.slow_call_seconds
+        self._window.append(healthy)
+
+        if self.state == CircuitState.HALF_OPEN:
+            if healthy:
+                self._close()
+            else:
+                self._open()
+            return
+
+        self._evaluate()
+
+    def record_failure(self, latency: float, error: Optional[str] = None) -> None:
+        self._update_latency(latency)
+        self.total_calls += 1
+        self.total_failures += 1
+        self.last_error = error
+        self._window.append(False)
+
+        if self.state == CircuitState.HALF_OPEN:
+            self._open()
+            return
+
+        self._evaluate()
+
+    def record_cancelled(self, elapsed: float, timed_out: bool = False) -> None:
+        # Cancelada por el tiempo límite o después de `slow_call_seconds`: cuenta como llamada lenta,
+        # así un proveedor que nunca responde termina abriendo su circuito
+        if timed_out or elapsed >= self.slow_call_seconds:
+            reason = "Tiempo límite agotado" if timed_out else "Cancelada por lenta"
+            self.record_failure(elapsed, f"{reason} ({elapsed:.1f}s)")
+            return
+
+        # Perdió la carrera antes de ser lenta: no cuenta como éxito ni fallo, pero su
+        # duración es una cota inferior de la latencia del proveedor
+        if self.avg_latency is None or elapsed > self.avg_latency:
+            self._update_latency(elapsed)
+
+        if self.state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    @property
+    def failure_rate(self) -> float:
+        if not self._window:
+            return 0.0
+        return self._window.count(False) / len(self._window)
+
+    def _evaluate(self) -> None:
+        if len(self._window) >= self.min_calls and self.failure_rate >= self.failure_rate_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        if self.state != CircuitState.OPEN:
+            print(f"🔴 Circuito de {self.name} abierto (tasa de fallos: {self.failure_rate:.0%})")
+        self.state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._half_open_calls = 0
+
+    def _close(self) -> None:
+        print(f"🟢 Circuito de {self.name} cerrado")
+        self.state = CircuitState.CLOSED
+        self._window.clear()
+        self._half_open_calls = 0
+
+    def _update_latency(self, latency: float) -> None:
+        if self.avg_latency is None:
+            self.avg_latency = latency
+        else:
+            self.avg_latency = self.latency_alpha * latency + (1 - self.latency_alpha) * self.avg_latency
+
+    def get_stats(self) -> Dict[str, Any]:
+        retry_in = 0
+        if self.state == CircuitState.OPEN:
+            retry_in = max(0, round(self.open_seconds - (time.monotonic() - self._opened_at)))
+
+        return {
+            "state": self.state.value,
+            "failureRate": round(self.failure_rate, 4),
+            "windowSize": len(self._window),
+            "avgLatencySeconds": round(self.avg_latency, 3) if self.avg_latency is not None else None,
+            "totalCalls": self.total_calls,
+            "successes": self.total_successes,
+            "failures": self.total_failures,
+            "rejectedCalls": self.rejected_calls,
+            "retryInSeconds": retry_in,
+            "lastError": self.last_error
+        }
@@ -0,0 +1,32 @@
+from typing import List, NamedTuple
+
+from api.dto.AirQuality.AirQualityDto import AirQualityData
+
+class Contaminant(NamedTuple):
+    field: str
+    name: str
+    label: str
+    chart_label: str
+    description: str
+
+# Orden común de los contaminantes en todos los formatos de reporte
+CONTAMINANTS = [
+    Contaminant("no2_density", "NO2", "NO₂ (Dióxido de Nitrógeno)", "NO₂", "Gases de escape, plantas de energía"),
+    Contaminant("co_density", "CO", "CO (Monóxido de Carbono)", "CO", "Combustión incompleta"),
+    Contaminant("o3_density", "O3", "O₃ (Ozono)", "O₃", "Reacciones fotoquímicas"),
+    Contaminant("so2_density", "SO2", "SO₂ (Dióxido de Azufre)", "SO₂", "Combustión de combustibles fósiles"),
+    Contaminant("ch4_density", "CH4", "CH₄ (Metano)", "CH₄", "Agricultura, ganadería"),
+    Contaminant("hcho_density", "HCHO", "HCHO (Formaldehído)", "HCHO", "Procesos industriales, vehículos")
+]
+
+# Color de cada contaminante en los gráficos, en el mismo orden de CONTAMINANTS
+CHART_COLORS = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99', '#ff99cc', '#c2c2f0']
+
+def normalized_contaminants(data: AirQualityData) -> List[float]:
+    """
+    Concentración de cada contaminante como porcentaje del mayor
+    """
+    values = [getattr(data, contaminant.field) or 0 for contaminant in CONTAMINANTS]
+
+    max_val = max(values) if max(values) > 0 else 1
+    return [v/max_val * 100 for v in values]
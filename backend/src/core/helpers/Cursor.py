@@ -0,0 +1,39 @@
+import json
+import base64
+import binascii
+from typing import Any, List, Optional, Sequence
+from core.exceptions.InvalidCursorException import InvalidCursorException
+
+# Cursor opaco para paginación keyset: valores de las columnas de orden del último registro,
+# en JSON y base64url. Solo admite valores JSON (enteros, textos), como las llaves indexadas.
+
+def encode_cursor(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, expected_length: int, expected_types: Optional[Sequence[type]] = None) -> List[Any]:
+    """
+    expected_types: tipo de Python de cada columna de orden; un cursor con otros tipos se
+    rechaza aquí y no llega a la base de datos como un error de SQL
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise InvalidCursorException()
+
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise InvalidCursorException()
+
+    types = expected_types or [object] * expected_length
+    if not all(_is_cursor_value(value, expected) for value, expected in zip(values, types)):
+        raise InvalidCursorException()
+    return values
+
+def _is_cursor_value(value: Any, expected: type) -> bool:
+    # Solo escalares JSON; bool es subclase de int pero nunca es una llave válida
+    if value is None or isinstance(value, (bool, list, dict)):
+        return False
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
@@ -0,0 +1,52 @@
+from math import cos, floor, radians
+from typing import Tuple
+
+KM_PER_DEGREE = 111.0
+
+# Tamaño nominal de un píxel de Sentinel-5P (along-track x across-track)
+S5P_PIXEL_KM = (5.5, 3.5)
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+def encode_geohash(lat: float, lon: float, precision: int = 5) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(geohash) < precision:
+        value_range, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (value_range[0] + value_range[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            value_range[0] = mid
+        else:
+            bits = bits << 1
+            value_range[1] = mid
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+def snap_to_s5p_cell(lat: float, lon: float, pixel_km: Tuple[float, float] = S5P_PIXEL_KM) -> Tuple[int, int]:
+    lat_step = pixel_km[1] / KM_PER_DEGREE
+    row = floor(lat / lat_step)
+
+    # El ancho en grados de la celda crece con la latitud para mantener los km constantes
+    center_lat = (row + 0.5) * lat_step
+    lon_step = pixel_km[0] / (KM_PER_DEGREE * max(cos(radians(center_lat)), 0.01))
+    col = floor(lon / lon_step)
+
+    return row, col
+
+def snap_to_grid(lat: float, lon: float, grid: str = "s5p", geohash_precision: int = 5) -> Tuple:
+    if grid == "geohash":
+        return ("geohash", encode_geohash(lat, lon, geohash_precision))
+    return ("s5p",) + snap_to_s5p_cell(lat, lon)
@@ -1,47 +1,49 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from math import ceil
-from typing import Generic, List, TypeVar, Callable, Dict
+from typing import Generic, List, Optional, TypeVar, Callable, Dict
 
 T = TypeVar("T")
 
 @dataclass(frozen=True)
 class Pager(Generic[T]):
     registers: List[T]
-    total: int
+    # En paginación keyset el total es opcional (None) o estimado
+    total: Optional[int]
     page_index: int
     page_size: int
     search: str
+    cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
     @property
-    def total_pages(self) -> int:
+    def is_keyset(self) -> bool:
+        return self.cursor is not None
+
+    @property
+    def total_pages(self) -> Optional[int]:
+        if self.total is None:
+            return None
         return ceil(self.total / self.page_size) if self.page_size else 1
 
     @property
     def has_previous_page(self) -> bool:
+        if self.is_keyset:
+            return self.cursor != ""
         return self.page_index > 1
 
     @property
     def has_next_page(self) -> bool:
-        return self.page_index < self.total_pages
+        if self.is_keyset:
+            return self.next_cursor is not None
+        return self.total_pages is not None and self.page_index < self.total_pages
 
     def map_registers(self, mapper_fn: Callable[[T], T]) -> 'Pager':
-        return Pager(
-            registers=list(map(mapper_fn, self.registers)),
-            total=self.total,
-            page_index=self.page_index,
-            page_size=self.page_size,
-            search=self.search
-        )
+        return replace(self, registers=list(map(mapper_fn, self.registers)))
 
     def filter_registers(self, predicate_fn: Callable[[T], bool]) -> 'Pager':
         filtered = list(filter(predicate_fn, self.registers))
-        return Pager(
-            registers=filtered,
-            total=len(filtered),
-            page_index=self.page_index,
-            page_size=self.page_size,
-            search=self.search
-        )
+        return replace(self, registers=filtered, total=len(filtered), total_is_estimate=False)
 
     def get_pagination_info(self) -> Dict:
         return {
@@ -51,14 +53,28 @@ class Pager(Generic[T]):
             "totalPages": self.total_pages,
             "hasPrevious": self.has_previous_page,
             "hasNext": self.has_next_page,
-            "search": self.search
+            "search": self.search,
+            "nextCursor": self.next_cursor,
+            "totalIsEstimate": self.total_is_estimate
         }
     
-def create_pager(registers: List[T], total: int, page_index: int, page_size: int, search: str = "") -> Pager[T]:
+def create_pager(
+    registers: List[T],
+    total: Optional[int],
+    page_index: int,
+    page_size: int,
+    search: str = "",
+    cursor: Optional[str] = None,
+    next_cursor: Optional[str] = None,
+    total_is_estimate: bool = False
+) -> Pager[T]:
         return Pager(
         registers=registers,
         total=total,
         page_index=page_index,
         page_size=page_size,
-        search=search
+        search=search,
+        cursor=cursor,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate
         )
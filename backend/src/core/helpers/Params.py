@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass(frozen=True)
 class Params:
@@ -6,10 +7,15 @@ class Params:
     page_index: int = 1
     search: str = ''
     max_page_size: int = 50
+    # None: paginación por offset; "" o un cursor: paginación keyset (la primera página es "")
+    cursor: Optional[str] = None
+    # Total estimado con las estadísticas del planner en vez de COUNT(*)
+    estimate_total: bool = False
 
     @property
     def effective_page_size(self) -> int:
-        return min(self.page_size, self.max_page_size)
+        # Al menos un registro: con 0 la página keyset no tendría un último registro para el cursor
+        return max(min(self.page_size, self.max_page_size), 1)
 
     @property
     def effective_page_index(self) -> int:
@@ -19,12 +25,18 @@ class Params:
     def normalized_search(self) -> str:
         return self.search.lower()
 
+    @property
+    def is_keyset(self) -> bool:
+        return self.cursor is not None
+
     def with_page_size(self, new_size: int):
         return Params(
             page_size=new_size,
             page_index=self.page_index,
             search=self.search,
-            max_page_size=self.max_page_size
+            max_page_size=self.max_page_size,
+            cursor=self.cursor,
+            estimate_total=self.estimate_total
         )
 
     def with_page_index(self, new_index: int):
@@ -32,7 +44,19 @@ class Params:
             page_size=self.page_size,
             page_index=new_index,
             search=self.search,
-            max_page_size=self.max_page_size
+            max_page_size=self.max_page_size,
+            cursor=self.cursor,
+            estimate_total=self.estimate_total
+        )
+
+    def with_cursor(self, new_cursor: Optional[str]):
+        return Params(
+            page_size=self.page_size,
+            page_index=self.page_index,
+            search=self.search,
+            max_page_size=self.max_page_size,
+            cursor=new_cursor,
+            estimate_total=self.estimate_total
         )
 
     def with_search(self, new_search: str):
@@ -40,18 +64,24 @@ class Params:
             page_size=self.page_size,
             page_index=self.page_index,
             search=new_search,
-            max_page_size=self.max_page_size
+            max_page_size=self.max_page_size,
+            cursor=self.cursor,
+            estimate_total=self.estimate_total
         )
     
 def create_params(
     page_size: int = 10,
     page_index: int = 1,
     search: str = '',
-    max_page_size: int = 50
+    max_page_size: int = 50,
+    cursor: Optional[str] = None,
+    estimate_total: bool = False
 ) -> Params:
     return Params(
         page_size=page_size,
         page_index=page_index,
         search=search,
-        max_page_size=max_page_size
+        max_page_size=max_page_size,
+        cursor=cursor,
+        estimate_total=estimate_total
     )
@@ -0,0 +1,37 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+class SingleFlight(Generic[T]):
+    """
+    Agrupa llamadas concurrentes con la misma clave en una sola ejecución compartida
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task[T]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        # shield evita que cancelar a un llamador cancele la consulta de los demás
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "inFlight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced
+        }
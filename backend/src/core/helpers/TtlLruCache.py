@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+@dataclass
+class CacheEntry(Generic[T]):
+    value: T
+    size: int
+    expires_at: float
+
+class TtlLruCache(Generic[T]):
+    """
+    Caché en memoria con expiración por TTL y desalojo LRU bajo un presupuesto de bytes
+    """
+    def __init__(self, ttl_seconds: float, max_bytes: int, sizeof: Callable[[T], int] = lambda value: 1):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+
+        self._entries: "OrderedDict[Hashable, CacheEntry[T]]" = OrderedDict()
+        self._lock = Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[T]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: Hashable, value: T, ttl_seconds: Optional[float] = None) -> None:
+        """
+        ttl_seconds reemplaza el TTL por defecto solo para esta entrada
+        """
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = CacheEntry(
+                value=value,
+                size=size,
+                expires_at=time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+            )
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "maxBytes": self.max_bytes,
+            "ttlSeconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hitRatio": round(self.hits / total, 4) if total else 0.0
+        }
@@ -1,31 +1,52 @@
-import requests
+import asyncio
+from bisect import bisect_left
 import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from sentinelsat import SentinelAPI
-import openeo
-import io
-import base64
+from typing import Optional, Dict, Any, List, AsyncIterator, Iterator, Tuple
 import os
+import tempfile
+import time
 from dotenv import load_dotenv
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.linecharts import HorizontalLineChart
-from reportlab.graphics.charts.barcharts import VerticalBarChart
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  
-
 from api.dto.AirQuality.AirQualityDto import AirQualityData, CoordinatesRequest
+from infrastructure.config.HttpClient import HttpClient
+from infrastructure.services.CopernicusSessionManager import CopernicusSessionManager
+from core.helpers.TtlLruCache import TtlLruCache
+from core.helpers.GeoGrid import snap_to_grid
+from core.helpers.SingleFlight import SingleFlight
+from core.helpers.CircuitBreaker import CircuitBreaker, CircuitState
+from core.service.ReportRenderer import render_air_quality_pdf, render_multi_location_pdf, init_render_worker, warm_up, CHART_BACKEND
+from core.service.ReportExporter import render_air_quality_csv, render_air_quality_json, render_air_quality_html
+from infrastructure.services.RenderPool import RenderPool
+from infrastructure.services.ReportCache import ReportCache
+from infrastructure.services.ReportJobQueue import create_report_job_queue
 
 # Cargar variables de entorno
 load_dotenv()
 
+# Motivo con el que se cancelan los proveedores que siguen corriendo al vencer el tiempo límite
+PROVIDER_DEADLINE = "provider-deadline"
+
+# Límite superior del AQI para cada categoría; por encima del último la calidad es "Peligrosa"
+AQI_CATEGORY_LIMITS = [50, 100, 150, 200, 300]
+
+AQI_CATEGORIES = [
+    "Buena",
+    "Moderada",
+    "Dañina para grupos sensibles",
+    "Dañina",
+    "Muy dañina",
+    "Peligrosa"
+]
+
+AQI_HEALTH_RECOMMENDATIONS = [
+    "La calidad del aire es satisfactoria. El aire está limpio y presenta poco o ningún riesgo.",
+    "La calidad del aire es aceptable. Personas extremadamente sensibles pueden experimentar síntomas menores.",
+    "Grupos sensibles pueden experimentar síntomas. El público general no suele verse afectado.",
+    "Todos pueden comenzar a experimentar efectos en la salud. Los grupos sensibles pueden experimentar efectos más serios.",
+    "Advertencia de salud: todos pueden experimentar efectos más serios en la salud.",
+    "Alerta de salud: condiciones de emergencia. Toda la población tiene más probabilidades de verse afectada."
+]
+
 class AirQualityService:
     def __init__(self):
         self.use_mock_data = os.getenv("USE_MOCK_DATA", "false").lower() == "true"
@@ -36,54 +57,380 @@ class AirQualityService:
         self.cdse_base_url = "https://catalogue.dataspace.copernicus.eu/odata/v1"
         self.cdse_token_url = "https://identity.dataspace.copernicus.eu/auth/realms/CDSE/protocol/openid-connect/token"
         
+        self.http_client = HttpClient(hosts=[self.cdse_base_url, self.cdse_token_url])
+        self.sessions = CopernicusSessionManager(
+            self.http_client,
+            self.copernicus_user,
+            self.copernicus_password,
+            self.cdse_token_url
+        )
+        
+        # Proveedores disponibles y estrategia de consulta (sequential, hedge o race)
+        self.providers = {
+            "sentinelsat": ("SentinelSat", self._get_data_via_sentinelsat),
+            "cdse": ("CDSE API", self._get_data_via_cdse_search),
+            "openeo": ("OpenEO", self._get_data_via_openeo)
+        }
+        self.provider_order = [
+            name.strip().lower()
+            for name in os.getenv("AIR_QUALITY_PROVIDER_ORDER", "sentinelsat,cdse,openeo").split(",")
+            if name.strip().lower() in self.providers
+        ]
+        self.provider_mode = os.getenv("AIR_QUALITY_PROVIDER_MODE", "hedge").lower()
+        self.hedge_delay = float(os.getenv("AIR_QUALITY_HEDGE_DELAY", 2))
+        self.provider_deadline = float(os.getenv("AIR_QUALITY_PROVIDER_DEADLINE", 45))
+        self.adaptive_order = os.getenv("AIR_QUALITY_ADAPTIVE_ORDER", "true").lower() == "true"
+        self.breakers = {
+            name: CircuitBreaker(
+                label,
+                window_size=int(os.getenv("AIR_QUALITY_BREAKER_WINDOW", 20)),
+                failure_rate_threshold=float(os.getenv("AIR_QUALITY_BREAKER_FAILURE_RATE", 0.5)),
+                min_calls=int(os.getenv("AIR_QUALITY_BREAKER_MIN_CALLS", 5)),
+                slow_call_seconds=float(os.getenv("AIR_QUALITY_BREAKER_SLOW_CALL", 15)),
+                open_seconds=float(os.getenv("AIR_QUALITY_BREAKER_OPEN_SECONDS", 60))
+            )
+            for name, (label, _) in self.providers.items()
+        }
+        
+        # Caché de resúmenes por celda de la grilla (s5p o geohash), radio y franja de tiempo
+        self.cache_enabled = os.getenv("AIR_QUALITY_CACHE_ENABLED", "true").lower() == "true"
+        self.cache_grid = os.getenv("AIR_QUALITY_CACHE_GRID", "s5p").lower()
+        self.cache_geohash_precision = int(os.getenv("AIR_QUALITY_CACHE_GEOHASH_PRECISION", 5))
+        self.cache_time_bucket = int(os.getenv("AIR_QUALITY_CACHE_TIME_BUCKET", 3600))
+        self.summary_cache = TtlLruCache(
+            ttl_seconds=float(os.getenv("AIR_QUALITY_CACHE_TTL", 3600)),
+            max_bytes=int(os.getenv("AIR_QUALITY_CACHE_MAX_BYTES", 16 * 1024 * 1024)),
+            sizeof=lambda data: len(data.model_dump_json())
+        )
+        # Los datos de respaldo (ningún proveedor respondió) se guardan poco tiempo para no
+        # seguir sirviéndolos cuando los proveedores se recuperan
+        self.cache_fallback_ttl = float(os.getenv("AIR_QUALITY_CACHE_FALLBACK_TTL", 60))
+        
+        # Consultas idénticas en curso comparten una sola llamada a Copernicus
+        self.summary_flight = SingleFlight()
+        
+        # Celdas consultadas en paralelo al resolver un lote de puntos
+        self.batch_concurrency = int(os.getenv("AIR_QUALITY_BATCH_CONCURRENCY", 16))
+        self.stream_window = int(os.getenv("AIR_QUALITY_STREAM_WINDOW", 16))
+        
+        self.render_pool = RenderPool(initializer=init_render_worker, warm_up=warm_up)
+        self.report_cache = ReportCache()
+        self.report_flight = SingleFlight()
+        self.report_jobs = create_report_job_queue(self._render_report_job)
+        
+        # Reportes multi-sitio: se escriben en disco y se transmiten por bloques
+        self.multi_report_dir = os.getenv("REPORT_MULTI_DIR", os.path.join(tempfile.gettempdir(), "ecoshield_multi_reports"))
+        self.report_stream_chunk_bytes = int(os.getenv("REPORT_STREAM_CHUNK_BYTES", 64 * 1024))
+        
         print(f"🌍 AirQualityService iniciado - Modo: {'MOCK' if self.use_mock_data else 'REAL'}")
+    
+    async def startup(self):
+        """
+        Abre los recursos compartidos del servicio al iniciar la aplicación
+        """
+        self.http_client.open()
+        await self.render_pool.start()
+        await self.report_jobs.start()
+    
+    async def shutdown(self):
+        """
+        Libera los recursos compartidos del servicio al detener la aplicación
+        """
+        await self.sessions.close()
+        await self.http_client.close()
+        await self.report_jobs.close()
+        await self.render_pool.close()
         
     async def get_air_quality_summary(self, coordinates: CoordinatesRequest) -> AirQualityData:
         """
-        Obtiene datos de calidad del aire desde Sentinel-5P para las coordenadas dadas
+        Obtiene datos de calidad del aire desde Sentinel-5P para las coordenadas dadas,
+        sirviendo desde la caché cuando la celda ya fue consultada en la franja actual
+        y compartiendo una sola consulta entre peticiones simultáneas de la misma celda
+        """
+        cache_key = self._summary_cache_key(coordinates)
+        if self.cache_enabled:
+            cached = self.summary_cache.get(cache_key)
+            if cached:
+                print(f"⚡ Resumen servido desde caché ({cache_key})")
+                return self._with_coordinates(cached, coordinates)
+        
+        async def fetch() -> AirQualityData:
+            data, is_fallback = await self._fetch_air_quality_summary(coordinates)
+            if self.cache_enabled:
+                self.summary_cache.set(cache_key, data, ttl_seconds=self.cache_fallback_ttl if is_fallback else None)
+            return data
+        
+        # La franja de tiempo no forma parte de la clave de agrupación
+        data = await self.summary_flight.do(cache_key[:-1], fetch)
+        return self._with_coordinates(data, coordinates)
+    
+    def _with_coordinates(self, data: AirQualityData, coordinates: CoordinatesRequest) -> AirQualityData:
+        """
+        Copia un resumen compartido con las coordenadas de quien lo solicitó
+        """
+        if data.coordinates == {"lat": coordinates.lat, "lon": coordinates.lon}:
+            return data
+        return data.model_copy(update={"coordinates": {"lat": coordinates.lat, "lon": coordinates.lon}})
+    
+    async def get_air_quality_summary_batch(self, points: List[CoordinatesRequest]) -> List[AirQualityData]:
+        """
+        Obtiene resúmenes para muchos puntos agrupándolos por celda: cada celda se consulta una
+        sola vez y el AQI, la categoría y las recomendaciones se calculan en bloque con NumPy.
+        Los resultados conservan el orden de entrada.
+        """
+        if not points:
+            return []
+        
+        groups = self._group_points_by_tile(points)
+        representatives = [points[indexes[0]] for indexes in groups]
+        point_tiles = np.empty(len(points), dtype=np.int64)
+        for tile, indexes in enumerate(groups):
+            point_tiles[indexes] = tile
+        
+        print(f"📦 Lote de {len(points)} puntos agrupado en {len(representatives)} celdas")
+        
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        
+        async def resolve(point: CoordinatesRequest) -> AirQualityData:
+            async with semaphore:
+                return await self.get_air_quality_summary(point)
+        
+        tiles = await asyncio.gather(*[resolve(point) for point in representatives])
+        
+        densities = np.array(
+            [[t.no2_density or 0, t.co_density or 0, t.o3_density or 0, t.so2_density or 0] for t in tiles],
+            dtype=np.float64
+        )
+        tile_aqi = self._calculate_air_quality_index_batch(*densities.T)
+        tile_categories = self._get_air_quality_category_batch(tile_aqi)
+        tile_recommendations = self._get_health_recommendations_batch(tile_aqi)
+        
+        aqi = tile_aqi[point_tiles].tolist()
+        categories = tile_categories[point_tiles].tolist()
+        recommendations = tile_recommendations[point_tiles].tolist()
+        
+        return [
+            tiles[tile].model_copy(update={
+                "coordinates": {"lat": point.lat, "lon": point.lon},
+                "air_quality_index": aqi[i],
+                "air_quality_category": categories[i],
+                "health_recommendations": recommendations[i]
+            })
+            for i, (point, tile) in enumerate(zip(points, point_tiles.tolist()))
+        ]
+    
+    async def stream_air_quality_summaries(self, points: List[CoordinatesRequest]) -> AsyncIterator[AirQualityData]:
+        """
+        Entrega los resúmenes a medida que se resuelve cada celda, con a lo sumo
+        `stream_window` celdas en curso. Solo se lanzan nuevas consultas cuando el
+        consumidor pide más resultados, por lo que la memoria no crece con el lote.
+        """
+        groups = iter(self._group_points_by_tile(points))
+        pending = {}
+        
+        def launch_next() -> bool:
+            indexes = next(groups, None)
+            if indexes is None:
+                return False
+            task = asyncio.ensure_future(self.get_air_quality_summary(points[indexes[0]]))
+            pending[task] = indexes
+            return True
+        
+        try:
+            while len(pending) < self.stream_window and launch_next():
+                pass
+            
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    indexes = pending.pop(task)
+                    tile = task.result()
+                    for i in indexes:
+                        yield self._with_coordinates(tile, points[i])
+                    launch_next()
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def _group_points_by_tile(self, points: List[CoordinatesRequest]) -> List[List[int]]:
+        """
+        Agrupa los índices de los puntos por celda de caché, en orden de primera aparición
+        """
+        groups: Dict[tuple, List[int]] = {}
+        for i, point in enumerate(points):
+            groups.setdefault(self._summary_cache_key(point), []).append(i)
+        return list(groups.values())
+    
+    async def _fetch_air_quality_summary(self, coordinates: CoordinatesRequest) -> Tuple[AirQualityData, bool]:
+        """
+        Consulta los datos de calidad del aire sin pasar por la caché.
+        El segundo valor indica si son datos de respaldo porque ningún proveedor respondió.
         """
         try:
             if self.use_mock_data:
                 print("📊 Usando datos simulados")
-                return await self._get_mock_air_quality_data(coordinates)
+                return await self._get_mock_air_quality_data(coordinates), False
             else:
                 print("🛰️ Consultando Sentinel-5P...")
-                return await self._get_real_sentinel_data(coordinates)
+                result = await self._get_real_sentinel_data(coordinates)
+                if result:
+                    return result, False
+                
+                print("🌍 Generando datos realistas basados en ubicación...")
+                return await self._get_realistic_mock_data(coordinates), True
         except Exception as e:
             print(f"❌ Error: {str(e)}")
             print("🔄 Fallback a datos simulados")
-            return await self._get_mock_air_quality_data(coordinates)
+            return await self._get_mock_air_quality_data(coordinates), True
     
-    async def _get_real_sentinel_data(self, coordinates: CoordinatesRequest) -> AirQualityData:
+    def _summary_cache_key(self, coordinates: CoordinatesRequest) -> tuple:
         """
-        Obtiene datos reales usando múltiples métodos
+        Clave de caché: celda de la grilla, radio redondeado y franja de tiempo
         """
-        try:
-            print("🔄 Intentando SentinelSat...")
-            result = await self._get_data_via_sentinelsat(coordinates)
-            if result:
-                return result
-        except Exception as e:
-            print(f"⚠️ SentinelSat falló: {e}")
+        cell = snap_to_grid(coordinates.lat, coordinates.lon, self.cache_grid, self.cache_geohash_precision)
+        time_bucket = int(time.time() // self.cache_time_bucket)
+        return cell + (round(coordinates.radius, 1), time_bucket)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.cache_enabled,
+            "grid": self.cache_grid,
+            "timeBucketSeconds": self.cache_time_bucket,
+            "fallbackTtlSeconds": self.cache_fallback_ttl,
+            **self.summary_cache.get_stats(),
+            "singleFlight": self.summary_flight.get_stats(),
+            "reports": self.report_cache.get_stats()
+        }
+
+    
+    async def _get_real_sentinel_data(self, coordinates: CoordinatesRequest) -> Optional[AirQualityData]:
+        """
+        Obtiene datos reales consultando los proveedores según la estrategia configurada;
+        None si ninguno respondió a tiempo
+        """
+        return await self._race_providers(coordinates, self._ordered_providers())
+    
+    async def _race_providers(self, coordinates: CoordinatesRequest, order: List[str]) -> Optional[AirQualityData]:
+        """
+        Lanza los proveedores en orden y devuelve el primer resultado válido.
+        En modo hedge el siguiente proveedor arranca tras `hedge_delay` segundos sin respuesta,
+        en modo race arrancan todos a la vez y en modo sequential solo cuando el anterior falla.
+        Los proveedores que pierden la carrera se cancelan.
+        """
+        if self.provider_mode == "race":
+            hedge_delay = 0
+        elif self.provider_mode == "sequential":
+            hedge_delay = None
+        else:
+            hedge_delay = self.hedge_delay
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.provider_deadline
+        queue = list(order)
+        pending = set()
+        cancel_reason = None
+        
+        def launch_next():
+            # Los proveedores con el circuito abierto se omiten sin consumir el retardo
+            while queue:
+                name = queue.pop(0)
+                label, _ = self.providers[name]
+                if not self.breakers[name].allow_request():
+                    print(f"⏭️ {label} omitido: circuito {self.breakers[name].state.value}")
+                    continue
+                print(f"🔄 Intentando {label}...")
+                pending.add(asyncio.create_task(self._run_provider(name, coordinates)))
+                return
+        
+        launch_due = False
         
         try:
-            print("🔄 Intentando CDSE API...")
-            result = await self._get_data_via_cdse_search(coordinates)
-            if result:
-                return result
-        except Exception as e:
-            print(f"⚠️ CDSE API falló: {e}")
-        
+            while queue or pending:
+                # El tiempo se revisa antes de lanzar: una tarea cancelada antes de arrancar nunca
+                # llega a _run_provider y dejaría ocupado el cupo de prueba del circuito HALF_OPEN
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    print(f"⏱️ Se agotó el tiempo límite de {self.provider_deadline}s para los proveedores")
+                    cancel_reason = PROVIDER_DEADLINE
+                    return None
+                
+                if hedge_delay == 0:
+                    while queue:
+                        launch_next()
+                elif not pending or launch_due:
+                    launch_next()
+                
+                if not pending:
+                    return None
+                
+                timeout = remaining if hedge_delay is None or not queue else min(remaining, hedge_delay)
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    result = task.result()
+                    if result:
+                        return result
+                
+                # Si hubo fallos o venció el retardo de cobertura, arranca el siguiente proveedor
+                launch_due = bool(queue) and bool(done or hedge_delay is not None)
+            
+            return None
+        finally:
+            # El motivo le indica al circuit breaker si la cancelación fue por el tiempo límite
+            for task in pending:
+                task.cancel(cancel_reason)
+    
+    async def _run_provider(self, name: str, coordinates: CoordinatesRequest) -> Optional[AirQualityData]:
+        """
+        Ejecuta un proveedor capturando sus errores y registrando su resultado en el circuit breaker
+        """
+        label, provider = self.providers[name]
+        breaker = self.breakers[name]
+        start = time.perf_counter()
         try:
-            print("🔄 Intentando OpenEO...")
-            result = await self._get_data_via_openeo(coordinates)
-            if result:
-                return result
+            result = await provider(coordinates)
+        except asyncio.CancelledError as e:
+            print(f"🛑 {label} cancelado")
+            breaker.record_cancelled(time.perf_counter() - start, timed_out=PROVIDER_DEADLINE in e.args)
+            raise
         except Exception as e:
-            print(f"⚠️ OpenEO falló: {e}")
+            print(f"⚠️ {label} falló: {e}")
+            breaker.record_failure(time.perf_counter() - start, str(e))
+            return None
+        
+        if result:
+            breaker.record_success(time.perf_counter() - start)
+        else:
+            breaker.record_failure(time.perf_counter() - start, "Sin datos")
+        return result
+    
+    def _ordered_providers(self) -> List[str]:
+        """
+        Ordena los proveedores: primero los sanos con menos fallos recientes y menor latencia,
+        luego los que están en prueba y al final los de circuito abierto.
+        Sin métricas se respeta el orden configurado.
+        """
+        if not self.adaptive_order:
+            return list(self.provider_order)
+        
+        state_rank = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+        
+        def sort_key(name: str):
+            breaker = self.breakers[name]
+            return (state_rank[breaker.state], round(breaker.failure_rate, 1), breaker.avg_latency or 0.0)
         
-        print("🌍 Generando datos realistas basados en ubicación...")
-        return await self._get_realistic_mock_data(coordinates)
+        return sorted(self.provider_order, key=sort_key)
+    
+    def get_provider_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.provider_mode,
+            "hedgeDelaySeconds": self.hedge_delay,
+            "deadlineSeconds": self.provider_deadline,
+            "adaptiveOrder": self.adaptive_order,
+            "currentOrder": self._ordered_providers(),
+            "providers": {name: breaker.get_stats() for name, breaker in self.breakers.items()},
+            "sessions": self.sessions.get_stats()
+        }
     
     async def _get_data_via_sentinelsat(self, coordinates: CoordinatesRequest) -> Optional[AirQualityData]:
         """
@@ -92,12 +439,6 @@ class AirQualityService:
         try:
             print("🔐 Conectando con SentinelSat...")
             
-            api = SentinelAPI(
-                self.copernicus_user, 
-                self.copernicus_password,
-                'https://apihub.copernicus.eu/apihub'
-            )
-            
             bbox = self._create_bbox(coordinates.lat, coordinates.lon, coordinates.radius)
             footprint = f"POLYGON(({bbox['west']} {bbox['south']},{bbox['east']} {bbox['south']},{bbox['east']} {bbox['north']},{bbox['west']} {bbox['north']},{bbox['west']} {bbox['south']}))"
             
@@ -106,12 +447,14 @@ class AirQualityService:
             
             print(f"🔍 Buscando productos S5P desde {start_date.date()} hasta {end_date.date()}")
             
-            products = api.query(
-                area=footprint,
-                date=(start_date, end_date),
-                platformname='Sentinel-5P',
-                producttype='L2__NO2___',  
-                limit=5
+            products = await self.sessions.call_sentinel_api(
+                lambda api: api.query(
+                    area=footprint,
+                    date=(start_date, end_date),
+                    platformname='Sentinel-5P',
+                    producttype='L2__NO2___',  
+                    limit=5
+                )
             )
             
             print(f"✅ Encontrados {len(products)} productos")
@@ -154,7 +497,7 @@ class AirQualityService:
             
             print(f"🔍 Consultando productos para área: {bbox}")
             
-            response = requests.get(search_url, params=params, timeout=30)
+            response = await self.sessions.authorized_get(search_url, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -185,12 +528,6 @@ class AirQualityService:
         try:
             print("☁️ Conectando a OpenEO...")
             
-            connection = openeo.connect("https://openeo.cloud")
-            
-            connection.authenticate_basic(self.copernicus_user, self.copernicus_password)
-            
-            print("✅ Autenticado en OpenEO")
-            
             bbox = self._create_bbox(coordinates.lat, coordinates.lon, coordinates.radius)
             end_date = datetime.now()
             start_date = end_date - timedelta(days=7)
@@ -199,17 +536,17 @@ class AirQualityService:
             
             print(f"📊 Cargando colección S5P para período {start_date.date()} - {end_date.date()}")
             
-            datacube = connection.load_collection(
-                "SENTINEL5P_L2",
-                spatial_extent=bbox,
-                temporal_extent=temporal_extent,
-                bands=["NO2"]
-            )
-            
-            result = datacube.mean_time()
+            def execute(connection):
+                datacube = connection.load_collection(
+                    "SENTINEL5P_L2",
+                    spatial_extent=bbox,
+                    temporal_extent=temporal_extent,
+                    bands=["NO2"]
+                )
+                return datacube.mean_time().execute()
             
             print("📊 Ejecutando consulta...")
-            processed_result = result.execute()
+            processed_result = await self.sessions.call_openeo(execute)
             
             print("✅ Datos obtenidos de OpenEO")
             
@@ -470,165 +807,151 @@ class AirQualityService:
         """
         Determina la categoría de calidad del aire basada en el AQI
         """
-        if aqi <= 50:
-            return "Buena"
-        elif aqi <= 100:
-            return "Moderada"
-        elif aqi <= 150:
-            return "Dañina para grupos sensibles"
-        elif aqi <= 200:
-            return "Dañina"
-        elif aqi <= 300:
-            return "Muy dañina"
-        else:
-            return "Peligrosa"
+        return AQI_CATEGORIES[bisect_left(AQI_CATEGORY_LIMITS, aqi)]
     
     def _get_health_recommendations(self, aqi: int) -> str:
         """
         Proporciona recomendaciones de salud basadas en el AQI
         """
-        if aqi <= 50:
-            return "La calidad del aire es satisfactoria. El aire está limpio y presenta poco o ningún riesgo."
-        elif aqi <= 100:
-            return "La calidad del aire es aceptable. Personas extremadamente sensibles pueden experimentar síntomas menores."
-        elif aqi <= 150:
-            return "Grupos sensibles pueden experimentar síntomas. El público general no suele verse afectado."
-        elif aqi <= 200:
-            return "Todos pueden comenzar a experimentar efectos en la salud. Los grupos sensibles pueden experimentar efectos más serios."
-        elif aqi <= 300:
-            return "Advertencia de salud: todos pueden experimentar efectos más serios en la salud."
-        else:
-            return "Alerta de salud: condiciones de emergencia. Toda la población tiene más probabilidades de verse afectada."
+        return AQI_HEALTH_RECOMMENDATIONS[bisect_left(AQI_CATEGORY_LIMITS, aqi)]
     
-    async def generate_pdf_report(self, air_quality_data: AirQualityData, report_title: str = "Reporte de Calidad del Aire") -> bytes:
+    def _calculate_air_quality_index_batch(self, no2: np.ndarray, co: np.ndarray, o3: np.ndarray, so2: np.ndarray) -> np.ndarray:
         """
-        Genera un reporte PDF con los datos de calidad del aire
+        Versión vectorizada de _calculate_air_quality_index sobre arreglos de NumPy
         """
-      
-        
-        buffer = io.BytesIO()
-        
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        story = []
-        styles = getSampleStyleSheet()
-        
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            textColor=colors.HexColor('#2E86AB'),
-            alignment=1 
-        
-        story.append(Paragraph(report_title, title_style))
-        story.append(Spacer(1, 20))
-        
-        info_data = [
-            ['Coordenadas:', f"Lat: {air_quality_data.coordinates['lat']:.6f}, Lon: {air_quality_data.coordinates['lon']:.6f}"],
-            ['Fecha y Hora:', air_quality_data.timestamp.strftime('%d/%m/%Y %H:%M:%S')],
-            ['Radio de Análisis:', f"{air_quality_data.analysis_radius_km} km"],
-            ['Fuente de Datos:', air_quality_data.data_source],
-            ['Índice de Calidad del Aire:', f"{air_quality_data.air_quality_index} - {air_quality_data.air_quality_category}"]
-        ]
-        
-        info_table = Table(info_data, colWidths=[2*inch, 4*inch])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E8F4FD')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(info_table)
-        story.append(Spacer(1, 20))
-        
-        story.append(Paragraph("Concentración de Contaminantes", styles['Heading2']))
-        story.append(Spacer(1, 12))
-        
-        contaminants_data = [
-            ['Contaminante', 'Concentración (mol/m²)', 'Descripción'],
-            ['NO₂ (Dióxido de Nitrógeno)', f"{air_quality_data.no2_density:.8f}" if air_quality_data.no2_density else "N/A", 'Gases de escape, plantas de energía'],
-            ['CO (Monóxido de Carbono)', f"{air_quality_data.co_density:.8f}" if air_quality_data.co_density else "N/A", 'Combustión incompleta'],
-            ['O₃ (Ozono)', f"{air_quality_data.o3_density:.8f}" if air_quality_data.o3_density else "N/A", 'Reacciones fotoquímicas'],
-            ['SO₂ (Dióxido de Azufre)', f"{air_quality_data.so2_density:.8f}" if air_quality_data.so2_density else "N/A", 'Combustión de combustibles fósiles'],
-            ['CH₄ (Metano)', f"{air_quality_data.ch4_density:.8f}" if air_quality_data.ch4_density else "N/A", 'Agricultura, ganadería'],
-            ['HCHO (Formaldehído)', f"{air_quality_data.hcho_density:.8f}" if air_quality_data.hcho_density else "N/A", 'Procesos industriales, vehículos']
-        ]
-        
-        contaminants_table = Table(contaminants_data, colWidths=[2*inch, 1.5*inch, 2.5*inch])
-        contaminants_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(contaminants_table)
-        story.append(Spacer(1, 20))
-        
-        story.append(Paragraph("Recomendaciones de Salud", styles['Heading2']))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph(air_quality_data.health_recommendations, styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        chart_buffer = self._create_air_quality_chart(air_quality_data)
-        if chart_buffer:
-            chart_img = Image(chart_buffer, width=6*inch, height=4*inch)
-            story.append(chart_img)
-        
-        doc.build(story)
+        combined = (no2 / 0.00004) * 0.3 + (co / 0.00010) * 0.2 + (o3 / 0.00020) * 0.3 + (so2 / 0.00002) * 0.2
+        return np.clip(np.trunc(combined * 200), 0, 500).astype(np.int64)
+    
+    def _get_air_quality_category_batch(self, aqi: np.ndarray) -> np.ndarray:
+        """
+        Versión vectorizada de _get_air_quality_category
+        """
+        return np.asarray(AQI_CATEGORIES)[np.searchsorted(AQI_CATEGORY_LIMITS, aqi, side="left")]
+    
+    def _get_health_recommendations_batch(self, aqi: np.ndarray) -> np.ndarray:
+        """
+        Versión vectorizada de _get_health_recommendations
+        """
+        return np.asarray(AQI_HEALTH_RECOMMENDATIONS)[np.searchsorted(AQI_CATEGORY_LIMITS, aqi, side="left")]
+    
+    async def generate_pdf_report(
+        self,
+        air_quality_data: AirQualityData,
+        report_title: str = "Reporte de Calidad del Aire",
+        include_charts: bool = True
+    ) -> bytes:
+        """
+        Genera un reporte PDF con los datos de calidad del aire en el pool de procesos de renderizado
+        """
+        return await self.render_pool.submit(render_air_quality_pdf, air_quality_data, report_title, include_charts)
+    
+    async def generate_multi_location_report(
+        self,
+        locations: List[AirQualityData],
+        report_title: str,
+        include_charts: bool = True
+    ) -> str:
+        """
+        Genera el reporte consolidado de varios sitios en un archivo temporal y devuelve su ruta.
+        El PDF no pasa por la memoria del proceso principal: se transmite luego con stream_report_file.
+        """
+        fd, path = tempfile.mkstemp(prefix="multi_", suffix=".pdf", dir=self._multi_report_dir())
+        os.close(fd)
         
-        pdf_content = buffer.getvalue()
-        buffer.close()
+        try:
+            await self.render_pool.submit(render_multi_location_pdf, locations, path, report_title, include_charts)
+        except BaseException:
+            os.remove(path)
+            raise
         
-        return pdf_content
+        return path
     
-    def _create_air_quality_chart(self, data: AirQualityData) -> Optional[io.BytesIO]:
+    def stream_report_file(self, path: str) -> Iterator[bytes]:
         """
-        Crea un gráfico de barras con los datos de contaminantes
+        Lee el reporte en bloques y elimina el archivo al terminar (o si el cliente se desconecta)
         """
         try:
-            contaminants = ['NO₂', 'CO', 'O₃', 'SO₂', 'CH₄', 'HCHO']
-            values = [
-                data.no2_density or 0,
-                data.co_density or 0,
-                data.o3_density or 0,
-                data.so2_density or 0,
-                data.ch4_density or 0,
-                data.hcho_density or 0
-            ]
-            
-            max_val = max(values) if max(values) > 0 else 1
-            normalized_values = [v/max_val * 100 for v in values]
-            
-            plt.figure(figsize=(10, 6))
-            bars = plt.bar(contaminants, normalized_values, color=['#ff9999', '#66b3ff', '#99ff99', '#ffcc99', '#ff99cc', '#c2c2f0'])
-            
-            plt.title('Concentración Relativa de Contaminantes (%)', fontsize=14, fontweight='bold')
-            plt.ylabel('Concentración Relativa (%)', fontsize=12)
-            plt.xlabel('Contaminantes', fontsize=12)
-            
-            for bar, value in zip(bars, normalized_values):
-                plt.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 1,
-                        f'{value:.1f}%', ha='center', va='bottom', fontsize=10)
-            
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            
-            chart_buffer = io.BytesIO()
-            plt.savefig(chart_buffer, format='png', dpi=300, bbox_inches='tight')
-            chart_buffer.seek(0)
-            plt.close()
-            
-            return chart_buffer
-            
-        except Exception as e:
-            print(f"Error creando gráfico: {e}")
-            return None
\ No newline at end of file
+            with open(path, "rb") as file:
+                while chunk := file.read(self.report_stream_chunk_bytes):
+                    yield chunk
+        finally:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    def _multi_report_dir(self) -> str:
+        os.makedirs(self.multi_report_dir, exist_ok=True)
+        return self.multi_report_dir
+    
+    def get_report_key(
+        self,
+        air_quality_data: AirQualityData,
+        report_title: str,
+        report_format: str = "pdf",
+        include_charts: bool = True
+    ) -> str:
+        """
+        Clave de contenido del reporte: mismos datos, título, formato y opciones producen el mismo archivo
+        """
+        return self.report_cache.content_key({
+            "format": report_format,
+            "include_charts": include_charts,
+            "chart_backend": CHART_BACKEND if report_format == "pdf" and include_charts else None,
+            "air_quality_data": air_quality_data.model_dump(),
+            "report_title": report_title
+        })
+    
+    async def get_or_generate_report(
+        self,
+        air_quality_data: AirQualityData,
+        report_title: str,
+        report_format: str = "pdf",
+        include_charts: bool = True
+    ) -> Tuple[str, bytes]:
+        """
+        Devuelve el reporte en el formato pedido junto con su clave de contenido.
+        Los PDF pasan por la caché de contenido y peticiones simultáneas del mismo reporte
+        comparten un único renderizado; CSV, JSON y HTML cuestan menos que leer la caché.
+        """
+        key = self.get_report_key(air_quality_data, report_title, report_format, include_charts)
+        
+        if report_format == "csv":
+            return key, render_air_quality_csv(air_quality_data, report_title)
+        if report_format == "json":
+            return key, render_air_quality_json(air_quality_data, report_title)
+        if report_format == "html":
+            return key, render_air_quality_html(air_quality_data, report_title, include_charts)
+        
+        cached = await self.report_cache.get(key)
+        if cached is not None:
+            print(f"⚡ Reporte servido desde caché ({key[:12]})")
+            return key, cached
+        
+        async def render() -> bytes:
+            content = await self.generate_pdf_report(air_quality_data, report_title, include_charts)
+            await self.report_cache.set(key, content)
+            return content
+        
+        return key, await self.report_flight.do(key, render)
+    
+    async def submit_report_job(
+        self,
+        air_quality_data: AirQualityData,
+        report_title: str,
+        include_charts: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Encola la generación de un reporte y devuelve el trabajo creado
+        """
+        return await self.report_jobs.submit(air_quality_data, report_title, include_charts)
+    
+    async def get_report_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.report_jobs.get(job_id)
+    
+    def get_report_job_artifact(self, job_id: str) -> str:
+        return self.report_jobs.store.artifact_path(job_id)
+    
+    async def _render_report_job(self, air_quality_data: AirQualityData, report_title: str, include_charts: bool = True) -> bytes:
+        _, content = await self.get_or_generate_report(air_quality_data, report_title, "pdf", include_charts)
+        return content
@@ -6,28 +6,27 @@ from api.dto.Auth.AuthLoginRequest import AuthLoginRequest
 from core.interceptors.RunInterceptors import run_interceptors
 from core.interceptors.User.ConfirmedMailInterceptor import validate_confirmed_email
 from api.dto.User.UserDto import AuthRegisterRequest
-from infrastructure.model.User import User
 from shared.utils.JwtUtils import generate_token
 from infrastructure.model.EmailVerificationToken import EmailVerificationToken
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-
-import traceback
-from fastapi import HTTPException
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from infrastructure.repository.EmailVerificationTokenRepository import EmailVerificationTokenRepository
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from infrastructure.services.PasswordHasher import password_hasher
+from core.exceptions.InvalidVerificationTokenException import InvalidVerificationTokenException
 
 class AuthService:
     def __init__(self):
-        self.user_service = UserService
         self.email_service = EmailService
 
-    async def login(self, request_data: dict, db: Session) -> AuthResponse:
+    async def login(self, request_data: dict, db: AsyncSession) -> AuthResponse:
         login_request = AuthLoginRequest(**request_data)
         username = login_request.username
         password = login_request.password
 
-        user = self.user_service.find_by_username(db, username)
+        user_service = UserService(db)
+
+        # Solo las columnas del login y el rol, en una consulta
+        user = await user_service.find_login_projection(username)
         if not user:
             return AuthResponse(
                 username=None,
@@ -36,9 +35,10 @@ class AuthService:
                 status=False
             )
 
-        await run_interceptors([lambda: validate_confirmed_email(user)])
+        await run_interceptors([lambda _: validate_confirmed_email(user)])
 
-        if not pwd_context.verify(password, user.password):
+        valid, new_hash = await password_hasher.verify_and_update(password, user.password)
+        if not valid:
             return AuthResponse(
                 username=None,
                 message="Contraseña incorrecta",
@@ -46,6 +46,10 @@ class AuthService:
                 status=False
             )
 
+        # El hash se guardó con otro costo de bcrypt: se reemplaza ahora que se conoce la contraseña
+        if new_hash:
+            await user_service.update_password(user.id, new_hash)
+
         token = generate_token(user)
 
         return AuthResponse(
@@ -56,65 +60,41 @@ class AuthService:
         )
     
     
-    async def register(self, request_data: dict, db: Session) -> AuthResponse:
+    async def register(self, request_data: dict, db: AsyncSession) -> AuthResponse:
         register_request = AuthRegisterRequest(**request_data)
         user_data = register_request.dict()
 
         user_service = UserService(db)
 
-        try:
-            created_user = await user_service.create(user_data)
-            print(user_data)
+        # Usuario y token se escriben juntos; el user_id se asigna al insertar.
+        # Un username o email repetido sale como ApiResponse y el router responde con su status
+        token_model = EmailVerificationToken.create_for_user(user_id=None)
+        created_user = await user_service.create(user_data, token_model)
 
-            token_model = EmailVerificationToken.create_for_user(created_user.id)
-            db.add(token_model)
-            db.commit()
-            db.refresh(token_model)
-
-            await self.email_service.send_verification_email(
-                to_email=created_user.email,
-                username=created_user.username,
-                token=token_model.token
-            )
-
-            token = generate_token(created_user)
-
-            return AuthResponse(
-                username=created_user.username,
-                message="Usuario registrado exitosamente",
-                jwt=token,
-                status=True
-            )
+        await self.email_service.send_verification_email(
+            user=created_user,
+            token=token_model.token
+        )
 
-        except Exception as e:
-            
-            print("ERROR:", traceback.format_exc())
-            # raise HTTPException(status_code=500, detail=str(e))
-        
-            return AuthResponse(
-                username=user_data.get("username"),
-                message=str(e),
-                jwt="hubo un error en el proceso de registro",
-                status=False
-            )
+        token = generate_token(created_user)
 
-    def verify_email(self, token: str, db: Session) -> dict:
-        record = db.query(EmailVerificationToken).filter_by(token=token).first()
+        return AuthResponse(
+            username=created_user.username,
+            message="Usuario registrado exitosamente",
+            jwt=token,
+            status=True
+        )
 
-        if not record:
-            raise Exception("Token inválido o ya utilizado")
+    async def verify_email(self, token: str, db: AsyncSession) -> dict:
+        result = await EmailVerificationTokenRepository(db).consume(token, datetime.utcnow())
 
-        if record.is_expired():
-            raise Exception("El token ha expirado")
+        if not result:
+            raise InvalidVerificationTokenException("Token inválido o ya utilizado")
 
-        user = db.query(User).filter_by(id=record.user_id).first()
-        if not user:
-            raise Exception("Usuario no encontrado")
+        if result.verified_user_id is None:
+            raise InvalidVerificationTokenException("El token ha expirado")
 
-        user.is_verified = True
-        db.add(user)
-        db.delete(record)
-        db.commit()
+        await db.commit()
 
         return {
             "message": "Correo verificado correctamente. Ya puedes iniciar sesión."
@@ -0,0 +1,80 @@
+#ReportExporter.py
+import io
+import csv
+import json
+from typing import Dict
+
+from api.dto.AirQuality.AirQualityDto import AirQualityData
+from core.helpers.Contaminants import CONTAMINANTS, CHART_COLORS, normalized_contaminants
+from shared.utils.TemplateRegistry import template_registry
+
+# Formatos livianos del reporte: se generan en el proceso principal, sin reportlab ni matplotlib
+
+REPORT_MEDIA_TYPES: Dict[str, str] = {
+    "pdf": "application/pdf",
+    "csv": "text/csv; charset=utf-8",
+    "json": "application/json",
+    "html": "text/html; charset=utf-8"
+}
+
+def render_air_quality_csv(air_quality_data: AirQualityData, report_title: str) -> bytes:
+    """
+    Una fila por contaminante, con los datos generales del sitio repetidos en cada fila
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([
+        "report_title", "lat", "lon", "timestamp", "analysis_radius_km", "data_source",
+        "air_quality_index", "air_quality_category", "contaminant", "density_mol_m2"
+    ])
+
+    for contaminant in CONTAMINANTS:
+        writer.writerow([
+            report_title,
+            air_quality_data.coordinates.get("lat"),
+            air_quality_data.coordinates.get("lon"),
+            air_quality_data.timestamp.isoformat(),
+            air_quality_data.analysis_radius_km,
+            air_quality_data.data_source,
+            air_quality_data.air_quality_index,
+            air_quality_data.air_quality_category,
+            contaminant.name,
+            getattr(air_quality_data, contaminant.field)
+        ])
+
+    return buffer.getvalue().encode("utf-8")
+
+def render_air_quality_json(air_quality_data: AirQualityData, report_title: str) -> bytes:
+    payload = {
+        "report_title": report_title,
+        "air_quality_data": air_quality_data.model_dump(mode="json")
+    }
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+def render_air_quality_html(air_quality_data: AirQualityData, report_title: str, include_charts: bool = True) -> bytes:
+    """
+    Reporte HTML estático; el gráfico es un SVG en línea
+    """
+    contaminants = []
+    for contaminant in CONTAMINANTS:
+        value = getattr(air_quality_data, contaminant.field)
+        contaminants.append({
+            "label": contaminant.label,
+            "value": f"{value:.8f}" if value else "N/A",
+            "description": contaminant.description
+        })
+
+    chart = None
+    if include_charts:
+        chart = [
+            {"label": contaminant.chart_label, "value": value, "color": color}
+            for contaminant, value, color in zip(CONTAMINANTS, normalized_contaminants(air_quality_data), CHART_COLORS)
+        ]
+
+    return template_registry.render(
+        "AirQualityReport.html",
+        report_title=report_title,
+        data=air_quality_data,
+        contaminants=contaminants,
+        chart=chart
+    ).encode("utf-8")
@@ -0,0 +1,427 @@
+#ReportRenderer.py
+import io
+import os
+import importlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterator, List, Optional
+from reportlab.lib.units import inch
+
+from api.dto.AirQuality.AirQualityDto import AirQualityData
+from core.helpers.Contaminants import CONTAMINANTS, CHART_COLORS, normalized_contaminants
+
+if TYPE_CHECKING:
+    from reportlab.platypus import Flowable, Table
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.graphics.shapes import Drawing
+
+# Las funciones de este módulo se ejecutan dentro de los procesos del RenderPool.
+# platypus, reportlab.graphics y matplotlib se importan dentro de cada función: el proceso
+# principal solo necesita referencias a estas funciones y no debe pagar su costo al arrancar.
+
+_styles = None
+
+# "vector" dibuja el gráfico con reportlab.graphics; "matplotlib" lo rasteriza a PNG
+CHART_BACKEND = os.getenv("REPORT_CHART_BACKEND", "vector").lower()
+
+# Reporte multi-sitio: hilos y ventana de gráficos en curso, filas por tabla de resumen
+CHART_THREADS = int(os.getenv("REPORT_CHART_THREADS", 4))
+CHART_WINDOW = int(os.getenv("REPORT_CHART_WINDOW", 8))
+SUMMARY_ROWS_PER_TABLE = 40
+STORY_LOOKAHEAD = 16
+# Escala del gráfico por sitio para que cada sitio quepa en una página
+MULTI_CHART_SCALE = 0.5
+
+def init_render_worker():
+    """
+    Inicializa un proceso de renderizado: importa el stack de reportlab, carga estilos,
+    fuentes y (si se usa) la caché de fuentes de matplotlib una sola vez por proceso
+    """
+    # Importaciones solo por su efecto: dejan los módulos cargados en el proceso
+    for module in ("reportlab.platypus", "reportlab.graphics.charts.barcharts"):
+        importlib.import_module(module)
+    from reportlab.pdfbase import pdfmetrics
+
+    _get_styles()
+    for font_name in ("Helvetica", "Helvetica-Bold"):
+        pdfmetrics.getFont(font_name)
+
+    if CHART_BACKEND == "matplotlib":
+        for module in ("matplotlib.figure", "matplotlib.backends.backend_agg"):
+            importlib.import_module(module)
+        from matplotlib import font_manager
+        font_manager.findfont("DejaVu Sans")
+
+def warm_up() -> bool:
+    return True
+
+def _get_styles():
+    global _styles
+    if _styles is None:
+        from reportlab.lib.styles import getSampleStyleSheet
+        _styles = getSampleStyleSheet()
+    return _styles
+
+def render_air_quality_pdf(
+    air_quality_data: AirQualityData,
+    report_title: str = "Reporte de Calidad del Aire",
+    include_charts: bool = True,
+    chart_backend: Optional[str] = None
+) -> bytes:
+    """
+    Genera un reporte PDF con los datos de calidad del aire.
+    Con include_charts=False no se construye el gráfico.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    buffer = io.BytesIO()
+
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    story = []
+    styles = _get_styles()
+
+    story.append(Paragraph(report_title, _title_style(styles)))
+    story.append(Spacer(1, 20))
+    chart = _create_chart_flowable(air_quality_data, chart_backend or CHART_BACKEND) if include_charts else None
+    story.extend(_location_flowables(air_quality_data, styles, chart))
+
+    doc.build(story)
+
+    pdf_content = buffer.getvalue()
+    buffer.close()
+
+    return pdf_content
+
+def render_multi_location_pdf(
+    locations: List[AirQualityData],
+    output_path: str,
+    report_title: str = "Reporte Consolidado de Calidad del Aire",
+    include_charts: bool = True,
+    chart_backend: Optional[str] = None
+) -> int:
+    """
+    Genera un reporte PDF consolidado de varios sitios directamente en `output_path`.
+    Los flowables se producen a medida que platypus los consume y los gráficos se
+    renderizan en paralelo con una ventana acotada, así la memoria no crece con el
+    número de sitios. Retorna el tamaño del archivo en bytes.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate
+
+    styles = _get_styles()
+    backend = chart_backend or CHART_BACKEND
+
+    executor = None
+    if include_charts:
+        executor = ThreadPoolExecutor(max_workers=CHART_THREADS, thread_name_prefix="report-chart")
+
+    try:
+        doc = SimpleDocTemplate(output_path, pagesize=A4, title=report_title)
+        doc.build(_StreamedStory(_multi_location_story(locations, report_title, styles, backend, executor)))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return os.path.getsize(output_path)
+
+class _StreamedStory(list):
+    """
+    Story que se rellena bajo demanda desde un generador. Platypus solo mira el inicio
+    de la lista (y unos pocos elementos más por keepWithNext), así que basta con
+    mantener un búfer pequeño de flowables pendientes.
+    """
+    def __init__(self, flowables: Iterator["Flowable"], lookahead: int = STORY_LOOKAHEAD):
+        super().__init__()
+        self._source = flowables
+        self._lookahead = lookahead
+
+    def _fill(self):
+        while self._source is not None and list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+def _multi_location_story(
+    locations: List[AirQualityData],
+    report_title: str,
+    styles,
+    chart_backend: str,
+    executor: Optional[ThreadPoolExecutor]
+) -> Iterator["Flowable"]:
+    from reportlab.platypus import Paragraph, Spacer, PageBreak
+
+    yield Paragraph(report_title, _title_style(styles))
+    yield Paragraph(
+        f"Sitios monitoreados: {len(locations)} &nbsp;&nbsp; Generado: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}",
+        styles['Normal']
+    )
+    yield Spacer(1, 20)
+
+    yield Paragraph("Resumen por Sitio", styles['Heading2'])
+    yield Spacer(1, 12)
+    for start in range(0, len(locations), SUMMARY_ROWS_PER_TABLE):
+        yield _summary_table(locations[start:start + SUMMARY_ROWS_PER_TABLE], start)
+
+    # Ventana de gráficos en curso: se encola el siguiente a medida que se consume uno
+    pending = deque()
+    next_index = 0
+
+    def schedule():
+        nonlocal next_index
+        while executor is not None and next_index < len(locations) and len(pending) < CHART_WINDOW:
+            pending.append(executor.submit(_render_chart_payload, locations[next_index], chart_backend))
+            next_index += 1
+
+    for index, data in enumerate(locations, start=1):
+        schedule()
+        chart = _chart_payload_to_flowable(pending.popleft().result(), MULTI_CHART_SCALE) if executor is not None else None
+
+        yield PageBreak()
+        yield Paragraph(
+            f"Sitio {index}: Lat {data.coordinates['lat']:.6f}, Lon {data.coordinates['lon']:.6f}",
+            styles['Heading2']
+        )
+        yield from _location_flowables(data, styles, chart)
+
+def _summary_table(locations: List[AirQualityData], offset: int) -> "Table":
+    from reportlab.platypus import Table, TableStyle
+    from reportlab.lib import colors
+
+    rows = [['#', 'Latitud', 'Longitud', 'AQI', 'Categoría', 'Fuente']]
+    for index, data in enumerate(locations, start=offset + 1):
+        rows.append([
+            str(index),
+            f"{data.coordinates['lat']:.4f}",
+            f"{data.coordinates['lon']:.4f}",
+            str(data.air_quality_index) if data.air_quality_index is not None else "N/A",
+            data.air_quality_category or "N/A",
+            data.data_source
+        ])
+
+    table = Table(rows, colWidths=[0.4*inch, 0.9*inch, 0.9*inch, 0.5*inch, 1.9*inch, 1.4*inch], repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#E8F4FD')]),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black)
+    ]))
+    return table
+
+def _title_style(styles) -> "ParagraphStyle":
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib import colors
+
+    return ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=30,
+        textColor=colors.HexColor('#2E86AB'),
+        alignment=1
+    )
+
+def _location_flowables(air_quality_data: AirQualityData, styles, chart: Optional["Flowable"]) -> List["Flowable"]:
+    """
+    Tablas, recomendaciones y gráfico de un sitio
+    """
+    from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib import colors
+
+    story = []
+
+    info_data = [
+        ['Coordenadas:', f"Lat: {air_quality_data.coordinates['lat']:.6f}, Lon: {air_quality_data.coordinates['lon']:.6f}"],
+        ['Fecha y Hora:', air_quality_data.timestamp.strftime('%d/%m/%Y %H:%M:%S')],
+        ['Radio de Análisis:', f"{air_quality_data.analysis_radius_km} km"],
+        ['Fuente de Datos:', air_quality_data.data_source],
+        ['Índice de Calidad del Aire:', f"{air_quality_data.air_quality_index} - {air_quality_data.air_quality_category}"]
+    ]
+
+    info_table = Table(info_data, colWidths=[2*inch, 4*inch])
+    info_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E8F4FD')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+
+    story.append(info_table)
+    story.append(Spacer(1, 20))
+
+    story.append(Paragraph("Concentración de Contaminantes", styles['Heading2']))
+    story.append(Spacer(1, 12))
+
+    contaminants_data = [['Contaminante', 'Concentración (mol/m²)', 'Descripción']]
+    for contaminant in CONTAMINANTS:
+        value = getattr(air_quality_data, contaminant.field)
+        contaminants_data.append([contaminant.label, f"{value:.8f}" if value else "N/A", contaminant.description])
+
+    contaminants_table = Table(contaminants_data, colWidths=[2*inch, 1.5*inch, 2.5*inch])
+    contaminants_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+
+    story.append(contaminants_table)
+    story.append(Spacer(1, 20))
+
+    story.append(Paragraph("Recomendaciones de Salud", styles['Heading2']))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph(air_quality_data.health_recommendations, styles['Normal']))
+    story.append(Spacer(1, 20))
+
+    if chart is not None:
+        story.append(chart)
+
+    return story
+
+def _create_chart_flowable(data: AirQualityData, chart_backend: str) -> Optional["Flowable"]:
+    return _chart_payload_to_flowable(_render_chart_payload(data, chart_backend))
+
+def _render_chart_payload(data: AirQualityData, chart_backend: str):
+    """
+    Parte costosa del gráfico, segura para ejecutarse en hilos: un Drawing vectorial
+    o el PNG de matplotlib
+    """
+    if chart_backend == "matplotlib":
+        return create_air_quality_chart(data)
+    return create_air_quality_drawing(data)
+
+def _chart_payload_to_flowable(payload, scale: float = 1.0) -> Optional["Flowable"]:
+    if payload is None:
+        return None
+    if isinstance(payload, io.BytesIO):
+        from reportlab.platypus import Image
+        return Image(payload, width=6*inch*scale, height=4*inch*scale)
+    if scale != 1.0:
+        payload.scale(scale, scale)
+        payload.width *= scale
+        payload.height *= scale
+    return payload
+
+def create_air_quality_drawing(data: AirQualityData) -> Optional["Drawing"]:
+    """
+    Crea el gráfico de barras de contaminantes como gráficos vectoriales nativos del PDF
+    """
+    from reportlab.lib import colors
+    from reportlab.graphics.shapes import Drawing, Group, String
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+
+    try:
+        # Las fuentes base de ReportLab no incluyen subíndices Unicode
+        contaminants = [contaminant.name for contaminant in CONTAMINANTS]
+        normalized_values = normalized_contaminants(data)
+
+        drawing = Drawing(6*inch, 4*inch)
+        drawing.add(String(
+            3*inch, 3.75*inch,
+            'Concentración Relativa de Contaminantes (%)',
+            fontName='Helvetica-Bold', fontSize=12, textAnchor='middle'
+        ))
+
+        chart = VerticalBarChart()
+        chart.x = 0.7*inch
+        chart.y = 0.7*inch
+        chart.width = 5*inch
+        chart.height = 2.6*inch
+        chart.data = [normalized_values]
+        chart.barSpacing = 0
+        chart.groupSpacing = 12
+        chart.valueAxis.valueMin = 0
+        chart.valueAxis.valueMax = 110
+        chart.valueAxis.valueStep = 20
+        chart.valueAxis.labels.fontName = 'Helvetica'
+        chart.valueAxis.labels.fontSize = 8
+        chart.categoryAxis.categoryNames = contaminants
+        chart.categoryAxis.labels.fontName = 'Helvetica'
+        chart.categoryAxis.labels.fontSize = 9
+        chart.barLabelFormat = '%.1f%%'
+        chart.barLabels.nudge = 7
+        chart.barLabels.fontName = 'Helvetica'
+        chart.barLabels.fontSize = 8
+        chart.bars.strokeColor = None
+        for i, color in enumerate(CHART_COLORS):
+            chart.bars[(0, i)].fillColor = colors.HexColor(color)
+        drawing.add(chart)
+
+        y_label = Group(String(
+            0, 0,
+            'Concentración Relativa (%)',
+            fontName='Helvetica', fontSize=9, textAnchor='middle'
+        ))
+        y_label.translate(0.25*inch, 2*inch)
+        y_label.rotate(90)
+        drawing.add(y_label)
+        drawing.add(String(
+            3.2*inch, 0.2*inch,
+            'Contaminantes',
+            fontName='Helvetica', fontSize=9, textAnchor='middle'
+        ))
+
+        return drawing
+
+    except Exception as e:
+        print(f"Error creando gráfico: {e}")
+        return None
+
+def create_air_quality_chart(data: AirQualityData) -> Optional[io.BytesIO]:
+    """
+    Crea un gráfico de barras con los datos de contaminantes
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    try:
+        contaminants = [contaminant.chart_label for contaminant in CONTAMINANTS]
+        normalized_values = normalized_contaminants(data)
+
+        # API orientada a objetos: sin estado global de pyplot, se puede usar desde varios hilos
+        figure = Figure(figsize=(10, 6))
+        ax = figure.subplots()
+        bars = ax.bar(contaminants, normalized_values, color=CHART_COLORS)
+
+        ax.set_title('Concentración Relativa de Contaminantes (%)', fontsize=14, fontweight='bold')
+        ax.set_ylabel('Concentración Relativa (%)', fontsize=12)
+        ax.set_xlabel('Contaminantes', fontsize=12)
+
+        for bar, value in zip(bars, normalized_values):
+            ax.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 1,
+                    f'{value:.1f}%', ha='center', va='bottom', fontsize=10)
+
+        ax.tick_params(axis='x', labelrotation=45)
+        figure.tight_layout()
+
+        chart_buffer = io.BytesIO()
+        FigureCanvasAgg(figure)
+        figure.savefig(chart_buffer, format='png', dpi=300, bbox_inches='tight')
+        chart_buffer.seek(0)
+
+        return chart_buffer
+
+    except Exception as e:
+        print(f"Error creando gráfico: {e}")
+        return None
@@ -0,0 +1,95 @@
+#TokenAuthService.py
+import os
+import time
+from typing import Any, Dict
+from dotenv import load_dotenv
+
+from api.dto.Auth.AuthenticatedUser import AuthenticatedUser
+from core.helpers.TtlLruCache import TtlLruCache
+from core.exceptions.InvalidTokenException import InvalidTokenException
+from infrastructure.config.Db import create_session
+from infrastructure.repository.UserRepository import UserRepository
+from shared.utils.JwtUtils import verify_token
+
+load_dotenv()
+
+class TokenAuthService:
+    """
+    Autenticación por JWT para las rutas protegidas.
+    Un token ya verificado se resuelve desde memoria hasta su `exp`, sin volver a validar
+    la firma; opcionalmente se consulta el usuario (habilitado, rol) con una caché de TTL corto.
+    """
+    def __init__(self):
+        # Tamaño en entradas: cada token cuenta 1
+        self.claims_cache: TtlLruCache[AuthenticatedUser] = TtlLruCache(
+            ttl_seconds=float(os.getenv("JWT_CLAIMS_CACHE_TTL", 900)),
+            max_bytes=int(os.getenv("JWT_CLAIMS_CACHE_SIZE", 10000))
+        )
+
+        # Con AUTH_LOAD_USER un usuario deshabilitado o con otro rol se refleja en a lo sumo AUTH_USER_CACHE_TTL
+        self.load_user = os.getenv("AUTH_LOAD_USER", "false").lower() == "true"
+        self.user_cache: TtlLruCache[AuthenticatedUser] = TtlLruCache(
+            ttl_seconds=float(os.getenv("AUTH_USER_CACHE_TTL", 30)),
+            max_bytes=int(os.getenv("AUTH_USER_CACHE_SIZE", 10000))
+        )
+
+    async def authenticate(self, token: str) -> AuthenticatedUser:
+        user = self.verify(token)
+        if self.load_user:
+            user = await self._load_user(user.id)
+        return user
+
+    def verify(self, token: str) -> AuthenticatedUser:
+        user = self.claims_cache.get(token)
+        if user is not None:
+            return user
+
+        try:
+            claims = verify_token(token)
+        except ValueError as e:
+            raise InvalidTokenException(str(e))
+
+        user = AuthenticatedUser(
+            id=int(claims["userId"]),
+            username=claims["sub"],
+            email=claims["email"],
+            full_name=claims["fullName"],
+            role=claims["authorithies"],
+            is_verified=claims["isVerified"]
+        )
+
+        # La entrada nunca sobrevive al vencimiento del token
+        remaining = claims["exp"] - time.time()
+        if remaining > 0:
+            self.claims_cache.set(token, user, ttl_seconds=min(remaining, self.claims_cache.ttl_seconds))
+        return user
+
+    async def _load_user(self, user_id: int) -> AuthenticatedUser:
+        user = self.user_cache.get(user_id)
+        if user is not None:
+            return user
+
+        # La sesión solo se abre cuando falla la caché
+        async with create_session() as db:
+            row = await UserRepository(db).find_auth_projection(user_id)
+
+        if row is None or not row.is_enabled:
+            raise InvalidTokenException("El usuario no existe o está deshabilitado")
+
+        user = AuthenticatedUser(
+            id=row.id,
+            username=row.username,
+            email=row.email,
+            full_name=f"{row.first_name} {row.last_name}",
+            role=row.role.value if row.role else "USER",
+            is_verified=bool(row.is_verified)
+        )
+        self.user_cache.set(user_id, user)
+        return user
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "claims": self.claims_cache.get_stats(),
+            "loadUser": self.load_user,
+            "users": self.user_cache.get_stats() if self.load_user else None
+        }
@@ -1,87 +1,79 @@
 from infrastructure.repository.UserRepository import UserRepository
-from core.interceptors.RunInterceptors import run_interceptors
-from core.interceptors.User.UniqueUsernameInterceptor import validate_unique_username
-from core.interceptors.User.UniqueEmailInterceptor import validate_unique_email
-from core.interceptors.User.PasswordStrengthInterceptor import validate_password_strength
-from core.helpers.Pager import create_pager
+from core.helpers.Pager import Pager
 from core.helpers.Params import create_params
-from sqlalchemy.orm import Session
+import re
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from infrastructure.model.User import User
+from infrastructure.model.EmailVerificationToken import EmailVerificationToken
+from core.exceptions.EmailAlreadyExistsException import EmailAlreadyExistsException
+from core.exceptions.UsernameAlreadyExistsException import UsernameAlreadyExistsException
+from infrastructure.services.PasswordHasher import password_hasher
 
 
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.repo = UserRepository(db)
         self.db = db
 
-    def find_by_email(self, email: str) -> User | None:
-        return self.repo.find_by_email(email)
-
-    def find_by_username(self, username: str) -> User | None:
-        return self.repo.find_by_username(username)
-
-    def find_by_id(self, user_id: int) -> User | None:
-        return self.repo.find_by_id(user_id)
-
-    async def create(self, user_data: dict) -> User:
-        await run_interceptors([
-        self._check_username_unique,
-        self._check_email_unique,
-        # self._check_password_strength,
-    ], user_data)
-
+    async def find_by_email(self, email: str) -> User | None:
+        return await self.repo.find_by_email(email)
+
+    async def find_by_username(self, username: str) -> User | None:
+        return await self.repo.find_by_username(username)
+
+    async def find_by_id(self, user_id: int) -> User | None:
+        return await self.repo.find_by_id(user_id)
+
+    async def find_all(
+        self,
+        page_index: int = 1,
+        page_size: int = 10,
+        search: str = '',
+        cursor: str | None = None,
+        estimate_total: bool = False
+    ) -> Pager[User]:
+        params = create_params(
+            page_index=page_index,
+            page_size=page_size,
+            search=search,
+            cursor=cursor,
+            estimate_total=estimate_total
+        )
+        return await self.repo.find_page(params)
+
+    async def find_login_projection(self, username: str) -> Row | None:
+        return await self.repo.find_login_projection(username)
+
+    async def update_password(self, user_id: int, password_hash: str) -> None:
+        await self.repo.update_password(user_id, password_hash)
+
+    async def create(self, user_data: dict, verification_token: EmailVerificationToken) -> User:
+        """
+        Registra el usuario y su token de verificación en una transacción.
+        La unicidad la garantizan las restricciones de la tabla: no se consulta antes de insertar.
+        """
         user = User(**user_data)
-        user.hash_password()
-
-        return self.repo.create(user)
-
-# Métodos privados
-    async def _check_username_unique(self, data: dict):
-        await validate_unique_username(data["username"], self.db)
-
-    async def _check_email_unique(self, data: dict):
-        await validate_unique_email(data["email"], self.db)
-
-    # def _check_password_strength(self, data: dict):
-    #     return validate_password_strength(data["password"])
-    #     async def update(self, user_id: int, update_data: dict) -> User | None:
-    #         update_data["exclude_id"] = user_id
-
-    #         await run_interceptors([
-    #             lambda data: validate_unique_username(data, self.db),
-    #             lambda data: validate_unique_email(data, self.db),
-    #             lambda data: validate_password_strength(data),
-    #         ], update_data)
-
-    #         if "password" in update_data:
-    #             temp_user = User(password=update_data["password"])
-    #             temp_user.hash_password()
-    #             update_data["password"] = temp_user.password
-
-    #         return self.repo.update(user_id, update_data)
-
-    #     def delete(self, user_id: int) -> bool:
-    #         return self.repo.delete(user_id)
-
-    #     def find_all(self, page_index=1, page_size=10, search='') -> dict:
-    #         params = create_params(page_index=page_index, page_size=page_size, search=search)
-
-    #         query = self.db.query(User)
-    #         if params["search"]:
-    #             search_filter = f"%{params['search']}%"
-    #             query = query.filter(
-    #                 (User.username.ilike(search_filter)) |
-    #                 (User.first_name.ilike(search_filter)) |
-    #                 (User.last_name.ilike(search_filter))
-    #             )
-
-    #         total = query.count()
-    #         users = query.offset((params["page_index"] - 1) * params["page_size"]).limit(params["page_size"]).all()
-
-    #         return create_pager(
-    #             registers=users,
-    #             total=total,
-    #             page_index=params["page_index"],
-    #             page_size=params["page_size"],
-    #             search=params["search"]
-    #         )
\ No newline at end of file
+        user.password = await password_hasher.hash(user.password)
+
+        try:
+            return await self.repo.create_with_verification_token(user, verification_token)
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise self._unique_violation(e) from e
+
+    # Métodos privados
+    @staticmethod
+    def _unique_violation(error: IntegrityError) -> Exception:
+        # psycopg2 incluye 'DETAIL:  Key (email)=(juan@gmail.com) already exists.' en el mensaje;
+        # asyncpg lo deja en el error original (`detail`) y el mensaje solo nombra la restricción
+        cause = error.orig.__cause__
+        text = " ".join(str(part) for part in (error.orig, getattr(cause, "detail", None)) if part)
+        match = re.search(r"Key \((\w+)\)=", text) or re.search(r'"users_(\w+)_key"', text)
+        column = match.group(1) if match else None
+        if column == "username":
+            return UsernameAlreadyExistsException()
+        if column == "email":
+            return EmailAlreadyExistsException()
+        return error
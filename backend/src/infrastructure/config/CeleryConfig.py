@@ -0,0 +1,21 @@
+#CeleryConfig.py
+import os
+from celery import Celery
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Worker: celery -A infrastructure.config.CeleryConfig worker --loglevel=info
+celery_app = Celery(
+    "ecoshield360",
+    broker=os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"),
+    include=["infrastructure.services.ReportJobTasks"]
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1
+)
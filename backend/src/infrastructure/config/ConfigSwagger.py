@@ -1,7 +1,20 @@
 # infrastructure/config/ConfigSwagger.py
 import os
+import re
+import json
+import hashlib
+import inspect
+import typing
 import yaml
+from fastapi import routing
 from fastapi.openapi.utils import get_openapi
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+MEDIA_DOCS_DIR = os.path.join(os.path.dirname(__file__), "../../../media/docs")
+
+# repr de funciones y objetos: la dirección de memoria cambia en cada proceso
+_MEMORY_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
 
 def setup_swagger(app):
     def custom_openapi():
@@ -19,19 +32,19 @@ def setup_swagger(app):
         if "components" not in openapi_schema:
             openapi_schema["components"] = {}
             
-        openapi_schema["components"]["securitySchemes"] = {
-            "bearerAuth": {
-                "type": "http",
-                "scheme": "bearer",
-                "bearerFormat": "JWT"
-            }
+        # Se agrega sin reemplazar los esquemas de FastAPI: las rutas protegidas con
+        # get_current_user hacen referencia a HTTPBearer
+        openapi_schema["components"].setdefault("securitySchemes", {})["bearerAuth"] = {
+            "type": "http",
+            "scheme": "bearer",
+            "bearerFormat": "JWT"
         }
         
         openapi_schema["security"] = [{"bearerAuth": []}]
 
         openapi_schema["servers"] = [
             {
-                "url": "http://localhost:3000",
+                "url": os.getenv("OPENAPI_SERVER_URL", "http://localhost:3000"),
                 "description": "Local Server"
             }
         ]
@@ -41,15 +54,92 @@ def setup_swagger(app):
 
     app.openapi = custom_openapi
 
-def generate_swagger_yaml(app):
+def routes_fingerprint(app) -> str:
+    """
+    Hash de las rutas (método, path, metadatos, firma del endpoint y código de los modelos
+    que usa). Si no cambia, el documento OpenAPI exportado sigue vigente.
+    """
+    models = {}
+    routes = []
+    for route in _iter_api_routes(app):
+        routes.append([
+            route.path,
+            sorted(route.methods),
+            route.name,
+            route.summary,
+            route.description,
+            route.status_code,
+            # response_class puede venir envuelto en DefaultPlaceholder
+            getattr(getattr(route.response_class, "value", route.response_class), "__name__", None),
+            _stable_repr(route.responses),
+            _stable_repr(inspect.signature(route.endpoint)),
+            # Dependencias del router (p. ej. get_current_user): cambian la seguridad del documento
+            [_stable_repr(dependency) for dependency in route.dependencies]
+        ])
+        for annotation in list(typing.get_type_hints(route.endpoint).values()) + [route.response_model]:
+            _collect_models(annotation, models)
+
+    payload = {
+        "app": [app.title, app.version],
+        "routes": routes,
+        "models": {name: _model_source(model) for name, model in sorted(models.items())}
+    }
+    return hashlib.sha256(json.dumps(payload, default=str).encode("utf-8")).hexdigest()
+
+def _stable_repr(value) -> str:
+    return _MEMORY_ADDRESS.sub("", str(value))
+
+def _iter_api_routes(app):
+    # Las versiones recientes de FastAPI anidan los routers incluidos; las anteriores los aplanan
+    iter_route_contexts = getattr(routing, "iter_route_contexts", None)
+    for route in (iter_route_contexts(app.routes) if iter_route_contexts else app.routes):
+        if isinstance(getattr(route, "original_route", route), APIRoute):
+            yield route
+
+def _collect_models(annotation, models: dict) -> None:
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        name = f"{annotation.__module__}.{annotation.__qualname__}"
+        if name in models:
+            return
+        models[name] = annotation
+        for field_annotation in typing.get_type_hints(annotation).values():
+            _collect_models(field_annotation, models)
+        return
+
+    for argument in typing.get_args(annotation):
+        _collect_models(argument, models)
+
+def _model_source(model) -> str:
+    try:
+        return inspect.getsource(model)
+    except (OSError, TypeError):
+        return repr(typing.get_type_hints(model))
+
+def generate_swagger_yaml(app, force: bool = False) -> bool:
+    """
+    Exporta swagger.yml solo si cambió el hash de las rutas; retorna True si lo escribió
+    """
+    file_path = os.path.join(MEDIA_DOCS_DIR, "swagger.yml")
+    hash_path = f"{file_path}.sha256"
+    fingerprint = routes_fingerprint(app)
+
+    if not force and os.path.exists(file_path):
+        try:
+            with open(hash_path, encoding="utf-8") as f:
+                if f.read().strip() == fingerprint:
+                    print(f"📄 Swagger sin cambios, se reutiliza: {file_path}")
+                    return False
+        except FileNotFoundError:
+            pass
+
     if not app.openapi_schema:
         app.openapi()
-    
-    media_dir = os.path.join(os.path.dirname(__file__), "../../../media/docs")
-    os.makedirs(media_dir, exist_ok=True)
-    file_path = os.path.join(media_dir, "swagger.yml")
 
+    os.makedirs(MEDIA_DOCS_DIR, exist_ok=True)
     with open(file_path, "w", encoding="utf-8") as f:
         yaml.dump(app.openapi_schema, f, allow_unicode=True, sort_keys=False)
+    with open(hash_path, "w", encoding="utf-8") as f:
+        f.write(fingerprint)
 
-    print(f"Swagger exportado a: {file_path}")
\ No newline at end of file
+    print(f"Swagger exportado a: {file_path}")
+    return True
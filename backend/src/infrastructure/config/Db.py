@@ -2,27 +2,71 @@ import os
 import urllib.parse
 from sqlalchemy import create_engine, MetaData, text
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from typing import Any, AsyncIterator, Dict, Optional
 from dotenv import load_dotenv
+from infrastructure.config.DbPool import (
+    CONNECT_TIMEOUT, InstrumentedAsyncPool, engine_options, install_slow_query_logging, pool_stats
+)
 
 load_dotenv()
 
 # Datos para conexión
 user = os.getenv("DB_USER")
-password = urllib.parse.quote_plus(os.getenv("DB_PASSWORD")) 
+password = urllib.parse.quote_plus(os.getenv("DB_PASSWORD", ""))
 host = os.getenv("DB_HOST")
 port = os.getenv("DB_PORT")
 dbname = os.getenv("DB_NAME")
-DATABASE_URL = f"postgresql://{user}:{password}@{host}:{port}/{dbname}"
+DATABASE_URL = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{dbname}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{dbname}"
 
-# Engine y session factory global
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Los engines se crean al primer uso: la app arranca sin configuración de Postgres
+# (despliegue solo de calidad del aire) y ninguno abre conexiones hasta la primera consulta
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
 
 
+def get_engine() -> Engine:
+    """
+    Engine síncrono: solo para los comandos de administración (init-db)
+    """
+    global _engine
+    if _engine is None:
+        _engine = create_engine(DATABASE_URL, **engine_options())
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Engine asíncrono para las peticiones
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            poolclass=InstrumentedAsyncPool,
+            connect_args={"timeout": CONNECT_TIMEOUT},
+            **engine_options()
+        )
+        install_slow_query_logging(_async_engine.sync_engine)
+    return _async_engine
+
+
+def create_session() -> AsyncSession:
+    """
+    Nueva AsyncSession sobre el engine asíncrono
+    """
+    global _session_factory
+    if _session_factory is None:
+        # expire_on_commit=False: los objetos siguen siendo legibles después del commit sin otra consulta
+        _session_factory = async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _session_factory()
+
 def create_database_if_not_exists():
     try:
-        system_url = f"postgresql://{user}:{password}@{host}:{port}/postgres"
+        system_url = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/postgres"
         system_engine = create_engine(system_url, isolation_level='AUTOCOMMIT')
 
         with system_engine.connect() as conn:
@@ -44,6 +88,7 @@ def create_database_if_not_exists():
 
 def connect_to_db():
     try:
+        engine = get_engine()
         conn = engine.connect()
         meta = MetaData()
         print("✅ Conexión a la base de datos exitosa.")
@@ -53,9 +98,31 @@ def connect_to_db():
         return None, None, None
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def dispose_engine():
+    """
+    Cierra las conexiones de los pools que se llegaron a crear; se llama al apagar el servidor
+    """
+    global _engine, _async_engine, _session_factory
+    if _async_engine is None and _engine is None:
+        return
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+    _engine = _async_engine = _session_factory = None
+    print("🗄️ Pool de la base de datos cerrado")
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    if _async_engine is None:
+        return {"initialized": False}
+    return {"initialized": True, **pool_stats(_async_engine.sync_engine)}
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependencia de FastAPI: una AsyncSession por petición
+    """
+    async with create_session() as db:
         yield db
-    finally:
-        db.close()
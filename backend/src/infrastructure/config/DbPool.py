@@ -0,0 +1,126 @@
+#DbPool.py
+import os
+import time
+from typing import Any, Dict
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+# Configuración del pool; por worker de uvicorn, así que el total en Postgres es workers * (size + overflow)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", "true")
+CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", 10))
+ECHO = _env_bool("DB_ECHO", "false")
+# Umbral para registrar consultas lentas; 0 lo desactiva
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 0))
+
+
+def engine_options() -> Dict[str, Any]:
+    """
+    Argumentos comunes para create_engine / create_async_engine
+    """
+    return {
+        "echo": ECHO,
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING
+    }
+
+
+class PoolMetrics:
+    """
+    Contadores de las esperas por una conexión del pool
+    """
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.slow_queries = 0
+        self.slow_query_threshold_ms = 0.0
+
+    def record_wait(self, seconds: float):
+        self.checkouts += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+
+# Compartidas entre instancias: engine.dispose() recrea el pool con la misma clase
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Pool del engine asíncrono que mide cuánto espera cada petición por una conexión
+    (incluye abrir la conexión y el pre-ping)
+    """
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start)
+
+
+def install_slow_query_logging(engine: Engine, threshold_ms: float = SLOW_QUERY_MS):
+    """
+    Registra las sentencias que tardan más que el umbral; no hace nada si el umbral es 0
+    """
+    if threshold_ms <= 0:
+        return
+    pool_metrics.slow_query_threshold_ms = threshold_ms
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        if elapsed_ms >= threshold_ms:
+            pool_metrics.slow_queries += 1
+            print(f"🐢 Consulta lenta ({elapsed_ms:.0f} ms): {' '.join(statement.split())[:500]}")
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # Una sentencia fallida no llega a after_cursor_execute
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        if starts:
+            starts.pop()
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    """
+    Estado actual del pool y esperas acumuladas desde el arranque del worker
+    """
+    pool = engine.pool
+    checkouts = pool_metrics.checkouts
+    return {
+        "size": pool.size(),
+        "maxOverflow": MAX_OVERFLOW,
+        "checkedIn": pool.checkedin(),
+        "checkedOut": pool.checkedout(),
+        # QueuePool cuenta el overflow desde -pool_size; solo interesan las conexiones extra abiertas
+        "overflow": max(0, pool.overflow()),
+        "checkouts": checkouts,
+        "timeouts": pool_metrics.timeouts,
+        "waitAvgMs": round(pool_metrics.wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+        "waitMaxMs": round(pool_metrics.wait_max * 1000, 3),
+        "slowQueries": pool_metrics.slow_queries,
+        "slowQueryThresholdMs": pool_metrics.slow_query_threshold_ms
+    }
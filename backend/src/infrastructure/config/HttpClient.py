@@ -0,0 +1,81 @@
+#HttpClient.py
+import os
+import httpx
+from dotenv import load_dotenv
+from typing import List, Optional
+
+load_dotenv()
+
+class HttpClient:
+    """
+    Cliente HTTP asíncrono con pool de conexiones keep-alive compartido
+    """
+    def __init__(self, hosts: Optional[List[str]] = None):
+        self.max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+        self.max_connections_per_host = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", 10))
+        self.max_keepalive_connections = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20))
+        self.keepalive_expiry = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+        self.connect_timeout = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+        self.read_timeout = float(os.getenv("HTTP_READ_TIMEOUT", 30))
+
+        self.hosts = hosts or []
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self.open()
+        return self._client
+
+    def open(self):
+        """
+        Crea el pool de conexiones si aún no existe
+        """
+        if self._client is not None and not self._client.is_closed:
+            return
+
+        timeout = httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.read_timeout,
+            pool=self.connect_timeout
+        )
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+        host_limits = httpx.Limits(
+            max_connections=self.max_connections_per_host,
+            max_keepalive_connections=min(self.max_keepalive_connections, self.max_connections_per_host),
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+        # Cada host conocido tiene su propio transporte para acotar sus conexiones
+        mounts = {
+            f"all://{httpx.URL(host).host}": httpx.AsyncHTTPTransport(limits=host_limits)
+            for host in self.hosts
+        }
+
+        self._client = httpx.AsyncClient(
+            limits=limits,
+            timeout=timeout,
+            mounts=mounts,
+            follow_redirects=True
+        )
+        print(f"🔌 Pool HTTP abierto (max: {self.max_connections}, por host: {self.max_connections_per_host})")
+
+    async def close(self):
+        """
+        Cierra el pool drenando las conexiones abiertas
+        """
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            print("🔌 Pool HTTP cerrado")
+        self._client = None
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.client.get(url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.client.post(url, **kwargs)
@@ -1,7 +1,8 @@
 #MailConfig.py
 import os
+from email.message import EmailMessage
+from email.utils import formataddr
 from dotenv import load_dotenv
-from emails import Message
 
 load_dotenv()
 
@@ -10,29 +11,21 @@ class MailConfig:
     MAIL_PORT = int(os.getenv("MAIL_PORT", 587))
     MAIL_USERNAME = os.getenv("MAIL_USERNAME", "stellarcolsupp@gmail.com")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD", "esik dmtx ooqy swgu")
-    MAIL_FROM = os.getenv("MAIL_USERNAME")  
+    MAIL_FROM = os.getenv("MAIL_FROM", MAIL_USERNAME)
     MAIL_FROM_NAME = "Ecoshield360"  
-    MAIL_TLS = True  
-    MAIL_SSL = False  
+    MAIL_TLS = os.getenv("MAIL_TLS", "true").lower() == "true"
+    MAIL_SSL = os.getenv("MAIL_SSL", "false").lower() == "true"
     MAIL_DEBUG = False
 
     @staticmethod
-    def get_message() -> Message:
-        """Crea un objeto Message con la identidad de Ecoshield360"""
-        return Message(
-            mail_from=(MailConfig.MAIL_FROM_NAME, MailConfig.MAIL_FROM),
-            smtp={
-                "host": MailConfig.MAIL_HOST,
-                "port": MailConfig.MAIL_PORT,
-                "user": MailConfig.MAIL_USERNAME,
-                "password": MailConfig.MAIL_PASSWORD,
-                "tls": MailConfig.MAIL_TLS,
-                "ssl": MailConfig.MAIL_SSL,
-                "timeout": 30
-            },
-            headers={
-                "X-Mailer": "Ecoshield360 Mail Service",
-                "X-Priority": "1",
-                "Importance": "high"
-            }
-        )
\ No newline at end of file
+    def build_message(to: str, subject: str, html_content: str) -> EmailMessage:
+        """Crea el mensaje con la identidad de Ecoshield360; el envío lo hace MailQueue"""
+        message = EmailMessage()
+        message["From"] = formataddr((MailConfig.MAIL_FROM_NAME, MailConfig.MAIL_FROM))
+        message["To"] = to
+        message["Subject"] = subject
+        message["X-Mailer"] = "Ecoshield360 Mail Service"
+        message["X-Priority"] = "1"
+        message["Importance"] = "high"
+        message.set_content(html_content, subtype="html")
+        return message
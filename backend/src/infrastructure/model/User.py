@@ -1,13 +1,11 @@
 from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
 from sqlalchemy.orm import relationship
 from infrastructure.config.Base import Base
-from passlib.context import CryptContext
+from infrastructure.services.PasswordHasher import get_pwd_context
 
 from .EmailVerificationToken import EmailVerificationToken
 from .Role import Role
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 class User(Base):
     __tablename__ = "users"
 
@@ -22,18 +20,20 @@ class User(Base):
     
 
     role_id = Column(Integer, ForeignKey("roles.id"))
-    role = relationship("Role", back_populates="users")
+    # Con AsyncSession no hay carga perezosa: el rol se trae en la misma consulta del usuario
+    role = relationship("Role", back_populates="users", lazy="joined")
     
     verification_tokens = relationship(
         "EmailVerificationToken", 
         back_populates="user",
         cascade="all, delete-orphan"
     )
+    # Versiones síncronas; en las peticiones se usa password_hasher para no bloquear el event loop
     def verify_password(self, plain_password: str) -> bool:
-        return pwd_context.verify(plain_password, self.password)
+        return get_pwd_context().verify(plain_password, self.password)
 
     def hash_password(self):
-        self.password = pwd_context.hash(self.password)
+        self.password = get_pwd_context().hash(self.password)
 
     def create_verification_token(self) -> EmailVerificationToken:
         return EmailVerificationToken.create_for_user(self.id)
@@ -0,0 +1,7 @@
+from enum import Enum
+
+class ReportJobStatusEnum(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
@@ -0,0 +1,39 @@
+from datetime import datetime
+from sqlalchemy import Row, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from infrastructure.model.EmailVerificationToken import EmailVerificationToken
+from infrastructure.model.User import User
+
+class EmailVerificationTokenRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def consume(self, token: str, now: datetime) -> Row | None:
+        """
+        En una sola sentencia: borra el token si no ha vencido y marca al usuario como verificado.
+        Retorna (expires_at, verified_user_id) o None si el token no existe;
+        verified_user_id es None si el token venció.
+        """
+        found = (
+            select(EmailVerificationToken.user_id, EmailVerificationToken.expires_at)
+            .where(EmailVerificationToken.token == token)
+            .cte("found")
+        )
+        consumed = (
+            delete(EmailVerificationToken)
+            .where(EmailVerificationToken.token == token, EmailVerificationToken.expires_at > now)
+            .returning(EmailVerificationToken.user_id)
+            .cte("consumed")
+        )
+        verified = (
+            update(User)
+            .where(User.id == consumed.c.user_id)
+            .values(is_verified=True)
+            .returning(User.id)
+            .cte("verified")
+        )
+        query = (
+            select(found.c.expires_at, verified.c.id.label("verified_user_id"))
+            .select_from(found.outerjoin(verified, verified.c.id == found.c.user_id))
+        )
+        return (await self.db.execute(query)).one_or_none()
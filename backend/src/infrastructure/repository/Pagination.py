@@ -0,0 +1,65 @@
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.helpers.Cursor import decode_cursor, encode_cursor
+from core.helpers.Params import Params
+
+async def keyset_page(
+    db: AsyncSession,
+    query: Select,
+    order_columns: Sequence[Any],
+    params: Params,
+    scalars: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Página que empieza después del cursor, ordenada por columnas indexadas (la última debe ser única).
+    El costo no depende de la profundidad: el índice salta directo al cursor, sin OFFSET.
+    Retorna (registros, siguiente_cursor); siguiente_cursor es None en la última página.
+    """
+    page_size = params.effective_page_size
+
+    if params.cursor:
+        values = decode_cursor(params.cursor, len(order_columns), [_python_type(column) for column in order_columns])
+        if len(order_columns) == 1:
+            query = query.where(order_columns[0] > values[0])
+        else:
+            query = query.where(tuple_(*order_columns) > tuple_(*values))
+
+    # Un registro extra indica si hay otra página sin contar
+    result = await db.execute(query.order_by(*order_columns).limit(page_size + 1))
+    registers = list(result.scalars().all() if scalars else result.all())
+
+    next_cursor = None
+    if len(registers) > page_size:
+        registers = registers[:page_size]
+        last = registers[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in order_columns])
+    return registers, next_cursor
+
+def _python_type(column: Any) -> type:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return object
+
+async def offset_page(db: AsyncSession, query: Select, order_columns: Sequence[Any], params: Params, scalars: bool = False) -> List[Any]:
+    page_size = params.effective_page_size
+    query = query.order_by(*order_columns).offset((params.effective_page_index - 1) * page_size).limit(page_size)
+    result = await db.execute(query)
+    return list(result.scalars().all() if scalars else result.all())
+
+async def exact_count(db: AsyncSession, query: Select) -> int:
+    return await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+
+async def estimated_count(db: AsyncSession, table_name: str) -> Optional[int]:
+    """
+    Filas de la tabla según las estadísticas del planner (pg_class.reltuples), sin recorrerla.
+    Solo sirve para la tabla completa, sin filtros. None si la tabla nunca se ha analizado.
+    """
+    reltuples = await db.scalar(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name}
+    )
+    if reltuples is None or reltuples < 0:
+        return None
+    return int(reltuples)
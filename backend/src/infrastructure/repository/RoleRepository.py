@@ -1,30 +1,31 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from infrastructure.model.Role import Role
 
 class RoleRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, data: dict) -> Role:
+    async def create(self, data: dict) -> Role:
         role = Role(**data)
         self.db.add(role)
-        self.db.commit()
-        self.db.refresh(role)
+        await self.db.commit()
+        await self.db.refresh(role)
         return role
 
-    def find_by_id(self, role_id: int) -> Role | None:
-        return self.db.query(Role).filter(Role.id == role_id).first()
+    async def find_by_id(self, role_id: int) -> Role | None:
+        return await self.db.scalar(select(Role).where(Role.id == role_id))
 
-    def find_by_name(self, name: str) -> Role | None:
-        return self.db.query(Role).filter(Role.name == name).first()
+    async def find_by_name(self, name: str) -> Role | None:
+        return await self.db.scalar(select(Role).where(Role.name == name))
 
-    def find_all(self) -> list[Role]:
-        return self.db.query(Role).all()
+    async def find_all(self) -> list[Role]:
+        return list(await self.db.scalars(select(Role)))
 
-    def delete(self, role_id: int) -> bool:
-        role = self.find_by_id(role_id)
+    async def delete(self, role_id: int) -> bool:
+        role = await self.find_by_id(role_id)
         if not role:
             return False
-        self.db.delete(role)
-        self.db.commit()
-        return True
\ No newline at end of file
+        await self.db.delete(role)
+        await self.db.commit()
+        return True
@@ -1,46 +1,154 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, Row, Select, String, insert, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from infrastructure.model.User import User
+from infrastructure.model.Role import Role
+from infrastructure.model.EmailVerificationToken import EmailVerificationToken
+from infrastructure.repository.Pagination import estimated_count, exact_count, keyset_page, offset_page
+from core.helpers.Pager import Pager, create_pager
+from core.helpers.Params import Params
 
 class UserRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, data: dict) -> User:
-        user = User(**data)
+    async def create(self, user: User) -> User:
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
         return user
 
-    def find_by_id(self, user_id: int) -> User | None:
-        return self.db.query(User).filter(User.id == user_id).first()
+    async def create_with_verification_token(self, user: User, token: EmailVerificationToken) -> User:
+        """
+        Inserta el usuario y su token de verificación en una sola sentencia (CTE) y un commit.
+        Si el username o el email ya existen, la restricción única lanza IntegrityError.
+        """
+        new_user = (
+            insert(User)
+            .values(
+                first_name=user.first_name,
+                last_name=user.last_name,
+                username=user.username,
+                email=user.email,
+                password=user.password,
+                is_enabled=True,
+                is_verified=False
+            )
+            .returning(User.id)
+            .cte("new_user")
+        )
+        query = (
+            insert(EmailVerificationToken)
+            .from_select(
+                ["token", "user_id", "expires_at"],
+                select(literal(token.token, String), new_user.c.id, literal(token.expires_at, DateTime)).select_from(new_user)
+            )
+            .returning(EmailVerificationToken.user_id)
+            .add_cte(new_user)
+        )
 
-    def find_all(self, filters: dict = {}) -> list[User]:
-        query = self.db.query(User)
+        user.id = (await self.db.execute(query)).scalar_one()
+        await self.db.commit()
+
+        user.is_enabled = True
+        user.is_verified = False
+        token.user_id = user.id
+        return user
+
+    async def find_by_id(self, user_id: int) -> User | None:
+        return await self.db.scalar(select(User).where(User.id == user_id))
+
+    async def find_all(self, filters: dict = {}) -> list[User]:
+        query = select(User)
         for attr, value in filters.items():
-            query = query.filter(getattr(User, attr) == value)
-        return query.all()
+            query = query.where(getattr(User, attr) == value)
+        return list(await self.db.scalars(query))
+
+    async def find_page(self, params: Params) -> Pager[User]:
+        """
+        Listado por offset o, si params trae cursor, por keyset sobre users.id
+        """
+        query = select(User)
+        if params.search:
+            search_filter = f"%{params.search}%"
+            query = query.where(or_(
+                User.username.ilike(search_filter),
+                User.first_name.ilike(search_filter),
+                User.last_name.ilike(search_filter)
+            ))
+
+        order_columns = [User.id]
+        next_cursor = None
+        if params.is_keyset:
+            registers, next_cursor = await keyset_page(self.db, query, order_columns, params, scalars=True)
+        else:
+            registers = await offset_page(self.db, query, order_columns, params, scalars=True)
+
+        # La estimación solo vale para la tabla sin filtros
+        total = None
+        total_is_estimate = False
+        if params.estimate_total and not params.search:
+            total = await estimated_count(self.db, User.__tablename__)
+            total_is_estimate = total is not None
+        if total is None and not params.is_keyset:
+            total = await exact_count(self.db, query)
+
+        return create_pager(
+            registers=registers,
+            total=total,
+            page_index=params.effective_page_index,
+            page_size=params.effective_page_size,
+            search=params.search,
+            cursor=params.cursor,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate
+        )
+
+    async def find_by_username(self, username: str) -> User | None:
+        return await self.db.scalar(select(User).where(User.username == username))
+
+    async def find_by_email(self, email: str) -> User | None:
+        return await self.db.scalar(select(User).where(User.email == email))
+
+    async def find_auth_projection(self, user_id: int) -> Row | None:
+        """
+        Solo las columnas que necesita la autorización, con el nombre del rol en la misma consulta
+        """
+        query = self._auth_projection().where(User.id == user_id)
+        return (await self.db.execute(query)).one_or_none()
+
+    async def find_login_projection(self, username: str) -> Row | None:
+        """
+        Proyección de autorización más el hash de la contraseña, sin instanciar User ni Role
+        """
+        query = self._auth_projection(User.password).where(User.username == username)
+        return (await self.db.execute(query)).one_or_none()
 
-    def find_by_username(self, username: str) -> User | None:
-        return self.db.query(User).filter(User.username == username).first()
+    async def update_password(self, user_id: int, password_hash: str) -> None:
+        await self.db.execute(update(User).where(User.id == user_id).values(password=password_hash))
+        await self.db.commit()
 
-    def find_by_email(self, email: str) -> User | None:
-        return self.db.query(User).filter(User.email == email).first()
+    @staticmethod
+    def _auth_projection(*columns) -> Select:
+        return (
+            select(User.id, User.username, User.email, User.first_name, User.last_name,
+                   User.is_enabled, User.is_verified, Role.name.label("role"), *columns)
+            .outerjoin(Role, User.role_id == Role.id)
+        )
 
-    def update(self, user_id: int, update_data: dict) -> User | None:
-        user = self.find_by_id(user_id)
+    async def update(self, user_id: int, update_data: dict) -> User | None:
+        user = await self.find_by_id(user_id)
         if not user:
             return None
         for key, value in update_data.items():
             setattr(user, key, value)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
         return user
 
-    def delete(self, user_id: int) -> bool:
-        user = self.find_by_id(user_id)
+    async def delete(self, user_id: int) -> bool:
+        user = await self.find_by_id(user_id)
         if not user:
             return False
-        self.db.delete(user)
-        self.db.commit()
-        return True
\ No newline at end of file
+        await self.db.delete(user)
+        await self.db.commit()
+        return True
@@ -0,0 +1,283 @@
+#CopernicusSessionManager.py
+import os
+import time
+import asyncio
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, TypeVar
+from dotenv import load_dotenv
+from infrastructure.config.HttpClient import HttpClient
+
+if TYPE_CHECKING:
+    from sentinelsat import SentinelAPI
+
+load_dotenv()
+
+T = TypeVar("T")
+
+class CopernicusSessionManager:
+    """
+    Mantiene clientes autenticados de larga duración (SentinelAPI, OpenEO) y el token
+    bearer de CDSE, renovándolo antes de que expire y reautenticando solo ante un 401
+    """
+    def __init__(self, http_client: HttpClient, user: str, password: str, token_url: str):
+        self.http_client = http_client
+        self.user = user
+        self.password = password
+        self.token_url = token_url
+
+        self.client_id = os.getenv("CDSE_CLIENT_ID", "cdse-public")
+        self.refresh_margin = float(os.getenv("CDSE_TOKEN_REFRESH_MARGIN", 60))
+        self.sentinelsat_url = os.getenv("SENTINELSAT_API_URL", "https://apihub.copernicus.eu/apihub")
+        self.openeo_url = os.getenv("OPENEO_URL", "https://openeo.cloud")
+
+        self._access_token: Optional[str] = None
+        self._refresh_token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._refresh_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self._sentinel_api: Optional["SentinelAPI"] = None
+        self._sentinel_lock = asyncio.Lock()
+        self._openeo_connection = None
+        self._openeo_lock = asyncio.Lock()
+
+        # Hilos propios para los SDK bloqueantes (sentinelsat, openeo); ver _run_sdk
+        self.sdk_workers = int(os.getenv("COPERNICUS_SDK_WORKERS", 4))
+        self._sdk_executor: Optional[ThreadPoolExecutor] = None
+        self.sdk_in_flight = 0
+        self.sdk_abandoned = 0
+        self.sdk_rejected = 0
+
+        self.token_requests = 0
+        self.token_refreshes = 0
+        self.reauthentications = 0
+
+    async def close(self):
+        """
+        Detiene la renovación proactiva y descarta las sesiones abiertas
+        """
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+        if self._sentinel_api is not None:
+            self._sentinel_api.session.close()
+        self._sentinel_api = None
+        self._openeo_connection = None
+        self._access_token = None
+        self._refresh_token = None
+
+        if self._sdk_executor is not None:
+            # Las llamadas que siguen en curso no se esperan: el SDK no permite interrumpirlas
+            self._sdk_executor.shutdown(wait=False, cancel_futures=True)
+            self._sdk_executor = None
+
+    # Token bearer de CDSE
+
+    async def get_access_token(self, force: bool = False) -> str:
+        if not force and self._token_is_fresh():
+            return self._access_token
+
+        async with self._token_lock:
+            # Otra corrutina pudo renovarlo mientras se esperaba el lock
+            if not force and self._token_is_fresh():
+                return self._access_token
+
+            await self._request_token()
+            return self._access_token
+
+    def _token_is_fresh(self) -> bool:
+        return self._access_token is not None and time.monotonic() < self._refresh_at
+
+    async def _request_token(self):
+        now = time.monotonic()
+        if self._refresh_token and now < self._refresh_expires_at - self.refresh_margin:
+            data = {
+                "grant_type": "refresh_token",
+                "refresh_token": self._refresh_token,
+                "client_id": self.client_id
+            }
+            self.token_refreshes += 1
+        else:
+            data = {
+                "grant_type": "password",
+                "username": self.user,
+                "password": self.password,
+                "client_id": self.client_id
+            }
+            self.token_requests += 1
+
+        response = await self.http_client.post(self.token_url, data=data)
+        if response.status_code != 200 and data["grant_type"] == "refresh_token":
+            # El refresh token fue revocado: se vuelve a pedir con credenciales
+            self._refresh_token = None
+            return await self._request_token()
+        response.raise_for_status()
+
+        payload = response.json()
+        now = time.monotonic()
+        lifetime = float(payload.get("expires_in", 600))
+        margin = self.refresh_margin
+        if margin > lifetime / 2:
+            # Con un margen mayor que la vida del token se pediría uno nuevo en cada llamada
+            margin = lifetime / 2
+            print(f"⚠️ CDSE_TOKEN_REFRESH_MARGIN ({self.refresh_margin:g}s) no cabe en la vida del token ({lifetime:g}s); se renovará a los {lifetime - margin:g}s")
+        self._access_token = payload["access_token"]
+        self._expires_at = now + lifetime
+        self._refresh_at = now + lifetime - margin
+        self._refresh_token = payload.get("refresh_token")
+        self._refresh_expires_at = now + float(payload.get("refresh_expires_in", 0))
+
+        print(f"🔑 Token CDSE obtenido (expira en {payload.get('expires_in', 600)}s)")
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        """
+        Renueva el token un margen antes de su expiración para que ninguna petición espere
+        """
+        while self._access_token:
+            delay = self._refresh_at - time.monotonic()
+            await asyncio.sleep(max(delay, 1))
+            try:
+                await self.get_access_token()
+            except Exception as e:
+                # La siguiente petición lo solicitará de nuevo bajo demanda
+                print(f"⚠️ No se pudo renovar el token CDSE: {e}")
+                return
+
+    async def authorized_get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET con el token bearer en caché; ante un 401 se reautentica y se reintenta una vez
+        """
+        try:
+            token = await self.get_access_token()
+        except Exception as e:
+            print(f"⚠️ Sin token CDSE, se consulta sin autenticar: {e}")
+            return await self.http_client.get(url, **kwargs)
+
+        response = await self.http_client.get(url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+        if response.status_code == 401:
+            self.reauthentications += 1
+            token = await self.get_access_token(force=True)
+            response = await self.http_client.get(url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+        return response
+
+    # Clientes SentinelAPI y OpenEO
+
+    async def get_sentinel_api(self, force: bool = False) -> "SentinelAPI":
+        async with self._sentinel_lock:
+            if self._sentinel_api is None or force:
+                self._sentinel_api = await self._run_sdk(self._create_sentinel_api)
+            return self._sentinel_api
+
+    async def get_openeo_connection(self, force: bool = False):
+        async with self._openeo_lock:
+            if self._openeo_connection is None or force:
+                self._openeo_connection = await self._run_sdk(self._connect_openeo)
+                print("✅ Autenticado en OpenEO")
+            return self._openeo_connection
+
+    def _create_sentinel_api(self) -> "SentinelAPI":
+        # sentinelsat y openeo se importan con el primer cliente, en el hilo de trabajo,
+        # para no cargar su costo al arrancar ni bloquear el event loop
+        from sentinelsat import SentinelAPI
+        return SentinelAPI(self.user, self.password, self.sentinelsat_url)
+
+    def _connect_openeo(self):
+        import openeo
+        connection = openeo.connect(self.openeo_url)
+        connection.authenticate_basic(self.user, self.password)
+        return connection
+
+    async def call_sentinel_api(self, fn: Callable[["SentinelAPI"], T]) -> T:
+        """
+        Ejecuta `fn` con el cliente SentinelAPI compartido en un hilo aparte
+        """
+        api = await self.get_sentinel_api()
+        try:
+            return await self._run_sdk(fn, api)
+        except Exception as e:
+            if not self.is_unauthorized(e):
+                raise
+            self.reauthentications += 1
+            api = await self.get_sentinel_api(force=True)
+            return await self._run_sdk(fn, api)
+
+    async def call_openeo(self, fn: Callable[[Any], T]) -> T:
+        """
+        Ejecuta `fn` con la conexión OpenEO autenticada compartida en un hilo aparte
+        """
+        connection = await self.get_openeo_connection()
+        try:
+            return await self._run_sdk(fn, connection)
+        except Exception as e:
+            if not self.is_unauthorized(e):
+                raise
+            self.reauthentications += 1
+            connection = await self.get_openeo_connection(force=True)
+            return await self._run_sdk(fn, connection)
+
+    async def _run_sdk(self, fn: Callable[..., T], *args) -> T:
+        """
+        Ejecuta una llamada bloqueante del SDK en un pool acotado propio.
+        Cancelar la espera (tiempo límite o cobertura perdida) no detiene el hilo: la llamada sigue
+        ocupándolo hasta terminar. Con todos los hilos ocupados, una llamada nueva falla de inmediato
+        (y cuenta como fallo en el circuit breaker) en lugar de encolarse detrás de ellas.
+        """
+        if self.sdk_in_flight >= self.sdk_workers:
+            self.sdk_rejected += 1
+            raise RuntimeError(f"Los {self.sdk_workers} hilos del SDK de Copernicus están ocupados")
+
+        if self._sdk_executor is None:
+            self._sdk_executor = ThreadPoolExecutor(max_workers=self.sdk_workers, thread_name_prefix="copernicus-sdk")
+
+        loop = asyncio.get_running_loop()
+        future = self._sdk_executor.submit(fn, *args)
+        self.sdk_in_flight += 1
+        future.add_done_callback(lambda _: self._sdk_finished(loop))
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.done():
+                self.sdk_abandoned += 1
+            raise
+
+    def _sdk_finished(self, loop: asyncio.AbstractEventLoop):
+        # Se llama desde el hilo de trabajo: el contador se actualiza en el event loop
+        try:
+            loop.call_soon_threadsafe(self._release_sdk_slot)
+        except RuntimeError:
+            # El loop ya se cerró al apagar
+            pass
+
+    def _release_sdk_slot(self):
+        self.sdk_in_flight -= 1
+
+    @staticmethod
+    def is_unauthorized(error: Exception) -> bool:
+        status = getattr(error, "http_status_code", None)
+        if status is None:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+        return status == 401 or type(error).__name__ == "UnauthorizedError"
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "hasToken": self._access_token is not None,
+            "tokenExpiresIn": max(0, round(self._expires_at - time.monotonic())) if self._access_token else 0,
+            "tokenRequests": self.token_requests,
+            "tokenRefreshes": self.token_refreshes,
+            "reauthentications": self.reauthentications,
+            "sentinelApiOpen": self._sentinel_api is not None,
+            "openeoConnected": self._openeo_connection is not None,
+            "sdkWorkers": self.sdk_workers,
+            "sdkInFlight": self.sdk_in_flight,
+            "sdkAbandoned": self.sdk_abandoned,
+            "sdkRejected": self.sdk_rejected
+        }
@@ -0,0 +1,186 @@
+#MailQueue.py
+import os
+import random
+import asyncio
+import smtplib
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+from infrastructure.services.MailTransport import create_mail_transport
+
+load_dotenv()
+
+@dataclass
+class MailJob:
+    message: EmailMessage
+    attempts: int = 0
+
+class MailQueue:
+    """
+    Cola de envío en segundo plano: quien envía un correo no espera al servidor SMTP.
+    Cada worker toma un lote de la cola y lo envía por una conexión del pool;
+    los fallos temporales se reintentan con backoff exponencial.
+    """
+    def __init__(self, transport=None):
+        self.transport = transport or create_mail_transport()
+        self.workers = int(os.getenv("MAIL_QUEUE_WORKERS", 2))
+        self.max_size = int(os.getenv("MAIL_QUEUE_MAX_SIZE", 1000))
+        self.batch_size = int(os.getenv("MAIL_BATCH_SIZE", 20))
+        # Espera breve para juntar un lote cuando llegan pocos correos
+        self.batch_wait = float(os.getenv("MAIL_BATCH_WAIT_MS", 50)) / 1000
+        self.max_retries = int(os.getenv("MAIL_MAX_RETRIES", 5))
+        self.retry_base_delay = float(os.getenv("MAIL_RETRY_BASE_DELAY", 2))
+        self.retry_max_delay = float(os.getenv("MAIL_RETRY_MAX_DELAY", 300))
+        self.shutdown_timeout = float(os.getenv("MAIL_SHUTDOWN_TIMEOUT", 10))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        # Reintentos en espera, con su trabajo para no perderlo al apagar
+        self._retry_jobs: Dict[asyncio.Task, MailJob] = {}
+        self._closing = False
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+
+    async def start(self):
+        if self._queue is not None:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._closing = False
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        print(f"📬 Cola de correo lista ({self.workers} workers, lote: {self.batch_size})")
+
+    async def close(self):
+        """
+        Los reintentos en espera se adelantan para un último intento; se espera hasta
+        `shutdown_timeout` a que se vacíe la cola y lo que no se envió queda registrado
+        """
+        if self._queue is None:
+            return
+
+        self._closing = True
+        retry_jobs = list(self._retry_jobs.items())
+        self._retry_jobs.clear()
+        for task, job in retry_jobs:
+            # Terminada: el trabajo ya volvió a la cola
+            if task.done():
+                continue
+            task.cancel()
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                self._drop(job, "cola llena al apagar")
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Tiempo de cierre agotado con {self._queue.qsize()} correos en cola")
+
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, *[task for task, _ in retry_jobs], return_exceptions=True)
+        while not self._queue.empty():
+            self._drop(self._queue.get_nowait(), "el servidor se detuvo")
+        self._worker_tasks = []
+        self._queue = None
+
+        await asyncio.to_thread(self.transport.close)
+        print("📬 Cola de correo cerrada")
+
+    async def enqueue(self, message: EmailMessage):
+        """
+        Agrega el correo a la cola; solo espera si la cola está llena
+        """
+        if self._queue is None:
+            await self.start()
+        await self._queue.put(MailJob(message))
+
+    async def _worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            if self.batch_wait and self._queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_wait)
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                try:
+                    errors = await asyncio.to_thread(self.transport.send_batch, [job.message for job in batch])
+                except asyncio.CancelledError:
+                    # Apagado a mitad de un lote: el hilo puede terminar de enviarlo, pero no se confirma
+                    for job in batch:
+                        self._drop(job, "envío interrumpido al apagar")
+                    raise
+                except Exception as e:
+                    # No se pudo abrir la conexión o iniciar sesión: es un fallo del servidor, no de
+                    # cada mensaje, así que todo el lote se reintenta aunque la respuesta sea un 5xx
+                    print(f"⚠️ No se pudo conectar al servidor SMTP: {e}")
+                    for job in batch:
+                        self._retry(job, e, transport_error=True)
+                    continue
+
+                for job, error in zip(batch, errors):
+                    if error is None:
+                        self.sent += 1
+                    else:
+                        self._retry(job, error)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _retry(self, job: MailJob, error: Exception, transport_error: bool = False):
+        job.attempts += 1
+        # Un rechazo definitivo del mensaje (5xx, destinatario inválido) no se reintenta
+        permanent = not transport_error and (
+            isinstance(error, smtplib.SMTPRecipientsRefused) or (
+                isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+            )
+        )
+        if permanent or job.attempts > self.max_retries:
+            self.failed += 1
+            print(f"❌ No se pudo enviar el correo a {job.message['To']} tras {job.attempts} intentos: {error}")
+            return
+        if self._closing:
+            self._drop(job, f"falló el último intento al apagar: {error}")
+            return
+
+        # Backoff exponencial con jitter para no reintentar todos a la vez
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (job.attempts - 1))
+        delay *= random.uniform(0.5, 1.0)
+        self.retried += 1
+        print(f"🔁 Reintento {job.attempts} del correo a {job.message['To']} en {delay:.1f}s: {error}")
+
+        task = asyncio.create_task(self._requeue(job, delay))
+        self._retry_jobs[task] = job
+        task.add_done_callback(lambda done: self._retry_jobs.pop(done, None))
+
+    async def _requeue(self, job: MailJob, delay: float):
+        await asyncio.sleep(delay)
+        if self._queue is None:
+            # close() ya terminó: no queda cola en la que dejar el reintento
+            self._drop(job, "la cola ya se cerró")
+            return
+        await self._queue.put(job)
+
+    def _drop(self, job: MailJob, reason: str):
+        self.dropped += 1
+        print(f"❌ Correo a {job.message['To']} descartado sin enviar ({reason})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "batchSize": self.batch_size,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "maxQueue": self.max_size,
+            "waitingRetry": len(self._retry_jobs),
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "transport": self.transport.get_stats()
+        }
+
+mail_queue = MailQueue()
@@ -0,0 +1,167 @@
+#MailTransport.py
+import os
+import ssl
+import time
+import queue
+import smtplib
+import threading
+from email.message import EmailMessage
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from infrastructure.config.mailConfig import MailConfig
+
+load_dotenv()
+
+# Los transportes son síncronos: MailQueue los llama desde hilos con asyncio.to_thread
+
+class SmtpTransport:
+    """
+    Pool de conexiones SMTP persistentes (TLS y login una sola vez por conexión).
+    Cada lote de mensajes se envía por una misma conexión.
+    """
+    def __init__(self):
+        self.host = MailConfig.MAIL_HOST
+        self.port = MailConfig.MAIL_PORT
+        self.username = MailConfig.MAIL_USERNAME
+        self.password = MailConfig.MAIL_PASSWORD
+        self.use_tls = MailConfig.MAIL_TLS
+        self.use_ssl = MailConfig.MAIL_SSL
+        self.timeout = float(os.getenv("MAIL_SMTP_TIMEOUT", 30))
+        self.pool_size = int(os.getenv("MAIL_SMTP_POOL_SIZE", 2))
+        # Los servidores cierran las sesiones inactivas; una conexión más vieja se descarta
+        self.max_idle = float(os.getenv("MAIL_SMTP_MAX_IDLE", 60))
+
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self.connections_opened = 0
+        self.stale_discarded = 0
+        self.batches = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        context = ssl.create_default_context()
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout, context=context)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls and not self.use_ssl:
+                smtp.starttls(context=context)
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except (smtplib.SMTPException, OSError):
+            # TLS o login rechazados: la conexión abierta no vuelve al pool
+            smtp.close()
+            raise
+
+        self.connections_opened += 1
+        return smtp
+
+    def _take_idle(self) -> Optional[smtplib.SMTP]:
+        while True:
+            try:
+                smtp, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            if time.monotonic() - released_at <= self.max_idle and self._is_alive(smtp):
+                return smtp
+            self.stale_discarded += 1
+            self._discard(smtp)
+
+    @staticmethod
+    def _is_alive(smtp: smtplib.SMTP) -> bool:
+        # El servidor pudo cerrar la sesión antes de max_idle; un NOOP lo detecta sin gastar un mensaje
+        try:
+            return smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _discard(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def send_batch(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        """
+        Envía los mensajes por una conexión del pool y retorna el error de cada uno (None si salió).
+        Un rechazo del servidor solo afecta a ese mensaje; si se cae la conexión, los
+        mensajes pendientes del lote se marcan con ese error.
+        """
+        errors: List[Optional[Exception]] = [None] * len(messages)
+        with self._slots:
+            smtp = self._take_idle() or self._connect()
+            self.batches += 1
+
+            broken: Optional[Exception] = None
+            for index, message in enumerate(messages):
+                if broken is not None:
+                    errors[index] = broken
+                    continue
+                try:
+                    smtp.send_message(message)
+                except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+                    errors[index] = e
+                except (smtplib.SMTPException, OSError) as e:
+                    errors[index] = broken = e
+
+            if broken is None:
+                self._idle.put((smtp, time.monotonic()))
+            else:
+                self._discard(smtp)
+        return errors
+
+    def close(self):
+        while True:
+            try:
+                smtp, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(smtp)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "transport": "smtp",
+            "host": self.host,
+            "poolSize": self.pool_size,
+            "idleConnections": self._idle.qsize(),
+            "connectionsOpened": self.connections_opened,
+            "staleDiscarded": self.stale_discarded,
+            "batches": self.batches
+        }
+
+class InMemoryMailTransport:
+    """
+    Sustituto local del servidor SMTP para pruebas y benchmarks: guarda los mensajes en memoria.
+    MAIL_MEMORY_LATENCY_MS simula el tiempo de envío de cada lote.
+    """
+    def __init__(self):
+        self.latency = float(os.getenv("MAIL_MEMORY_LATENCY_MS", 0)) / 1000
+        self.max_messages = int(os.getenv("MAIL_MEMORY_MAX_MESSAGES", 1000))
+        self.sent: List[EmailMessage] = []
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    def send_batch(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.batches += 1
+            self.sent.extend(messages)
+            del self.sent[:-self.max_messages]
+        return [None] * len(messages)
+
+    def close(self):
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "transport": "memory",
+            "stored": len(self.sent),
+            "batches": self.batches
+        }
+
+def create_mail_transport():
+    if os.getenv("MAIL_TRANSPORT", "smtp").lower() == "memory":
+        return InMemoryMailTransport()
+    return SmtpTransport()
@@ -0,0 +1,98 @@
+#PasswordHasher.py
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from dotenv import load_dotenv
+from core.exceptions.PasswordHasherSaturatedException import PasswordHasherSaturatedException
+
+load_dotenv()
+
+# Costo de bcrypt (2^rounds iteraciones); cada +1 duplica el tiempo por login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+_pwd_context = None
+
+def get_pwd_context():
+    """
+    Contexto de passlib, creado al primer uso para no cargarlo al arrancar.
+    min_rounds == max_rounds: cualquier hash con otro costo queda marcado para re-hash al iniciar sesión
+    """
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=BCRYPT_ROUNDS,
+            bcrypt__min_rounds=BCRYPT_ROUNDS,
+            bcrypt__max_rounds=BCRYPT_ROUNDS
+        )
+    return _pwd_context
+
+class PasswordHasher:
+    """
+    Pool acotado de hilos para bcrypt, fuera del event loop (bcrypt libera el GIL).
+    Rechaza trabajos cuando la cola está llena para que una ráfaga de logins
+    no acapare el servidor.
+    """
+    def __init__(self):
+        self.max_workers = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+        self.max_queue = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 32))
+        self.retry_after = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", 1))
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    async def _submit(self, fn: Callable[..., Any], *args) -> Any:
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherSaturatedException(retry_after=self.retry_after)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_pwd_context().hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Retorna (válida, nuevo_hash); nuevo_hash solo viene si el hash guardado usa otro costo
+        """
+        valid, new_hash = await self._submit(get_pwd_context().verify_and_update, password, hashed)
+        if new_hash:
+            self.rehashed += 1
+        return valid, new_hash
+
+    async def close(self):
+        if self._executor is None:
+            return
+
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        print("🔑 Pool de contraseñas cerrado")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "rounds": BCRYPT_ROUNDS,
+            "workers": self.max_workers,
+            "maxQueue": self.max_queue,
+            "inFlight": self.in_flight,
+            "queued": max(0, self.in_flight - self.max_workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed
+        }
+
+password_hasher = PasswordHasher()
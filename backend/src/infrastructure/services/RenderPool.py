@@ -0,0 +1,121 @@
+#RenderPool.py
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from dotenv import load_dotenv
+from core.exceptions.RenderPoolSaturatedException import RenderPoolSaturatedException
+
+load_dotenv()
+
+class RenderPool:
+    """
+    Pool acotado de procesos precalentados para el renderizado de reportes,
+    fuera del event loop. Rechaza trabajos cuando la cola está llena.
+    """
+    def __init__(self, initializer: Optional[Callable[[], None]] = None, warm_up: Optional[Callable[[], Any]] = None):
+        self.max_workers = int(os.getenv("REPORT_RENDER_WORKERS", 2))
+        self.max_queue = int(os.getenv("REPORT_RENDER_MAX_QUEUE", 8))
+        self.retry_after = int(os.getenv("REPORT_RENDER_RETRY_AFTER", 5))
+        self.start_method = os.getenv("REPORT_RENDER_START_METHOD", "spawn")
+
+        self.initializer = initializer
+        self.warm_up = warm_up
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._restart_lock = asyncio.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.restarts = 0
+
+    async def start(self):
+        """
+        Crea los procesos y espera a que todos terminen su inicialización
+        """
+        if self._executor is not None:
+            return
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=self.initializer
+        )
+
+        if self.warm_up:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[
+                loop.run_in_executor(self._executor, self.warm_up)
+                for _ in range(self.max_workers)
+            ])
+        print(f"🖨️ Pool de renderizado listo ({self.max_workers} procesos, cola: {self.max_queue})")
+
+    async def close(self):
+        """
+        Espera a que terminen los trabajos en curso y detiene los procesos
+        """
+        if self._executor is None:
+            return
+
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        print("🖨️ Pool de renderizado cerrado")
+
+    async def submit(self, fn: Callable[..., Any], *args) -> Any:
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise RenderPoolSaturatedException(retry_after=self.retry_after)
+
+        if self._executor is None:
+            await self.start()
+
+        self.in_flight += 1
+        try:
+            executor = self._executor
+            try:
+                result = await self._run(executor, fn, *args)
+            except BrokenProcessPool:
+                # Murió un proceso (OOM, segfault): el executor queda inservible y se recrea.
+                # Se reintenta una sola vez para no repetir un trabajo que tumba al proceso
+                await self._restart(executor)
+                result = await self._run(self._executor, fn, *args)
+        except Exception:
+            # Una cancelación (el cliente se fue) no cuenta como fallo del renderizado
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        self.completed += 1
+        return result
+
+    @staticmethod
+    async def _run(executor: ProcessPoolExecutor, fn: Callable[..., Any], *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, fn, *args)
+
+    async def _restart(self, broken: ProcessPoolExecutor):
+        async with self._restart_lock:
+            # Los demás trabajos que fallaron con el mismo executor usan el ya recreado
+            if self._executor is not broken:
+                return
+
+            print("⚠️ Un proceso de renderizado terminó inesperadamente; se recrea el pool")
+            self._executor = None
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.restarts += 1
+            await self.start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "maxQueue": self.max_queue,
+            "inFlight": self.in_flight,
+            "queued": max(0, self.in_flight - self.max_workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "restarts": self.restarts
+        }
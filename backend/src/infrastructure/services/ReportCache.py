@@ -0,0 +1,114 @@
+#ReportCache.py
+import os
+import json
+import asyncio
+import hashlib
+import tempfile
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+from core.helpers.TtlLruCache import TtlLruCache
+
+load_dotenv()
+
+class ReportCache:
+    """
+    Caché de reportes direccionada por contenido: memoria (LRU) respaldada por disco,
+    ambos con un presupuesto de bytes
+    """
+    def __init__(self):
+        self.enabled = os.getenv("REPORT_CACHE_ENABLED", "true").lower() == "true"
+        self.directory = os.getenv("REPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ecoshield_reports"))
+        self.max_disk_bytes = int(os.getenv("REPORT_CACHE_DISK_BYTES", 256 * 1024 * 1024))
+
+        self.memory = TtlLruCache(
+            ttl_seconds=float(os.getenv("REPORT_CACHE_TTL", 24 * 3600)),
+            max_bytes=int(os.getenv("REPORT_CACHE_MEMORY_BYTES", 32 * 1024 * 1024)),
+            sizeof=len
+        )
+        self.disk_hits = 0
+        self.disk_evictions = 0
+
+    @staticmethod
+    def content_key(payload: Dict[str, Any]) -> str:
+        """
+        Hash SHA-256 de la versión canónica (claves ordenadas, sin espacios) de la petición
+        """
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+
+        content = self.memory.get(key)
+        if content is not None:
+            return content
+
+        content = await asyncio.to_thread(self._read_file, key)
+        if content is not None:
+            self.disk_hits += 1
+            self.memory.set(key, content)
+        return content
+
+    async def set(self, key: str, content: bytes) -> None:
+        if not self.enabled:
+            return
+
+        self.memory.set(key, content)
+        await asyncio.to_thread(self._write_file, key, content)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.bin")
+
+    def _read_file(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+            # Marca el archivo como usado recientemente para el desalojo LRU en disco
+            os.utime(path)
+            return content
+        except FileNotFoundError:
+            return None
+
+    def _write_file(self, key: str, content: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+
+        # Escritura atómica: otro proceso nunca lee un archivo a medias
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+
+        self._enforce_disk_budget()
+
+    def _enforce_disk_budget(self) -> None:
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".bin"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.disk_evictions += 1
+            except FileNotFoundError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "maxDiskBytes": self.max_disk_bytes,
+            "diskHits": self.disk_hits,
+            "diskEvictions": self.disk_evictions,
+            "memory": self.memory.get_stats()
+        }
@@ -0,0 +1,133 @@
+#ReportJobQueue.py
+import os
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from dotenv import load_dotenv
+from api.dto.AirQuality.AirQualityDto import AirQualityData
+from core.exceptions.RenderPoolSaturatedException import RenderPoolSaturatedException
+from infrastructure.services.ReportJobStore import ReportJobStore
+
+load_dotenv()
+
+async def purge_expired_jobs(store: ReportJobStore, interval: float):
+    """
+    Elimina periódicamente los trabajos y archivos vencidos; si hay varios workers de la API
+    todos purgan, lo que es inofensivo porque ReportJobStore tolera archivos ya borrados
+    """
+    while True:
+        removed = await asyncio.to_thread(store.purge_expired)
+        if removed:
+            print(f"🧹 {removed} trabajos de reporte expirados eliminados")
+        await asyncio.sleep(interval)
+
+class LocalReportJobQueue:
+    """
+    Cola de trabajos de reporte en el mismo proceso: los renderiza en segundo plano
+    con concurrencia acotada y deja el resultado en el ReportJobStore
+    """
+    def __init__(self, store: ReportJobStore, render: Callable[[AirQualityData, str, bool], Awaitable[bytes]]):
+        self.store = store
+        self.render = render
+        self.concurrency = int(os.getenv("REPORT_JOBS_CONCURRENCY", 2))
+        self.cleanup_interval = float(os.getenv("REPORT_JOBS_CLEANUP_INTERVAL", 3600))
+        self.shutdown_timeout = float(os.getenv("REPORT_JOBS_SHUTDOWN_TIMEOUT", 30))
+
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+        self._cleanup_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(purge_expired_jobs(self.store, self.cleanup_interval))
+
+    async def close(self):
+        """
+        Espera a los trabajos en curso hasta `shutdown_timeout` y marca como fallidos los restantes
+        """
+        if self._cleanup_task:
+            self._cleanup_task.cancel()
+            self._cleanup_task = None
+
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=self.shutdown_timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+    async def submit(self, air_quality_data: AirQualityData, report_title: str, include_charts: bool = True) -> Dict[str, Any]:
+        job = await asyncio.to_thread(self.store.create, report_title)
+        task = asyncio.create_task(self._run(job["job_id"], air_quality_data, report_title, include_charts))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def _run(self, job_id: str, air_quality_data: AirQualityData, report_title: str, include_charts: bool):
+        try:
+            async with self._semaphore:
+                await asyncio.to_thread(self.store.mark_running, job_id)
+                while True:
+                    try:
+                        content = await self.render(air_quality_data, report_title, include_charts)
+                        break
+                    except RenderPoolSaturatedException as e:
+                        # Los trabajos en segundo plano esperan en lugar de fallar
+                        await asyncio.sleep(e.retry_after)
+
+            await asyncio.to_thread(self.store.mark_completed, job_id, content)
+            print(f"✅ Trabajo de reporte {job_id} completado")
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self.store.mark_failed, job_id, "El servidor se detuvo antes de terminar el reporte")
+            raise
+        except Exception as e:
+            print(f"❌ Trabajo de reporte {job_id} falló: {e}")
+            await asyncio.to_thread(self.store.mark_failed, job_id, str(e))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "local",
+            "concurrency": self.concurrency,
+            "active": len(self._tasks)
+        }
+
+class CeleryReportJobQueue:
+    """
+    Cola de trabajos de reporte sobre Celery/Redis; los workers escriben en el mismo ReportJobStore.
+    La purga de vencidos corre en la API, igual que con la cola local
+    """
+    def __init__(self, store: ReportJobStore):
+        from infrastructure.services.ReportJobTasks import render_report_job
+
+        self.store = store
+        self.task = render_report_job
+        self.cleanup_interval = float(os.getenv("REPORT_JOBS_CLEANUP_INTERVAL", 3600))
+        self._cleanup_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(purge_expired_jobs(self.store, self.cleanup_interval))
+
+    async def close(self):
+        if self._cleanup_task:
+            self._cleanup_task.cancel()
+            self._cleanup_task = None
+
+    async def submit(self, air_quality_data: AirQualityData, report_title: str, include_charts: bool = True) -> Dict[str, Any]:
+        job = await asyncio.to_thread(self.store.create, report_title)
+        await asyncio.to_thread(self.task.delay, job["job_id"], air_quality_data.model_dump_json(), report_title, include_charts)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": "celery"}
+
+def create_report_job_queue(render: Callable[[AirQualityData, str, bool], Awaitable[bytes]]):
+    store = ReportJobStore()
+    if os.getenv("REPORT_JOBS_BACKEND", "local").lower() == "celery":
+        return CeleryReportJobQueue(store)
+    return LocalReportJobQueue(store, render)
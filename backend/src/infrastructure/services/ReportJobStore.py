@@ -0,0 +1,109 @@
+#ReportJobStore.py
+import os
+import json
+import time
+import uuid
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+from infrastructure.model.enum.ReportJobStatusEnum import ReportJobStatusEnum
+
+load_dotenv()
+
+class ReportJobStore:
+    """
+    Persiste el estado de los trabajos de reporte y sus PDFs en disco local,
+    compartido entre procesos del servidor y workers de Celery
+    """
+    def __init__(self):
+        self.directory = os.getenv("REPORT_JOBS_DIR", os.path.join(tempfile.gettempdir(), "ecoshield_report_jobs"))
+        self.retention_seconds = float(os.getenv("REPORT_JOBS_RETENTION_HOURS", 24)) * 3600
+
+    def create(self, report_title: str) -> Dict[str, Any]:
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": ReportJobStatusEnum.QUEUED.value,
+            "report_title": report_title,
+            "created_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "error": None
+        }
+        self._write_metadata(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not self._is_valid_id(job_id):
+            return None
+        try:
+            with open(self._metadata_path(job_id), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def mark_running(self, job_id: str) -> None:
+        self._update(job_id, status=ReportJobStatusEnum.RUNNING.value)
+
+    def mark_completed(self, job_id: str, content: bytes) -> None:
+        self._atomic_write(self.artifact_path(job_id), content)
+        self._update(
+            job_id,
+            status=ReportJobStatusEnum.COMPLETED.value,
+            finished_at=datetime.now().isoformat()
+        )
+
+    def mark_failed(self, job_id: str, error: str) -> None:
+        self._update(
+            job_id,
+            status=ReportJobStatusEnum.FAILED.value,
+            finished_at=datetime.now().isoformat(),
+            error=error
+        )
+
+    def artifact_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.pdf")
+
+    def purge_expired(self) -> int:
+        """
+        Elimina trabajos y artefactos más antiguos que la política de retención
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+
+        limit = time.time() - self.retention_seconds
+        removed = 0
+        for entry in os.scandir(self.directory):
+            # Otro worker puede haber borrado el archivo entre el listado y el stat
+            try:
+                if entry.is_file() and entry.stat().st_mtime < limit:
+                    os.remove(entry.path)
+                    removed += entry.name.endswith(".json")
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _update(self, job_id: str, **changes) -> None:
+        job = self.get(job_id)
+        if job is None:
+            return
+        job.update(changes)
+        self._write_metadata(job)
+
+    def _write_metadata(self, job: Dict[str, Any]) -> None:
+        content = json.dumps(job, ensure_ascii=False).encode("utf-8")
+        self._atomic_write(self._metadata_path(job["job_id"]), content)
+
+    def _atomic_write(self, path: str, content: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+
+    def _metadata_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    @staticmethod
+    def _is_valid_id(job_id: str) -> bool:
+        # Evita que un id manipulado se salga del directorio de trabajos
+        return len(job_id) == 32 and all(c in "0123456789abcdef" for c in job_id)
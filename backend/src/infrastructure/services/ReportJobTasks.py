@@ -0,0 +1,17 @@
+#ReportJobTasks.py
+from infrastructure.config.CeleryConfig import celery_app
+from infrastructure.services.ReportJobStore import ReportJobStore
+
+@celery_app.task(name="reports.render_report_job")
+def render_report_job(job_id: str, air_quality_data_json: str, report_title: str, include_charts: bool = True):
+    from api.dto.AirQuality.AirQualityDto import AirQualityData
+    from core.service.ReportRenderer import render_air_quality_pdf
+
+    store = ReportJobStore()
+    store.mark_running(job_id)
+    try:
+        air_quality_data = AirQualityData.model_validate_json(air_quality_data_json)
+        store.mark_completed(job_id, render_air_quality_pdf(air_quality_data, report_title, include_charts))
+    except Exception as e:
+        store.mark_failed(job_id, str(e))
+        raise
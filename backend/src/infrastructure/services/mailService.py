@@ -1,18 +1,10 @@
-from emails.template import JinjaTemplate
 from infrastructure.config.mailConfig import MailConfig
+from infrastructure.services.MailQueue import mail_queue
 
 class MailService:
     @staticmethod
     async def send_email(to: str, subject: str, html_content: str):
-        message = MailConfig.get_message()
+        message = MailConfig.build_message(to, subject, html_content)
 
-        # Asignamos los datos del correo
-        message.subject = subject
-        message.to = to
-        message.html = JinjaTemplate(html_content)
-
-        # Enviamos el correo
-        response = message.send()
-
-        if response.status_code not in [200, 250]:
-            raise Exception(f"Fallo al enviar correo: {response.status_code} - {response.message}")
\ No newline at end of file
+        # El envío (con reintentos) lo hace la cola en segundo plano
+        await mail_queue.enqueue(message)
@@ -0,0 +1,112 @@
+# ImportTimeBudget.py
+"""
+Verifica el tiempo de importación en frío de la aplicación con `python -X importtime`.
+
+Uso (desde backend/src):
+    python -m shared.utils.ImportTimeBudget
+    python -m shared.utils.ImportTimeBudget --budget-ms 1500 --runs 5 --module api.App
+
+Termina con código 1 si se supera el presupuesto o si al arrancar se importa alguna
+dependencia que debe cargarse de forma diferida.
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Dependencias que solo se deben cargar al usar el proveedor o el reporte que las necesita
+DEFAULT_DEFERRED = "sentinelsat,openeo,pandas,reportlab.platypus,reportlab.graphics,matplotlib,jinja2"
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+def measure_imports(module: str) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Importa `module` en un intérprete nuevo y retorna {módulo: (propio_us, acumulado_us, nivel)}.
+    El nivel es la profundidad de anidamiento que reporta -X importtime.
+    Se quitan las variables DB_*: la app debe importarse igual que en un checkout limpio o en CI,
+    sin configuración de Postgres.
+    """
+    env = {name: value for name, value in os.environ.items() if not name.startswith("DB_")}
+    env["PYTHONPATH"] = SRC_DIR + os.pathsep + os.environ.get("PYTHONPATH", "")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        # -X importtime llena stderr; solo interesa el traceback
+        error = "\n".join(line for line in result.stderr.splitlines() if not line.startswith("import time:"))
+        raise RuntimeError(
+            f"No se pudo importar {module} sin variables DB_* "
+            f"(¿se crea una conexión al importar?):\n{error[-2000:]}"
+        )
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return imports
+
+def deferred_violations(imports: Dict[str, Tuple[int, int, int]], deferred: List[str]) -> List[str]:
+    """
+    Paquetes diferidos que se importaron al arrancar
+    """
+    return [
+        prefix for prefix in deferred
+        if any(name == prefix or name.startswith(prefix + ".") for name in imports)
+    ]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Presupuesto de tiempo de importación en frío")
+    parser.add_argument("--module", default=os.getenv("IMPORT_TIME_MODULE", "api.App"))
+    # Incluye SQLAlchemy (~350 ms): las rutas de autenticación se montan al arrancar
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_TIME_BUDGET_MS", 1200)))
+    parser.add_argument("--runs", type=int, default=3, help="Se toma la mejor de N ejecuciones")
+    parser.add_argument("--top", type=int, default=15, help="Módulos más costosos a mostrar")
+    parser.add_argument("--deferred", default=os.getenv("IMPORT_TIME_DEFERRED", DEFAULT_DEFERRED))
+    args = parser.parse_args(argv)
+
+    best = None
+    for _ in range(max(args.runs, 1)):
+        imports = measure_imports(args.module)
+        if best is None or imports[args.module][1] < best[args.module][1]:
+            best = imports
+
+    total_ms = best[args.module][1] / 1000
+    print(f"⏱️ Importar {args.module}: {total_ms:.0f} ms (presupuesto: {args.budget_ms:.0f} ms)")
+
+    # Dependencias directas del módulo y las que estas cargan por primera vez
+    heaviest = sorted(
+        ((cumulative, name) for name, (_, cumulative, level) in best.items() if 1 <= level <= 3),
+        reverse=True
+    )[:args.top]
+    for cumulative, name in heaviest:
+        print(f"   {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    violations = deferred_violations(best, [name.strip() for name in args.deferred.split(",") if name.strip()])
+    if violations:
+        failed = True
+        print(f"❌ Dependencias que deben importarse de forma diferida: {', '.join(violations)}")
+
+    if total_ms > args.budget_ms:
+        failed = True
+        print(f"❌ Se superó el presupuesto de importación por {total_ms - args.budget_ms:.0f} ms")
+
+    if not failed:
+        print("✅ Tiempo de importación dentro del presupuesto")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
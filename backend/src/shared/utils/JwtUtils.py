@@ -1,35 +1,57 @@
 import jwt
-import uuid
-from datetime import datetime, timedelta
+import re
+from datetime import datetime, timedelta, timezone
 import os
 from typing import Dict, Any
+from dotenv import load_dotenv
+from infrastructure.model.enum.RolesEnum import RoleEnum
+
+load_dotenv()
 
 # Configuración desde variables de entorno
-ISSUER = os.getenv("JWT_ISSUER")
-SECRET = os.getenv("JWT_SECRET" )  
-EXPIRES_IN = os.getenv("JWT_EXPIRES_IN")
-
-def generate_token(user: Dict[str, Any]) -> str:
-   
-    now = datetime.utcnow()
-    
+ISSUER = os.getenv("JWT_ISSUER", "ecoshield360")
+SECRET = os.getenv("JWT_SECRET" )
+EXPIRES_IN = os.getenv("JWT_EXPIRES_IN", "1h")
+
+_DURATION = re.compile(r"^(\d+)\s*([smhd]?)$")
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+def parse_expires_in(value: str) -> timedelta:
+    """
+    Duraciones como "3600", "30m", "1h" o "7d"
+    """
+    match = _DURATION.match(value.strip().lower())
+    if not match:
+        raise ValueError(f"JWT_EXPIRES_IN inválido: {value}")
+    amount, unit = match.groups()
+    return timedelta(seconds=int(amount) * _UNITS[unit])
+
+def generate_token(user) -> str:
+    """
+    Firma un token para un usuario del modelo User o una proyección con `role` como RoleEnum
+    """
+    now = datetime.now(timezone.utc)
+    role = user.role
+    if role is not None and not isinstance(role, RoleEnum):
+        role = role.name
+
     payload = {
-        "sub": user["username"],
-        "userId": str(user["_id"]),
-        "fullName": f"{user['firstName']} {user['lastName']}",
-        "isVerified": user["isVerified"],
-        "email": user["email"],
-        "authorithies": user.role.name if user.role else "USER",
+        "sub": user.username,
+        "userId": str(user.id),
+        "fullName": f"{user.first_name} {user.last_name}",
+        "isVerified": bool(user.is_verified),
+        "email": user.email,
+        "authorithies": role.value if role else "USER",
         "iat": int(now.timestamp()),
         "nbf": int(now.timestamp()),
+        "exp": int((now + parse_expires_in(EXPIRES_IN)).timestamp()),
         "iss": ISSUER
     }
 
     return jwt.encode(
         payload,
         SECRET,
-        algorithm="HS256",
-        headers={"exp": int((now + timedelta(hours=1)).timestamp())} if EXPIRES_IN == "1h" else None
+        algorithm="HS256"
     )
 
 def verify_token(token: str) -> Dict[str, Any]:
@@ -45,4 +67,4 @@ def verify_token(token: str) -> Dict[str, Any]:
     except jwt.ExpiredSignatureError:
         raise ValueError("Token expirado")
     except jwt.InvalidTokenError as e:
-        raise ValueError(f"Token inválido: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Token inválido: {str(e)}")
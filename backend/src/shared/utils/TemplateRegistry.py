@@ -0,0 +1,64 @@
+#TemplateRegistry.py
+import os
+import time
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LAYOUTS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "layouts"))
+
+class TemplateRegistry:
+    """
+    Plantillas Jinja de shared/layouts compiladas una sola vez (al arrancar o al primer uso).
+    En producción no se vuelve a leer el disco; en desarrollo (APP_ENV distinto de production)
+    una plantilla modificada se recompila en el siguiente render.
+    """
+    def __init__(self, directory: str = LAYOUTS_DIR):
+        self.directory = directory
+        self.auto_reload = os.getenv("APP_ENV", "development").lower() != "production"
+        self._environment = None
+        self.load_ms: Optional[float] = None
+        self.renders = 0
+
+    def load(self):
+        """
+        Compila todas las plantillas; jinja2 solo se importa aquí para no cargarlo al importar la app
+        """
+        if self._environment is not None:
+            return
+
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+        started = time.perf_counter()
+        environment = Environment(
+            loader=FileSystemLoader(self.directory),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=self.auto_reload,
+            cache_size=-1
+        )
+        for name in environment.list_templates(extensions=["html"]):
+            environment.get_template(name)
+
+        self._environment = environment
+        self.load_ms = (time.perf_counter() - started) * 1000
+        print(f"🧩 Plantillas compiladas: {len(environment.cache)} en {self.load_ms:.1f} ms (recarga: {self.auto_reload})")
+
+    def get(self, name: str):
+        if self._environment is None:
+            self.load()
+        return self._environment.get_template(name)
+
+    def render(self, template_name: str, /, **context: Any) -> str:
+        self.renders += 1
+        return self.get(template_name).render(**context)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self._environment is not None,
+            "templates": len(self._environment.cache) if self._environment else 0,
+            "autoReload": self.auto_reload,
+            "loadMs": self.load_ms,
+            "renders": self.renders
+        }
+
+template_registry = TemplateRegistry()
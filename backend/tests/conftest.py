@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos se importan desde backend/src, igual que al ejecutar Server.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
@@ -0,0 +1,60 @@
+import asyncio
+
+import numpy as np
+
+from api.dto.AirQuality.AirQualityDto import CoordinatesRequest
+from core.service.AirQualityService import AirQualityService
+
+
+def test_vectorized_aqi_matches_scalar_path():
+    service = AirQualityService()
+    rng = np.random.default_rng(7)
+    # Valores típicos, ceros, negativos y lo bastante altos para saturar en 500
+    densities = np.concatenate([
+        rng.uniform(0, 0.0002, size=(200, 4)),
+        rng.uniform(-0.00005, 0.002, size=(200, 4)),
+        np.zeros((1, 4))
+    ])
+
+    aqi = service._calculate_air_quality_index_batch(*densities.T)
+    categories = service._get_air_quality_category_batch(aqi)
+    recommendations = service._get_health_recommendations_batch(aqi)
+
+    for row, value, category, recommendation in zip(densities.tolist(), aqi.tolist(), categories.tolist(), recommendations.tolist()):
+        assert value == service._calculate_air_quality_index(*row)
+        assert category == service._get_air_quality_category(value)
+        assert recommendation == service._get_health_recommendations(value)
+
+
+def test_vectorized_categories_at_the_limits():
+    service = AirQualityService()
+    aqi = np.arange(0, 501)
+
+    assert service._get_air_quality_category_batch(aqi).tolist() == [service._get_air_quality_category(v) for v in range(501)]
+
+
+def test_batch_keeps_order_and_queries_each_tile_once(monkeypatch):
+    service = AirQualityService()
+    service.use_mock_data = True
+    calls = []
+    summary = service.get_air_quality_summary
+
+    async def get_air_quality_summary(coordinates):
+        calls.append(coordinates)
+        return await summary(coordinates)
+
+    monkeypatch.setattr(service, "get_air_quality_summary", get_air_quality_summary)
+    points = [
+        CoordinatesRequest(lat=4.6100, lon=-74.0800),
+        CoordinatesRequest(lat=6.2500, lon=-75.5600),
+        CoordinatesRequest(lat=4.6101, lon=-74.0801)
+    ]
+
+    results = asyncio.run(service.get_air_quality_summary_batch(points))
+
+    assert len(calls) == 2
+    assert [r.coordinates for r in results] == [{"lat": p.lat, "lon": p.lon} for p in points]
+    for result in results:
+        expected = service._calculate_air_quality_index(result.no2_density, result.co_density, result.o3_density, result.so2_density)
+        assert result.air_quality_index == expected
+        assert result.air_quality_category == service._get_air_quality_category(expected)
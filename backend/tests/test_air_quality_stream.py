@@ -0,0 +1,24 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from api.App import app
+from api.dto.AirQuality.AirQualityDto import CoordinatesRequest, DEFAULT_RADIUS_KM
+from api.routes.AirQualityRouter import air_quality_controller
+
+
+def test_null_radius_uses_default():
+    assert CoordinatesRequest(lat=1, lon=2, radius=None).radius == DEFAULT_RADIUS_KM
+
+
+def test_stream_with_null_radius_returns_every_line(monkeypatch):
+    monkeypatch.setattr(air_quality_controller.air_quality_service, "use_mock_data", True)
+    points = [{"lat": 4.6, "lon": -74.1, "radius": None}, {"lat": 6.2, "lon": -75.6}]
+
+    with TestClient(app) as client:
+        response = client.post("/api/v1/air-quality/summary/stream", json={"points": points})
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert len(lines) == len(points)
+    assert all(line["analysis_radius_km"] == DEFAULT_RADIUS_KM for line in lines)
@@ -0,0 +1,42 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.App import app
+from core.exceptions.EmailAlreadyExistsException import EmailAlreadyExistsException
+from core.exceptions.UsernameAlreadyExistsException import UsernameAlreadyExistsException
+from core.service.UserService import UserService
+from infrastructure.config.Db import get_db
+
+REGISTER_REQUEST = {
+    "first_name": "Juan",
+    "last_name": "Pérez",
+    "username": "juanp",
+    "email": "juan@gmail.com",
+    "password": "P@ssw0rd123"
+}
+
+
+@pytest.fixture
+def client():
+    # Sin base de datos: UserService.create se reemplaza en cada prueba
+    async def no_db():
+        yield None
+
+    app.dependency_overrides[get_db] = no_db
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.mark.parametrize("exception", [UsernameAlreadyExistsException, EmailAlreadyExistsException])
+def test_register_duplicate_returns_http_error(client, monkeypatch, exception):
+    async def create(self, user_data, verification_token):
+        raise exception()
+
+    monkeypatch.setattr(UserService, "create", create)
+    response = client.post("/api/v1/auth/register", json=REGISTER_REQUEST)
+
+    assert response.status_code == exception().status_code
+    assert response.json() == {"detail": exception().message}
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+
+from api.dto.AirQuality.AirQualityDto import CoordinatesRequest
+from core.helpers.CircuitBreaker import CircuitBreaker, CircuitState
+from core.service.AirQualityService import AirQualityService
+from infrastructure.services.CopernicusSessionManager import CopernicusSessionManager
+
+
+def make_service(providers, deadline=0.05, hedge_delay=0.01, mode="hedge"):
+    service = AirQualityService()
+    # Los nombres deben ser los de los proveedores reales: cada uno tiene su circuit breaker
+    service.providers = {name: (name, provider) for name, provider in providers.items()}
+    service.provider_order = list(providers)
+    service.provider_deadline = deadline
+    service.hedge_delay = hedge_delay
+    service.provider_mode = mode
+    return service
+
+
+async def hang(coordinates):
+    await asyncio.sleep(3600)
+
+
+def coordinates():
+    return CoordinatesRequest(lat=4.6, lon=-74.1, radius=10)
+
+
+def test_cancelled_before_slow_threshold_is_not_counted():
+    breaker = CircuitBreaker("p", slow_call_seconds=10)
+    breaker.record_cancelled(0.5)
+
+    assert breaker.total_calls == 0
+    assert breaker.avg_latency == 0.5
+
+
+def test_slow_or_timed_out_cancellations_count_as_failures():
+    breaker = CircuitBreaker("p", min_calls=2, slow_call_seconds=10)
+    breaker.record_cancelled(12.0)
+    breaker.record_cancelled(0.5, timed_out=True)
+
+    assert breaker.total_failures == 2
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_timed_out_half_open_probe_reopens_circuit():
+    breaker = CircuitBreaker("p", min_calls=1, open_seconds=0)
+    breaker.record_failure(0.1)
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    breaker.record_cancelled(0.1, timed_out=True)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_providers_that_always_hang_open_their_circuits():
+    service = make_service({"sentinelsat": hang, "cdse": hang, "openeo": hang})
+
+    async def run():
+        for _ in range(6):
+            assert await service._race_providers(coordinates(), service._ordered_providers()) is None
+
+    asyncio.run(run())
+
+    for breaker in service.breakers.values():
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.total_failures >= breaker.min_calls
+        assert breaker.last_error.startswith("Tiempo límite agotado")
+
+
+def test_fast_hedge_loser_is_not_penalized():
+    async def fast(coordinates):
+        await asyncio.sleep(0.02)
+        return "data"
+
+    service = make_service({"sentinelsat": hang, "cdse": fast}, deadline=5)
+    result = asyncio.run(service._race_providers(coordinates(), ["sentinelsat", "cdse"]))
+
+    assert result == "data"
+    assert service.breakers["sentinelsat"].total_calls == 0
+    assert service.breakers["cdse"].total_successes == 1
+
+
+def test_abandoned_sdk_calls_hold_their_thread_and_reject_new_calls():
+    sessions = CopernicusSessionManager(None, "user", "password", "http://token")
+    sessions.sdk_workers = 1
+    release = threading.Event()
+
+    async def run():
+        blocked = asyncio.create_task(sessions._run_sdk(release.wait, 5))
+        await asyncio.sleep(0.05)
+        blocked.cancel()
+        await asyncio.gather(blocked, return_exceptions=True)
+
+        # El hilo sigue ocupado por la llamada cancelada
+        assert sessions.sdk_in_flight == 1
+        assert sessions.sdk_abandoned == 1
+        try:
+            await sessions._run_sdk(time.sleep, 0)
+            raise AssertionError("se esperaba el rechazo")
+        except RuntimeError:
+            pass
+
+        release.set()
+        for _ in range(100):
+            if sessions.sdk_in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert await sessions._run_sdk(lambda: "ok") == "ok"
+        await sessions.close()
+
+    asyncio.run(run())
+    assert sessions.sdk_rejected == 1
+
+
+def test_deadline_does_not_leak_half_open_probe():
+    async def fast(coordinates):
+        return "data"
+
+    # El retardo de cobertura vence después del tiempo límite: no debe lanzarse ningún proveedor más
+    service = make_service({"sentinelsat": hang, "cdse": fast}, deadline=0.05, hedge_delay=0.1)
+    probe = service.breakers["cdse"]
+    probe.min_calls = 1
+    probe.open_seconds = 0
+    probe.record_failure(0.1)
+    assert probe.state == CircuitState.OPEN
+
+    assert asyncio.run(service._race_providers(coordinates(), ["sentinelsat", "cdse"])) is None
+
+    # El cupo de prueba sigue libre: la siguiente consulta puede probar el proveedor
+    assert probe.allow_request()
+    assert probe.state == CircuitState.HALF_OPEN
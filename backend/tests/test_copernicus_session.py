@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+from infrastructure.services import CopernicusSessionManager as module
+from infrastructure.services.CopernicusSessionManager import CopernicusSessionManager
+
+
+class FakeHttpClient:
+    def __init__(self, expires_in):
+        self.expires_in = expires_in
+        self.posts = 0
+
+    async def post(self, url, data=None):
+        self.posts += 1
+        return SimpleNamespace(
+            status_code=200,
+            raise_for_status=lambda: None,
+            json=lambda: {"access_token": f"token-{self.posts}", "expires_in": self.expires_in}
+        )
+
+
+def test_refresh_margin_longer_than_token_lifetime(monkeypatch):
+    monkeypatch.setenv("CDSE_TOKEN_REFRESH_MARGIN", "60")
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        if delay:
+            delays.append(delay)
+            raise asyncio.CancelledError
+        await real_sleep(0)
+
+    monkeypatch.setattr(module.asyncio, "sleep", sleep)
+
+    async def scenario():
+        http_client = FakeHttpClient(expires_in=30)
+        manager = CopernicusSessionManager(http_client, "user", "password", "https://cdse/token")
+        first = await manager.get_access_token()
+        second = await manager.get_access_token()
+        # Deja correr el primer ciclo de la renovación proactiva
+        await asyncio.sleep(0)
+        await manager.close()
+        return first, second, http_client.posts
+
+    first, second, posts = asyncio.run(scenario())
+
+    # El token sigue vigente: no se pide otro en cada llamada ni cada segundo
+    assert first == second == "token-1"
+    assert posts == 1
+    assert len(delays) == 1 and 14 < delays[0] <= 15
@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.App import app
+from shared.utils import JwtUtils
+
+
+@pytest.fixture
+def token(monkeypatch):
+    monkeypatch.setattr(JwtUtils, "SECRET", "health-test-secret-health-test-secret")
+    user = SimpleNamespace(
+        id=1, username="ana", first_name="Ana", last_name="Pérez",
+        email="ana@example.com", is_verified=True, role=None
+    )
+    return JwtUtils.generate_token(user)
+
+
+@pytest.mark.parametrize("path", ["/db/stats", "/password-hasher/stats", "/auth/stats", "/mail/stats", "/templates/stats"])
+def test_health_stats_require_a_token(path):
+    with TestClient(app) as client:
+        response = client.get(f"/api/v1/health{path}")
+
+    assert response.status_code == 401
+
+
+def test_health_stats_with_a_token(token):
+    with TestClient(app) as client:
+        response = client.get("/api/v1/health/db/stats", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert "initialized" in response.json()
@@ -0,0 +1,32 @@
+from shared.utils import ImportTimeBudget
+from shared.utils.ImportTimeBudget import DEFAULT_DEFERRED, deferred_violations, main, measure_imports
+
+
+def test_measure_imports_parses_importtime_output():
+    imports = measure_imports("json")
+
+    self_us, cumulative_us, level = imports["json"]
+    assert level == 0
+    assert cumulative_us >= self_us >= 0
+    assert imports["json.decoder"][2] >= 1
+
+
+def test_deferred_violations_match_whole_package_names():
+    imports = {"pandas.core": (1, 1, 2), "reportlab.graphics.shapes": (1, 1, 3), "openeo_extra": (1, 1, 1)}
+
+    assert deferred_violations(imports, ["pandas", "reportlab.graphics", "openeo", "jinja2"]) == ["pandas", "reportlab.graphics"]
+
+
+def test_app_does_not_import_deferred_dependencies():
+    imports = measure_imports("api.App")
+
+    assert deferred_violations(imports, DEFAULT_DEFERRED.split(",")) == []
+
+
+def test_main_fails_on_budget_or_deferred_import(monkeypatch):
+    imports = {"api.App": (100, 500_000, 0), "jinja2": (10, 10_000, 1)}
+    monkeypatch.setattr(ImportTimeBudget, "measure_imports", lambda module: imports)
+
+    assert main(["--runs", "1", "--budget-ms", "1000", "--deferred", "matplotlib"]) == 0
+    assert main(["--runs", "1", "--budget-ms", "100", "--deferred", "matplotlib"]) == 1
+    assert main(["--runs", "1", "--budget-ms", "1000", "--deferred", "jinja2"]) == 1
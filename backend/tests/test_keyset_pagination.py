@@ -0,0 +1,179 @@
+import asyncio
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.exceptions.InvalidCursorException import InvalidCursorException
+from core.helpers.Cursor import decode_cursor, encode_cursor
+from core.helpers.Params import create_params
+from infrastructure.config.Base import Base
+from infrastructure.model.Role import Role
+from infrastructure.model.User import User
+from infrastructure.model.enum.RolesEnum import RoleEnum
+from infrastructure.repository.Pagination import keyset_page
+from infrastructure.repository.UserRepository import UserRepository
+
+metadata = MetaData()
+readings = Table(
+    "readings", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("score", Integer, nullable=False),
+    Column("station", String, nullable=False)
+)
+
+
+async def with_session(seed, test):
+    # SQLite en memoria: admite comparación de tuplas, como Postgres
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(metadata.create_all)
+            await connection.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as db:
+            await seed(db)
+            await db.commit()
+            return await test(db)
+    finally:
+        await engine.dispose()
+
+
+async def walk_pages(fetch, params):
+    pages = []
+    while True:
+        registers, next_cursor = await fetch(params)
+        pages.append(registers)
+        if next_cursor is None:
+            return pages
+        params = params.with_cursor(next_cursor)
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor([3, "abc"]), 2) == [3, "abc"]
+
+
+@pytest.mark.parametrize("cursor", ["%%%", encode_cursor([1]), encode_cursor({"id": 1}), "bm90LWpzb24"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor, 2)
+
+
+def test_keyset_walks_every_row_once_with_ties_on_sort_key():
+    # Muchos empates en score: el id desempata y ninguna fila se repite ni se salta entre páginas
+    rows = [{"id": i, "score": i % 4, "station": f"s{i}"} for i in range(1, 24)]
+
+    async def seed(db):
+        await db.execute(insert(readings), rows)
+
+    async def test(db):
+        order_columns = [readings.c.score, readings.c.id]
+        query = select(readings.c.id, readings.c.score)
+        pages = await walk_pages(lambda params: keyset_page(db, query, order_columns, params), create_params(page_size=5, cursor=""))
+        return [[(row.score, row.id) for row in page] for page in pages]
+
+    pages = asyncio.run(with_session(seed, test))
+
+    walked = [key for page in pages for key in page]
+    assert walked == sorted((row["score"], row["id"]) for row in rows)
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+
+
+def test_keyset_last_page_has_no_next_cursor_when_rows_fill_it_exactly():
+    async def seed(db):
+        await db.execute(insert(readings), [{"id": i, "score": 0, "station": "s"} for i in range(1, 11)])
+
+    async def test(db):
+        query = select(readings.c.id)
+        return await walk_pages(lambda params: keyset_page(db, query, [readings.c.id], params), create_params(page_size=5, cursor=""))
+
+    pages = asyncio.run(with_session(seed, test))
+
+    # La fila extra de la consulta evita una última página vacía
+    assert [len(page) for page in pages] == [5, 5]
+
+
+def seed_users(count):
+    async def seed(db):
+        db.add(Role(id=1, name=RoleEnum.USER))
+        for i in range(1, count + 1):
+            db.add(User(
+                id=i,
+                first_name="Ana" if i % 2 else "Luis",
+                last_name=f"Perez {i}",
+                username=f"user{i:02d}",
+                email=f"user{i}@example.com",
+                password="hash",
+                role_id=1
+            ))
+    return seed
+
+
+def test_user_repository_keyset_matches_offset_order():
+    async def test(db):
+        repository = UserRepository(db)
+        keyset_ids = []
+        params = create_params(page_size=4, cursor="")
+        while True:
+            pager = await repository.find_page(params)
+            keyset_ids += [user.id for user in pager.registers]
+            assert pager.total is None
+            if not pager.has_next_page:
+                break
+            params = params.with_cursor(pager.next_cursor)
+
+        offset_ids = []
+        for page_index in range(1, 5):
+            pager = await repository.find_page(create_params(page_size=4, page_index=page_index))
+            offset_ids += [user.id for user in pager.registers]
+            assert pager.total == 13
+        return keyset_ids, offset_ids
+
+    keyset_ids, offset_ids = asyncio.run(with_session(seed_users(13), test))
+
+    assert keyset_ids == offset_ids == list(range(1, 14))
+
+
+def test_user_repository_keyset_applies_search():
+    async def test(db):
+        repository = UserRepository(db)
+        first = await repository.find_page(create_params(page_size=3, search="luis", cursor=""))
+        second = await repository.find_page(create_params(page_size=3, search="luis", cursor=first.next_cursor))
+        return [user.id for user in first.registers], [user.id for user in second.registers], second.next_cursor
+
+    first_ids, second_ids, next_cursor = asyncio.run(with_session(seed_users(10), test))
+
+    assert first_ids == [2, 4, 6]
+    assert second_ids == [8, 10]
+    assert next_cursor is None
+
+
+@pytest.mark.parametrize("values", [["1", 2], [1, True], [None, 2], [1, [2]], [1.5, 2]])
+def test_cursor_with_wrong_value_types_is_rejected(values):
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(encode_cursor(values), 2, [int, int])
+
+
+def test_keyset_rejects_forged_cursor_before_querying():
+    async def seed(db):
+        await db.execute(insert(readings), [{"id": 1, "score": 0, "station": "s"}])
+
+    async def test(db):
+        forged = create_params(cursor=encode_cursor([0, "1 OR 1=1"]))
+        with pytest.raises(InvalidCursorException):
+            await keyset_page(db, select(readings.c.id), [readings.c.score, readings.c.id], forged)
+
+    asyncio.run(with_session(seed, test))
+
+
+def test_zero_page_size_returns_one_row_per_page():
+    async def seed(db):
+        await db.execute(insert(readings), [{"id": i, "score": 0, "station": "s"} for i in range(1, 4)])
+
+    async def test(db):
+        query = select(readings.c.id)
+        return await walk_pages(lambda params: keyset_page(db, query, [readings.c.id], params), create_params(page_size=0, cursor=""))
+
+    pages = asyncio.run(with_session(seed, test))
+
+    assert [[row.id for row in page] for page in pages] == [[1], [2], [3]]
@@ -0,0 +1,192 @@
+import asyncio
+import smtplib
+
+from infrastructure.config.mailConfig import MailConfig
+from infrastructure.services.MailQueue import MailJob, MailQueue
+from infrastructure.services.MailTransport import InMemoryMailTransport, SmtpTransport
+
+
+def message(to="ana@example.com"):
+    return MailConfig.build_message(to, "Asunto", "<b>Hola</b>")
+
+
+class FakeSmtp:
+    def __init__(self):
+        self.dropped = False
+        self.sent = []
+
+    def noop(self):
+        if self.dropped:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        return (250, b"OK")
+
+    def send_message(self, msg):
+        if self.dropped:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(msg)
+
+    def quit(self):
+        raise smtplib.SMTPServerDisconnected("closed")
+
+    def close(self):
+        pass
+
+
+class FlakyTransport(InMemoryMailTransport):
+    """Falla con un error temporal las primeras `failures` veces"""
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def send_batch(self, messages):
+        if self.failures > 0:
+            self.failures -= 1
+            return [smtplib.SMTPResponseException(451, b"try later")] * len(messages)
+        return super().send_batch(messages)
+
+
+def make_queue(monkeypatch, transport, **env):
+    defaults = {"MAIL_BATCH_WAIT_MS": "0", "MAIL_RETRY_BASE_DELAY": "0.01", "MAIL_SHUTDOWN_TIMEOUT": "1"}
+    for name, value in {**defaults, **env}.items():
+        monkeypatch.setenv(name, value)
+    return MailQueue(transport)
+
+
+def test_dropped_pooled_connection_is_replaced_before_sending(monkeypatch):
+    transport = SmtpTransport()
+    connections = []
+
+    def connect():
+        connections.append(FakeSmtp())
+        return connections[-1]
+
+    monkeypatch.setattr(transport, "_connect", connect)
+
+    assert transport.send_batch([message()]) == [None]
+    connections[0].dropped = True
+
+    assert transport.send_batch([message()]) == [None]
+    assert len(connections) == 2
+    assert len(connections[1].sent) == 1
+    assert transport.get_stats()["staleDiscarded"] == 1
+
+
+def test_batches_and_retries_temporary_errors(monkeypatch):
+    queue = make_queue(monkeypatch, FlakyTransport(failures=1))
+
+    async def run():
+        for index in range(30):
+            await queue.enqueue(message(f"user{index}@example.com"))
+        await asyncio.sleep(0.3)
+        await queue.close()
+
+    asyncio.run(run())
+    stats = queue.get_stats()
+    assert stats["sent"] == 30
+    assert stats["retried"] >= 1
+    assert stats["failed"] == stats["dropped"] == 0
+
+
+def test_permanent_errors_are_not_retried(monkeypatch):
+    class Rejecting(InMemoryMailTransport):
+        def send_batch(self, messages):
+            return [smtplib.SMTPRecipientsRefused({"x": (550, b"no such user")})] * len(messages)
+
+    queue = make_queue(monkeypatch, Rejecting())
+
+    async def run():
+        await queue.enqueue(message())
+        await asyncio.sleep(0.1)
+        await queue.close()
+
+    asyncio.run(run())
+    assert queue.failed == 1
+    assert queue.retried == 0
+
+
+def test_close_gives_waiting_retries_a_last_attempt(monkeypatch):
+    # El reintento quedaría esperando una hora; al apagar se intenta de inmediato
+    queue = make_queue(monkeypatch, FlakyTransport(failures=1), MAIL_RETRY_BASE_DELAY="3600")
+
+    async def run():
+        await queue.enqueue(message())
+        await asyncio.sleep(0.1)
+        assert queue.get_stats()["waitingRetry"] == 1
+        await queue.close()
+
+    asyncio.run(run())
+    assert queue.sent == 1
+    assert queue.dropped == 0
+
+
+def test_close_counts_mail_that_could_not_be_sent(monkeypatch):
+    queue = make_queue(monkeypatch, FlakyTransport(failures=10), MAIL_RETRY_BASE_DELAY="3600")
+
+    async def run():
+        await queue.enqueue(message())
+        await asyncio.sleep(0.1)
+        await queue.close()
+
+    asyncio.run(run())
+    assert queue.sent == 0
+    assert queue.dropped == 1
+
+
+def test_connection_errors_are_retried_even_with_5xx(monkeypatch):
+    class LoginFailsOnce(InMemoryMailTransport):
+        def __init__(self):
+            super().__init__()
+            self.attempts = 0
+
+        def send_batch(self, messages):
+            # Lo que lanza SmtpTransport cuando el login falla al abrir la conexión
+            self.attempts += 1
+            if self.attempts == 1:
+                raise smtplib.SMTPAuthenticationError(535, b"temporary auth failure")
+            return super().send_batch(messages)
+
+    queue = make_queue(monkeypatch, LoginFailsOnce())
+
+    async def run():
+        for index in range(3):
+            await queue.enqueue(message(f"user{index}@example.com"))
+        await asyncio.sleep(0.2)
+        await queue.close()
+
+    asyncio.run(run())
+    assert queue.sent == 3
+    assert queue.failed == 0
+
+
+def test_failed_login_closes_the_connection(monkeypatch):
+    closed = []
+
+    class RejectingLogin(FakeSmtp):
+        def __init__(self, *args, **kwargs):
+            super().__init__()
+
+        def login(self, username, password):
+            raise smtplib.SMTPAuthenticationError(535, b"bad credentials")
+
+        def close(self):
+            closed.append(self)
+
+    monkeypatch.setattr(smtplib, "SMTP", RejectingLogin)
+    transport = SmtpTransport()
+    transport.use_ssl = transport.use_tls = False
+    transport.username, transport.password = "user", "secret"
+
+    try:
+        transport.send_batch([message()])
+        raise AssertionError("se esperaba el error de login")
+    except smtplib.SMTPAuthenticationError:
+        pass
+    assert len(closed) == 1
+    assert transport.connections_opened == 0
+
+
+def test_retry_after_close_is_dropped(monkeypatch):
+    queue = make_queue(monkeypatch, InMemoryMailTransport())
+    asyncio.run(queue._requeue(MailJob(message()), 0))
+
+    assert queue.dropped == 1
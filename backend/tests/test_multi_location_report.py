@@ -0,0 +1,81 @@
+import asyncio
+import os
+import re
+
+from fastapi.testclient import TestClient
+
+from api.App import app
+from api.dto.AirQuality.AirQualityDto import CoordinatesRequest
+from api.routes.AirQualityRouter import air_quality_controller
+from core.service.AirQualityService import AirQualityService
+from core.service.ReportRenderer import _StreamedStory, render_multi_location_pdf
+
+
+def make_locations(count):
+    service = AirQualityService()
+    points = [CoordinatesRequest(lat=4 + i * 0.01, lon=-74) for i in range(count)]
+
+    async def build():
+        return [await service._get_mock_air_quality_data(point) for point in points]
+
+    return asyncio.run(build())
+
+
+def test_streamed_story_only_buffers_the_lookahead():
+    produced = []
+
+    def flowables():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    story = _StreamedStory(flowables(), lookahead=4)
+
+    assert story[0] == 0
+    assert len(produced) == 4
+    # Platypus consume la story quitando elementos del inicio
+    consumed = []
+    while len(story):
+        consumed.append(story.pop(0))
+    assert consumed == list(range(100))
+
+
+def test_multi_location_pdf_has_one_page_per_site(tmp_path):
+    locations = make_locations(45)
+    path = str(tmp_path / "multi.pdf")
+
+    size = render_multi_location_pdf(locations, path, "Consolidado", include_charts=True, chart_backend="vector")
+
+    with open(path, "rb") as file:
+        content = file.read()
+    assert size == len(content)
+    assert content.startswith(b"%PDF")
+    # Resumen (45 filas en tablas de 40) y una página por sitio
+    assert len(re.findall(rb"/Type /Page\b", content)) >= 1 + len(locations)
+
+
+def test_multi_location_route_streams_and_deletes_the_file(monkeypatch, tmp_path):
+    service = air_quality_controller.air_quality_service
+    monkeypatch.setattr(service, "multi_report_dir", str(tmp_path))
+    locations = [location.model_dump(mode="json") for location in make_locations(2)]
+
+    with TestClient(app) as client:
+        response = client.post("/api/v1/air-quality/report/multi", json={"locations": locations, "include_charts": False})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+    assert int(response.headers["content-length"]) == len(response.content)
+    assert os.listdir(tmp_path) == []
+
+
+def test_multi_location_route_rejects_too_many_sites(monkeypatch):
+    monkeypatch.setattr(air_quality_controller, "multi_report_max_locations", 1)
+    locations = [location.model_dump(mode="json") for location in make_locations(2)]
+
+    with TestClient(app) as client:
+        empty = client.post("/api/v1/air-quality/report/multi", json={"locations": []})
+        too_many = client.post("/api/v1/air-quality/report/multi", json={"locations": locations})
+
+    assert empty.status_code == 400
+    assert too_many.status_code == 400
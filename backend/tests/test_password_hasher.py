@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.exceptions.PasswordHasherSaturatedException import PasswordHasherSaturatedException
+from infrastructure.services import PasswordHasher as module
+from infrastructure.services.PasswordHasher import PasswordHasher
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    # Costo mínimo para que las pruebas sean rápidas; el contexto se recrea con él
+    monkeypatch.setattr(module, "BCRYPT_ROUNDS", 5)
+    monkeypatch.setattr(module, "_pwd_context", None)
+    return PasswordHasher()
+
+
+def test_verify_and_update_rehashes_other_costs(hasher):
+    from passlib.hash import bcrypt
+    old_hash = bcrypt.using(rounds=4).hash("secreto")
+
+    async def scenario():
+        wrong = await hasher.verify_and_update("otro", old_hash)
+        rehashed = await hasher.verify_and_update("secreto", old_hash)
+        current = await hasher.verify_and_update("secreto", rehashed[1])
+        await hasher.close()
+        return wrong, rehashed, current
+
+    wrong, (valid, new_hash), current = asyncio.run(scenario())
+
+    assert wrong == (False, None)
+    assert valid and new_hash.startswith("$2b$05$")
+    assert current == (True, None)
+    assert hasher.rehashed == 1
+    assert hasher.completed == 3
+
+
+def test_saturated_pool_rejects_new_work(hasher):
+    hasher.max_workers = 1
+    hasher.max_queue = 1
+    release = threading.Event()
+
+    async def scenario():
+        blocked = [asyncio.ensure_future(hasher._submit(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherSaturatedException) as error:
+            await hasher.hash("secreto")
+        stats = hasher.get_stats()
+        release.set()
+        await asyncio.gather(*blocked)
+        await hasher.close()
+        return error.value, stats
+
+    error, stats = asyncio.run(scenario())
+
+    assert error.status_code == 503
+    assert error.retry_after == hasher.retry_after
+    assert stats["inFlight"] == 2 and stats["queued"] == 1
+    assert hasher.rejected == 1
@@ -0,0 +1,63 @@
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from infrastructure.services.RenderPool import RenderPool
+
+
+def render(crash: bool) -> str:
+    # Se ejecuta en el proceso hijo
+    if crash:
+        os._exit(1)
+    return "pdf"
+
+
+def render_crash_once(marker: str) -> str:
+    # Simula un fallo puntual: el proceso muere solo la primera vez
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "pdf"
+
+
+def make_pool(monkeypatch):
+    monkeypatch.setenv("REPORT_RENDER_WORKERS", "1")
+    return RenderPool()
+
+
+def test_pool_recovers_after_a_worker_dies(monkeypatch):
+    pool = make_pool(monkeypatch)
+
+    async def run():
+        await pool.start()
+        # El trabajo que tumba al proceso falla también en su único reintento
+        with pytest.raises(BrokenProcessPool):
+            await pool.submit(render, True)
+        result = await pool.submit(render, False)
+        await pool.close()
+        return result
+
+    assert asyncio.run(run()) == "pdf"
+    assert pool.restarts == 2
+    assert pool.get_stats()["completed"] == 1
+    assert pool.get_stats()["failed"] == 1
+
+
+def test_jobs_caught_in_the_crash_are_retried(monkeypatch, tmp_path):
+    pool = make_pool(monkeypatch)
+
+    async def run():
+        await pool.start()
+        # El segundo trabajo espera en la cola del executor cuando el proceso muere
+        results = await asyncio.gather(
+            pool.submit(render_crash_once, str(tmp_path / "crashed")),
+            pool.submit(render, False)
+        )
+        await pool.close()
+        return results
+
+    assert asyncio.run(run()) == ["pdf", "pdf"]
+    assert pool.restarts == 1
+    assert (pool.completed, pool.failed) == (2, 0)
@@ -0,0 +1,95 @@
+import os
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.App import app
+from api.controller.AirQualityController import AirQualityController
+from infrastructure.services.ReportCache import ReportCache
+
+REPORT_REQUEST = {
+    "air_quality_data": {
+        "coordinates": {"lat": 4.6, "lon": -74.1},
+        "timestamp": "2026-01-01T12:00:00",
+        "no2_density": 0.00012,
+        "air_quality_index": 42,
+        "analysis_radius_km": 5.0
+    },
+    "report_title": "Prueba"
+}
+
+
+def make_cache(monkeypatch, directory, disk_bytes=1024):
+    monkeypatch.setenv("REPORT_CACHE_DIR", str(directory))
+    monkeypatch.setenv("REPORT_CACHE_DISK_BYTES", str(disk_bytes))
+    return ReportCache()
+
+
+def test_content_key_ignores_key_order():
+    assert ReportCache.content_key({"a": 1, "b": [1, 2]}) == ReportCache.content_key({"b": [1, 2], "a": 1})
+    assert ReportCache.content_key({"a": 1}) != ReportCache.content_key({"a": 2})
+
+
+def test_report_cache_miss_then_memory_and_disk_hits(monkeypatch, tmp_path):
+    async def scenario():
+        cache = make_cache(monkeypatch, tmp_path)
+        miss = await cache.get("k1")
+        await cache.set("k1", b"pdf")
+        memory_hit = await cache.get("k1")
+
+        # Otro proceso (otra instancia) encuentra el reporte en disco
+        other = make_cache(monkeypatch, tmp_path)
+        disk_hit = await other.get("k1")
+        return miss, memory_hit, disk_hit, other.disk_hits
+
+    assert asyncio.run(scenario()) == (None, b"pdf", b"pdf", 1)
+
+
+def test_report_cache_evicts_oldest_files_over_disk_budget(monkeypatch, tmp_path):
+    async def scenario():
+        cache = make_cache(monkeypatch, tmp_path, disk_bytes=250)
+        for age, key in enumerate(("old", "mid")):
+            await cache.set(key, b"x" * 100)
+            # mtime explícito: escrituras seguidas pueden compartir marca de tiempo
+            os.utime(tmp_path / f"{key}.bin", (1000 + age, 1000 + age))
+        await cache.set("new", b"x" * 100)
+        return sorted(path.name for path in tmp_path.iterdir()), cache.disk_evictions
+
+    files, evictions = asyncio.run(scenario())
+
+    assert files == ["mid.bin", "new.bin"]
+    assert evictions == 1
+
+
+@pytest.mark.parametrize("if_none_match, matches", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"old", "abc"', True),
+    ("*", True),
+    ('"old"', False),
+    ("abc", False)
+])
+def test_etag_matches(if_none_match, matches):
+    assert AirQualityController._etag_matches(if_none_match, '"abc"') is matches
+
+
+def test_report_route_answers_304_for_current_etag():
+    headers = {"Accept": "text/csv"}
+    with TestClient(app) as client:
+        first = client.post("/api/v1/air-quality/report", json=REPORT_REQUEST, headers=headers)
+        etag = first.headers["etag"]
+        repeated = client.post("/api/v1/air-quality/report", json=REPORT_REQUEST, headers={**headers, "If-None-Match": etag})
+        changed = client.post(
+            "/api/v1/air-quality/report",
+            json={**REPORT_REQUEST, "report_title": "Otro"},
+            headers={**headers, "If-None-Match": etag}
+        )
+
+    assert first.status_code == 200
+    assert repeated.status_code == 304
+    assert repeated.content == b""
+    assert repeated.headers["etag"] == etag
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
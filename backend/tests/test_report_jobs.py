@@ -0,0 +1,121 @@
+import asyncio
+import os
+import time
+
+from api.dto.AirQuality.AirQualityDto import AirQualityData
+from infrastructure.services.ReportJobQueue import CeleryReportJobQueue, LocalReportJobQueue
+from infrastructure.services.ReportJobStore import ReportJobStore
+
+
+def make_store(tmp_path, monkeypatch, retention_hours="24"):
+    monkeypatch.setenv("REPORT_JOBS_DIR", str(tmp_path))
+    monkeypatch.setenv("REPORT_JOBS_RETENTION_HOURS", retention_hours)
+    return ReportJobStore()
+
+
+def age(store, job_id, seconds):
+    # Retrocede la fecha de modificación de los archivos del trabajo
+    past = time.time() - seconds
+    for name in os.listdir(store.directory):
+        if name.startswith(job_id):
+            os.utime(os.path.join(store.directory, name), (past, past))
+
+
+def sample_data():
+    return AirQualityData(
+        coordinates={"lat": 4.6, "lon": -74.1},
+        timestamp="2026-01-01T00:00:00",
+        no2_density=0.00001, co_density=0.00003, o3_density=0.0001,
+        so2_density=0.000005, ch4_density=0.00002, hcho_density=0.000004,
+        air_quality_index=42, air_quality_category="Buena",
+        health_recommendations="", data_source="test", analysis_radius_km=10
+    )
+
+
+def test_job_lifecycle(tmp_path, monkeypatch):
+    store = make_store(tmp_path, monkeypatch)
+    job = store.create("Reporte")
+    store.mark_running(job["job_id"])
+    store.mark_completed(job["job_id"], b"%PDF-1.4")
+
+    saved = store.get(job["job_id"])
+    assert saved["status"] == "COMPLETED"
+    with open(store.artifact_path(job["job_id"]), "rb") as file:
+        assert file.read() == b"%PDF-1.4"
+    assert store.get("../etc/passwd") is None
+
+
+def test_purge_removes_only_expired_jobs(tmp_path, monkeypatch):
+    store = make_store(tmp_path, monkeypatch, retention_hours="1")
+    old = store.create("viejo")
+    store.mark_completed(old["job_id"], b"pdf")
+    fresh = store.create("nuevo")
+    age(store, old["job_id"], 2 * 3600)
+
+    assert store.purge_expired() == 1
+    assert store.get(old["job_id"]) is None
+    assert not os.path.exists(store.artifact_path(old["job_id"]))
+    assert store.get(fresh["job_id"]) is not None
+
+
+def test_celery_backend_purges_periodically(tmp_path, monkeypatch):
+    store = make_store(tmp_path, monkeypatch, retention_hours="1")
+    monkeypatch.setenv("REPORT_JOBS_CLEANUP_INTERVAL", "0.05")
+    queue = CeleryReportJobQueue(store)
+
+    async def run():
+        await queue.start()
+        # Un trabajo que vence después del arranque también se elimina
+        job = store.create("viejo")
+        age(store, job["job_id"], 2 * 3600)
+        await asyncio.sleep(0.2)
+        await queue.close()
+        return job
+
+    job = asyncio.run(run())
+    assert store.get(job["job_id"]) is None
+
+
+def test_local_queue_renders_in_background(tmp_path, monkeypatch):
+    store = make_store(tmp_path, monkeypatch)
+
+    async def render(air_quality_data, report_title, include_charts):
+        return f"{report_title}:{include_charts}".encode()
+
+    async def run():
+        queue = LocalReportJobQueue(store, render)
+        await queue.start()
+        job = await queue.submit(sample_data(), "Reporte", include_charts=False)
+        await queue.close()
+        return job
+
+    job = asyncio.run(run())
+    assert store.get(job["job_id"])["status"] == "COMPLETED"
+    with open(store.artifact_path(job["job_id"]), "rb") as file:
+        assert file.read() == b"Reporte:False"
+
+
+def test_celery_job_payload_round_trips_to_the_worker(tmp_path, monkeypatch):
+    from core.service import ReportRenderer
+    from infrastructure.services.ReportJobTasks import render_report_job
+
+    store = make_store(tmp_path, monkeypatch)
+    queue = CeleryReportJobQueue(store)
+    rendered = []
+
+    class InlineTask:
+        # El worker de Celery recibe los mismos argumentos serializados
+        @staticmethod
+        def delay(*args):
+            render_report_job(*args)
+
+    def render(air_quality_data, report_title, include_charts):
+        rendered.append(air_quality_data)
+        return b"%PDF-1.4"
+
+    monkeypatch.setattr(queue, "task", InlineTask)
+    monkeypatch.setattr(ReportRenderer, "render_air_quality_pdf", render)
+    job = asyncio.run(queue.submit(sample_data(), "Reporte"))
+
+    assert rendered == [sample_data()]
+    assert store.get(job["job_id"])["status"] == "COMPLETED"
@@ -0,0 +1,65 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.App import app
+from api.controller.AirQualityController import AirQualityController
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, "pdf"),
+    ("*/*", "pdf"),
+    ("text/csv", "csv"),
+    ("application/json;q=0.5, text/html", "html"),
+    ("text/html;q=0.2, application/json;q=0.9", "json"),
+    ("text/*", "csv"),
+    ("text/html;q=0, application/pdf", "pdf"),
+    ("image/png", None)
+])
+def test_negotiate_report_format(accept, expected):
+    assert AirQualityController._negotiate_report_format(accept) == expected
+
+
+REPORT_REQUEST = {
+    "air_quality_data": {
+        "coordinates": {"lat": 4.6, "lon": -74.1},
+        "timestamp": "2026-01-01T12:00:00",
+        "no2_density": 0.00012,
+        "co_density": 0.03,
+        "air_quality_index": 42,
+        "air_quality_category": "Buena",
+        "analysis_radius_km": 5.0
+    },
+    "report_title": "Prueba"
+}
+
+
+@pytest.mark.parametrize("accept, media_type", [
+    ("text/csv", "text/csv"),
+    ("application/json", "application/json"),
+    ("text/html", "text/html")
+])
+def test_report_route_serves_negotiated_format(accept, media_type):
+    with TestClient(app) as client:
+        response = client.post("/api/v1/air-quality/report", json=REPORT_REQUEST, headers={"Accept": accept})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(media_type)
+    assert "Accept" in response.headers["vary"]
+    assert "Prueba" in response.text
+
+
+def test_report_route_rejects_unsupported_format():
+    with TestClient(app) as client:
+        response = client.post("/api/v1/air-quality/report", json=REPORT_REQUEST, headers={"Accept": "image/png"})
+
+    assert response.status_code == 406
+
+
+def test_json_report_serializes_the_data():
+    with TestClient(app) as client:
+        response = client.post("/api/v1/air-quality/report", json=REPORT_REQUEST, headers={"Accept": "application/json"})
+
+    body = response.json()
+    assert body["report_title"] == "Prueba"
+    assert body["air_quality_data"]["timestamp"] == "2026-01-01T12:00:00"
+    assert body["air_quality_data"]["air_quality_index"] == 42
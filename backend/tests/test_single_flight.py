@@ -0,0 +1,42 @@
+import asyncio
+
+from core.helpers.SingleFlight import SingleFlight
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*[flight.do("key", fetch) for _ in range(5)])
+        # Terminada la llamada se olvida la clave: la siguiente vuelve a ejecutar
+        again = await flight.do("key", fetch)
+        return results, again, flight.get_stats()
+
+    results, again, stats = asyncio.run(scenario())
+
+    assert results == [1] * 5
+    assert again == 2
+    assert stats == {"inFlight": 0, "executions": 2, "coalesced": 4}
+
+
+def test_single_flight_cancelled_caller_does_not_cancel_others():
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def scenario():
+        flight = SingleFlight()
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(scenario()) == ("ok", True)
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+from api.dto.AirQuality.AirQualityDto import CoordinatesRequest
+from core.helpers.GeoGrid import encode_geohash, snap_to_grid
+from core.helpers.TtlLruCache import TtlLruCache
+from core.service.AirQualityService import AirQualityService
+
+
+def test_ttl_lru_cache_expires_entries():
+    cache = TtlLruCache(ttl_seconds=60, max_bytes=100)
+    cache.set("short", "a", ttl_seconds=0.01)
+    cache.set("long", "b")
+    time.sleep(0.02)
+
+    assert cache.get("short") is None
+    assert cache.get("long") == "b"
+    assert cache.expirations == 1
+
+
+def test_ttl_lru_cache_evicts_least_recently_used_over_byte_budget():
+    cache = TtlLruCache(ttl_seconds=60, max_bytes=10, sizeof=len)
+    cache.set("a", "xxxx")
+    cache.set("b", "xxxx")
+    # Leer "a" la vuelve la más reciente: al pasarse del presupuesto sale "b"
+    assert cache.get("a") == "xxxx"
+    cache.set("c", "xxxx")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "xxxx" and cache.get("c") == "xxxx"
+    assert cache.current_bytes == 8
+    assert cache.evictions == 1
+
+
+def test_ttl_lru_cache_skips_values_larger_than_budget():
+    cache = TtlLruCache(ttl_seconds=60, max_bytes=3, sizeof=len)
+    cache.set("big", "xxxx")
+
+    assert len(cache) == 0 and cache.current_bytes == 0
+
+
+def test_geohash_known_value():
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_nearby_points_share_a_s5p_cell():
+    assert snap_to_grid(4.6100, -74.0800) == snap_to_grid(4.6101, -74.0801)
+    assert snap_to_grid(4.6100, -74.0800) != snap_to_grid(4.7000, -74.0800)
+    assert snap_to_grid(4.61, -74.08, "geohash", 5) == ("geohash", encode_geohash(4.61, -74.08, 5))
+
+
+def make_service(monkeypatch, fallback_ttl):
+    monkeypatch.setenv("AIR_QUALITY_CACHE_FALLBACK_TTL", str(fallback_ttl))
+    service = AirQualityService()
+    service.use_mock_data = False
+    service.provider_result = None
+    calls = []
+
+    async def race(coordinates, order):
+        calls.append(coordinates)
+        return service.provider_result
+
+    monkeypatch.setattr(service, "_race_providers", race)
+    return service, calls
+
+
+def test_provider_results_are_cached(monkeypatch):
+    point = CoordinatesRequest(lat=4.6, lon=-74.1)
+
+    async def scenario():
+        service, calls = make_service(monkeypatch, fallback_ttl=0)
+        service.provider_result = await service._get_mock_air_quality_data(point)
+        first = await service.get_air_quality_summary(point)
+        second = await service.get_air_quality_summary(point)
+        return first, second, calls
+
+    first, second, calls = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert second == first
+
+
+def test_fallback_results_use_the_short_ttl(monkeypatch):
+    point = CoordinatesRequest(lat=4.6, lon=-74.1)
+
+    async def scenario():
+        # Ningún proveedor responde: los datos de respaldo expiran enseguida
+        service, calls = make_service(monkeypatch, fallback_ttl=0)
+        first = await service.get_air_quality_summary(point)
+        await service.get_air_quality_summary(point)
+        return first, calls, service.summary_cache
+
+    first, calls, cache = asyncio.run(scenario())
+
+    assert first.data_source.startswith("Datos Realistas")
+    assert len(calls) == 2
+    assert cache.expirations == 1
+
+
+def test_null_radius_gets_a_cache_key(monkeypatch):
+    service, _ = make_service(monkeypatch, fallback_ttl=0)
+    key = service._summary_cache_key(CoordinatesRequest(lat=4.6, lon=-74.1, radius=None))
+
+    assert key == service._summary_cache_key(CoordinatesRequest(lat=4.6, lon=-74.1, radius=5))
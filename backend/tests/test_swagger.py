@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, FastAPI
+
+from api.dependencies.AuthDependency import get_current_user
+from infrastructure.config import ConfigSwagger
+from infrastructure.config.ConfigSwagger import generate_swagger_yaml, routes_fingerprint, setup_swagger
+
+
+def make_app(require_auth=True):
+    app = FastAPI(title="EcoShield", version="1.0")
+    router = APIRouter(dependencies=[Depends(get_current_user)] if require_auth else [])
+
+    # Se crea en cada llamada: otra dirección de memoria, mismo código
+    async def get_session():
+        yield None
+
+    @router.get("/protected")
+    async def protected(session=Depends(get_session)) -> dict:
+        return {}
+
+    app.include_router(router)
+    setup_swagger(app)
+    return app
+
+
+def test_protected_routes_reference_defined_security_schemes():
+    schema = make_app().openapi()
+    schemes = schema["components"]["securitySchemes"]
+
+    referenced = {
+        name
+        for operation in schema["paths"]["/protected"].values()
+        for requirement in operation.get("security", [])
+        for name in requirement
+    }
+    assert referenced
+    assert referenced <= set(schemes)
+    assert "bearerAuth" in schemes
+
+
+def test_fingerprint_does_not_depend_on_memory_addresses():
+    assert routes_fingerprint(make_app()) == routes_fingerprint(make_app())
+
+
+def test_fingerprint_changes_with_router_dependencies():
+    assert routes_fingerprint(make_app(require_auth=True)) != routes_fingerprint(make_app(require_auth=False))
+
+
+def test_swagger_is_only_rewritten_when_routes_change(monkeypatch, tmp_path):
+    monkeypatch.setattr(ConfigSwagger, "MEDIA_DOCS_DIR", str(tmp_path))
+
+    assert generate_swagger_yaml(make_app()) is True
+    assert generate_swagger_yaml(make_app()) is False
+    assert generate_swagger_yaml(make_app(), force=True) is True
+    assert generate_swagger_yaml(make_app(require_auth=False)) is True
+    assert (tmp_path / "swagger.yml.sha256").read_text() == routes_fingerprint(make_app(require_auth=False))
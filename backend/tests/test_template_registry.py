@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from shared.utils.TemplateRegistry import TemplateRegistry
+
+
+def write_template(path, content, mtime):
+    path.write_text(content, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def make_registry(monkeypatch, tmp_path, app_env):
+    monkeypatch.setenv("APP_ENV", app_env)
+    write_template(tmp_path / "hola.html", "Hola {{ template_name }} {{ nombre }}", 1_000_000)
+    write_template(tmp_path / "adios.html", "Adiós", 1_000_000)
+    return TemplateRegistry(str(tmp_path))
+
+
+def test_load_compiles_every_template_once(monkeypatch, tmp_path):
+    registry = make_registry(monkeypatch, tmp_path, "production")
+    registry.load()
+    environment = registry._environment
+    registry.load()
+
+    assert registry._environment is environment
+    assert registry.get_stats()["templates"] == 2
+    assert registry.get("hola.html") is registry.get("hola.html")
+
+
+def test_render_escapes_html_and_accepts_template_name_in_context(monkeypatch, tmp_path):
+    registry = make_registry(monkeypatch, tmp_path, "production")
+
+    html = registry.render("hola.html", template_name="<b>", nombre="Ana")
+
+    assert html == "Hola &lt;b&gt; Ana"
+    assert registry.renders == 1
+
+
+@pytest.mark.parametrize("app_env, expected", [("development", "Hola de nuevo"), ("production", "Hola  Ana")])
+def test_modified_templates_reload_only_outside_production(monkeypatch, tmp_path, app_env, expected):
+    registry = make_registry(monkeypatch, tmp_path, app_env)
+    registry.load()
+    write_template(tmp_path / "hola.html", "Hola de nuevo", 2_000_000)
+
+    assert registry.render("hola.html", nombre="Ana") == expected
+    assert registry.get_stats()["autoReload"] is (app_env == "development")
+
+
+def test_shipped_layouts_compile():
+    registry = TemplateRegistry()
+    registry.load()
+
+    assert registry.get_stats()["templates"] > 0
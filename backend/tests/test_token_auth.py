@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from core.exceptions.InvalidTokenException import InvalidTokenException
+from core.service import TokenAuthService as module
+from core.service.TokenAuthService import TokenAuthService
+
+
+def make_service(monkeypatch, expires_in):
+    calls = []
+
+    def verify_token(token):
+        calls.append(token)
+        if token == "expired":
+            raise ValueError("Token expirado")
+        return {
+            "userId": "1", "sub": "ana", "email": "ana@example.com", "fullName": "Ana Pérez",
+            "authorithies": "USER", "isVerified": True, "exp": time.time() + expires_in
+        }
+
+    monkeypatch.setattr(module, "verify_token", verify_token)
+    return TokenAuthService(), calls
+
+
+def test_verified_tokens_are_served_from_memory(monkeypatch):
+    service, calls = make_service(monkeypatch, expires_in=3600)
+
+    first = service.verify("token")
+    second = service.verify("token")
+
+    assert second is first
+    assert calls == ["token"]
+    assert first.id == 1 and first.username == "ana"
+
+
+def test_cached_claims_never_outlive_the_token(monkeypatch):
+    service, calls = make_service(monkeypatch, expires_in=0.05)
+
+    service.verify("token")
+    time.sleep(0.1)
+    service.verify("token")
+
+    assert calls == ["token", "token"]
+
+
+def test_expired_tokens_are_not_cached(monkeypatch):
+    service, calls = make_service(monkeypatch, expires_in=-1)
+
+    service.verify("token")
+    service.verify("token")
+    with pytest.raises(InvalidTokenException):
+        service.verify("expired")
+
+    assert calls == ["token", "token", "expired"]
+    assert len(service.claims_cache) == 0
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from core.exceptions.EmailAlreadyExistsException import EmailAlreadyExistsException
+from core.exceptions.UsernameAlreadyExistsException import UsernameAlreadyExistsException
+from core.service.UserService import UserService
+
+
+class AsyncpgError(Exception):
+    def __init__(self, detail):
+        super().__init__("duplicate key value violates unique constraint")
+        self.detail = detail
+
+
+def integrity_error(message, cause=None):
+    orig = Exception(message)
+    orig.__cause__ = cause
+    return IntegrityError("INSERT INTO users ...", {}, orig)
+
+
+@pytest.mark.parametrize("error, expected", [
+    # psycopg2: el detalle viene en el mensaje
+    (integrity_error('duplicate key value violates unique constraint "users_email_key"\nDETAIL:  Key (email)=(a@b.co) already exists.'), EmailAlreadyExistsException),
+    # asyncpg: el detalle queda en la excepción original
+    (integrity_error("<class 'asyncpg.exceptions.UniqueViolationError'>", AsyncpgError("Key (username)=(ana) already exists.")), UsernameAlreadyExistsException),
+    # Solo el nombre de la restricción
+    (integrity_error('duplicate key value violates unique constraint "users_username_key"'), UsernameAlreadyExistsException)
+])
+def test_unique_violation_maps_to_api_errors(error, expected):
+    assert isinstance(UserService._unique_violation(error), expected)
+
+
+def test_other_integrity_errors_are_kept():
+    error = integrity_error('insert or update on table "users" violates foreign key constraint "users_role_id_fkey"')
+
+    assert UserService._unique_violation(error) is error